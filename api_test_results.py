@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Streaming results for SlidesGPT API test runs
+Each call's result is appended to a JSON-lines file as soon as it finishes, so a
+long soak test keeps memory flat and a crash loses at most the call in progress.
+A summary snapshot is rewritten next to it every few results, and
+ResultsAggregator rebuilds the summary and error analysis from the file in one
+pass.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+DEFAULT_SNAPSHOT_EVERY = 50
+DEFAULT_SNAPSHOT_INTERVAL = 30.0
+
+
+def classify_error(result: Dict) -> Optional[str]:
+    """Error pattern for a failed call, or None if it succeeded"""
+    if result.get('success'):
+        return None
+    response_text = (result.get('response_text') or '').lower()
+    if "limit" in response_text or "quota" in response_text:
+        return "Rate Limit/Quota"
+    if "unauthorized" in response_text or "401" in str(result.get('status_code')):
+        return "Unauthorized"
+    if "timeout" in str(result.get('error', '')).lower():
+        return "Timeout"
+    if "429" in str(result.get('status_code')):
+        return "Rate Limited (429)"
+    return "Unknown"
+
+
+class ResultsAggregator:
+    """Running totals over call results; holds counts only, never the results themselves"""
+
+    def __init__(self):
+        self.total_calls = 0
+        self.successful_calls = 0
+        self.status_codes: Dict[str, int] = {}
+        self.error_patterns: Dict[str, int] = {}
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+
+    def add(self, result: Dict):
+        self.total_calls += 1
+        if result.get('success'):
+            self.successful_calls += 1
+        status = str(result.get('status_code'))
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        error_type = classify_error(result)
+        if error_type:
+            self.error_patterns[error_type] = self.error_patterns.get(error_type, 0) + 1
+        timestamp = result.get('timestamp')
+        if timestamp:
+            self.first_timestamp = self.first_timestamp or timestamp
+            self.last_timestamp = timestamp
+
+    def summary(self) -> Dict:
+        return {
+            "total_calls": self.total_calls,
+            "successful_calls": self.successful_calls,
+            "failed_calls": self.total_calls - self.successful_calls,
+            "success_rate": (self.successful_calls / self.total_calls) * 100 if self.total_calls else 0.0,
+            "status_codes": dict(self.status_codes),
+            "error_patterns": dict(self.error_patterns),
+            "first_call": self.first_timestamp,
+            "last_call": self.last_timestamp
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> "ResultsAggregator":
+        """Aggregate a results file line by line; a torn last line from a crash is skipped"""
+        aggregator = cls()
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                aggregator.add(result)
+        return aggregator
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def snapshot_path_for(results_path: str) -> str:
+    return f"{os.path.splitext(results_path)[0]}.summary.json"
+
+
+class ResultsWriter:
+    """
+    Append-only JSON-lines writer for call results.
+
+    Every result is flushed as it is written. The summary snapshot is rewritten
+    atomically after snapshot_every results or snapshot_interval seconds,
+    whichever comes first, and again on close().
+
+    A new run refuses to open an existing file (FileExistsError). With
+    resume=True it appends instead, seeding the summary from the results
+    already there so the snapshot and the file agree.
+    """
+
+    def __init__(self,
+                 path: str,
+                 test_info: Optional[Dict] = None,
+                 snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+                 snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+                 fsync: bool = False,
+                 resume: bool = False):
+        self.path = path
+        self.snapshot_path = snapshot_path_for(path)
+        self.test_info = test_info or {}
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self._since_snapshot = 0
+        self._last_snapshot = time.monotonic()
+        if resume and os.path.exists(path):
+            self.aggregator = ResultsAggregator.from_file(path)
+            self._file = open(path, 'a')
+            if self._file.tell() and not _ends_with_newline(path):
+                # End a torn last line from a crash so the next result starts cleanly
+                self._file.write("\n")
+        else:
+            self.aggregator = ResultsAggregator()
+            self._file = open(path, 'a' if resume else 'x')
+
+    def write(self, result: Dict):
+        self._file.write(json.dumps(result) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.aggregator.add(result)
+        self._since_snapshot += 1
+        if (self._since_snapshot >= self.snapshot_every
+                or time.monotonic() - self._last_snapshot >= self.snapshot_interval):
+            self.write_snapshot()
+
+    def write_snapshot(self, **extra):
+        snapshot = {
+            "test_info": dict(self.test_info, **extra),
+            "summary": self.aggregator.summary(),
+            "results_file": self.path,
+            "updated_at": datetime.now().isoformat()
+        }
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.snapshot_path)
+        self._since_snapshot = 0
+        self._last_snapshot = time.monotonic()
+
+    def close(self, **extra):
+        """Write the final snapshot; extra keys are added to its test_info"""
+        if self._file.closed:
+            return
+        self._file.close()
+        self.write_snapshot(**extra)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def print_error_analysis(summary: Dict):
+    if summary["error_patterns"]:
+        print(f"\n🔍 Error Analysis:")
+        for error_type, count in summary["error_patterns"].items():
+            print(f"   {error_type}: {count} occurrences")
+
+
+def main():
+    """Summarise a results file, e.g. one left behind by an interrupted run"""
+    parser = argparse.ArgumentParser(description='Summarise a SlidesGPT API test results file')
+    parser.add_argument('results_file', help='JSON-lines results file written by test_slidesgpt_api.py')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    summary = ResultsAggregator.from_file(args.results_file).summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"📊 Calls: {summary['total_calls']} ({summary['first_call']} to {summary['last_call']})")
+    print(f"✅ Successful calls: {summary['successful_calls']}")
+    print(f"❌ Failed calls: {summary['failed_calls']}")
+    print(f"📈 Success rate: {summary['success_rate']:.1f}%")
+    print(f"🔢 Status codes: {summary['status_codes']}")
+    print_error_analysis(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Async SlidesGPT Generator for Clubly
+asyncio counterpart of ProductionSlidesGPTGenerator: generate and download calls
+are awaited instead of holding a thread, and a semaphore caps how many requests
+are in flight at once. Calls share the process-wide rate limiter with the sync
+clients and are retried with backoff on 429s (and 5xx for downloads).
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from presentation_download import FileSink
+from production_slidesgpt_generator import ClubData, ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy, get_shared_rate_limiter, parse_retry_after
+from slidesgpt_transport import IDEMPOTENT_METHODS, SlidesGPTAPIError
+
+DEFAULT_MAX_IN_FLIGHT = 100
+
+
+class AsyncProductionSlidesGPTGenerator:
+    """
+    Async SlidesGPT client for high-concurrency workers.
+
+    Club lookup, loading and prompt building are delegated to a
+    ProductionSlidesGPTGenerator (file access runs in a worker thread).
+    Use as an async context manager, or call close() when done.
+    """
+
+    def __init__(self,
+                 api_key: str = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 use_club_index: bool = True,
+                 base_url: str = "https://api.slidesgpt.com",
+                 generate_timeout: float = 60,
+                 download_timeout: float = 120,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the async generator. Install with: pip install aiohttp")
+
+        self.generator = ProductionSlidesGPTGenerator(api_key, use_club_index=use_club_index, base_url=base_url)
+        self.base_url = base_url
+        self.headers = self.generator.headers
+        self.max_in_flight = max_in_flight
+        self.generate_timeout = generate_timeout
+        self.download_timeout = download_timeout
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        # Created lazily so the session and semaphore bind to the running loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.max_in_flight)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _send(self, method: str, url: str, timeout: float, **kwargs) -> "aiohttp.ClientResponse":
+        """Send a request through the rate limiter, retrying 429s, failed connects and (for GETs) 5xx"""
+        session = await self._get_session()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            try:
+                response = await session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs)
+            except aiohttp.ClientConnectorError:
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                await asyncio.sleep(self.retry_policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status not in self.retry_policy.retry_statuses:
+                self.rate_limiter.on_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.rate_limiter.on_throttle(retry_after)
+            # A 5xx generate may still have created a deck, so only GETs are repeated
+            if (not (idempotent or response.status == 429)
+                    or not self.retry_policy.should_retry(attempt, response.status)):
+                return response
+
+            response.release()
+            await asyncio.sleep(self.retry_policy.backoff(attempt, retry_after))
+            attempt += 1
+
+    async def generate_presentation(self, prompt: str, theme: str = "modern", slides_count: int = 10) -> Dict:
+        """Generate a presentation using SlidesGPT API"""
+
+        payload = {
+            "prompt": prompt,
+            "theme": theme,
+            "slides_count": slides_count
+        }
+
+        await self._get_session()
+        async with self._semaphore:
+            try:
+                response = await self._send("POST", f"{self.base_url}/generate", self.generate_timeout, json=payload)
+                async with response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    text = await response.text()
+                    raise SlidesGPTAPIError(
+                        f"SlidesGPT API error: {response.status} - {text}",
+                        status_code=response.status,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                    )
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise Exception(f"Network error: {str(e)}")
+
+    async def download_presentation(self, presentation_id: str, output_path: str) -> bool:
+        """
+        Download the generated presentation
+
+        Chunks are written to <output_path>.part in a worker thread and renamed
+        into place once complete, so disk writes don't stall the event loop and a
+        failed or cancelled download never leaves a truncated deck at output_path.
+        """
+
+        await self._get_session()
+        async with self._semaphore:
+            try:
+                response = await self._send("GET", f"{self.base_url}/download/{presentation_id}", self.download_timeout)
+                async with response:
+                    if response.status != 200:
+                        text = await response.text()
+                        raise SlidesGPTAPIError(
+                            f"Download failed: {response.status} - {text}",
+                            status_code=response.status,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                        )
+                    sink = FileSink(output_path, resumable=False)
+                    try:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await asyncio.to_thread(sink.write, chunk)
+                        await asyncio.to_thread(sink.commit)
+                    except BaseException:
+                        sink.abort()
+                        raise
+                    return True
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise Exception(f"Download error: {str(e)}")
+
+    async def load_club_data(self, club_name: str, data_directory: str = "data/clubs") -> ClubData:
+        """Find and load club data without blocking the event loop"""
+        club_file_path = await asyncio.to_thread(self.generator.find_club_file, club_name, data_directory)
+        return await asyncio.to_thread(self.generator.load_club_data_from_file, club_file_path)
+
+    async def generate_club_presentation(self,
+                                         club_name: str,
+                                         topic: str,
+                                         theme: str = "modern",
+                                         slides_count: int = 10,
+                                         output_path: Optional[str] = None,
+                                         data_directory: str = "data/clubs") -> Dict:
+        """
+        Complete workflow: Find club file, load data, create prompt, generate and download presentation
+        """
+
+        club_data = await self.load_club_data(club_name, data_directory)
+        prompt = self.generator.create_presentation_prompt(club_data, topic)
+
+        result = await self.generate_presentation(prompt, theme, slides_count)
+
+        if output_path and result.get('presentation_id'):
+            await self.download_presentation(result['presentation_id'], output_path)
+            result['downloaded_to'] = output_path
+
+        return result
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Clubly presentation pipeline
+Times the hot paths (club lookup, club JSON loading, prompt building, end-to-end
+generation and deck transfer) against synthetic club stores and the local fake
+SlidesGPT server, writes a versioned results file, and compares two results
+files to catch regressions. The startup command checks the generator CLI's cold
+start (measured with -X importtime) against a budget.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from club_data import CLUB_FIELDS, DECODERS, ClubData, load_club_file
+from club_index import ClubIndex
+from club_loader import ClubBulkLoader, write_snapshot
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from presentation_cache import PresentationCache
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from prompt_templates import PromptTemplates, default_templates
+from rate_limiter import AdaptiveRateLimiter
+from slidesgpt_transport import SlidesGPTTransport
+
+SCHEMA_VERSION = 1
+DEFAULT_STORE_SIZES = (1000, 10000, 100000)
+CLUBS_PER_USER = 20
+DEFAULT_THRESHOLD = 0.10
+MB = 1024 * 1024
+GENERATOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production_slidesgpt_generator.py")
+# Modules the generator CLI must not import unless it reaches the network or S3
+HEAVY_MODULES = ("requests", "urllib3", "boto3", "botocore", "dotenv")
+DEFAULT_STARTUP_BUDGET_MS = 80.0
+
+
+def build_synthetic_store(root: str, files: int, seed: int = 0) -> List[str]:
+    """Write `files` club JSON files under root/<user>/ and return the club names"""
+    rng = random.Random(seed)
+    names = []
+    for i in range(files):
+        user_id = f"user-{i // CLUBS_PER_USER:06d}"
+        user_dir = os.path.join(root, user_id)
+        if i % CLUBS_PER_USER == 0:
+            os.makedirs(user_dir, exist_ok=True)
+        club_name = f"Club {i:06d} {rng.choice(['Robotics', 'Debate', 'Chess', 'AI', 'Art', 'Music'])}"
+        names.append(club_name)
+        with open(os.path.join(user_dir, f"{club_name.replace(' ', '_')}_club-{i}.json"), 'w') as f:
+            json.dump({
+                "clubId": f"club-{i}",
+                "userId": user_id,
+                "userName": f"Student {i}",
+                "userRole": rng.choice(["President", "Vice President", "Treasurer"]),
+                "clubName": club_name,
+                "description": "A student organization. " * rng.randint(5, 20),
+                "mission": "To learn together and build things. " * 3,
+                "goals": "1) Meet weekly 2) Run workshops 3) Compete in events",
+                "createdAt": "2024-01-15T10:30:00Z",
+                "updatedAt": "2024-01-15T10:30:00Z"
+            }, f)
+    return names
+
+
+def time_call(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Fastest of several runs; the minimum is the least noisy estimate on a busy machine"""
+    return min(time_call(fn) for _ in range(repeat))
+
+
+def metric(value: float, unit: str, better: str) -> Dict:
+    return {"value": round(value, 6), "unit": unit, "better": better}
+
+
+def quiet_generator(**kwargs) -> ProductionSlidesGPTGenerator:
+    transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1e6, burst=1000))
+    return ProductionSlidesGPTGenerator(api_key="benchmark-key", transport=transport, **kwargs)
+
+
+def bench_club_lookup(store: str, names: List[str], lookups: int, scans: int) -> Dict[str, Dict]:
+    size = len(names)
+    rng = random.Random(1)
+    index_path = os.path.join(store, ".club_index.json")
+    if os.path.exists(index_path):
+        os.unlink(index_path)
+
+    results = {f"club_lookup.{size}.index_build_s": metric(time_call(lambda: ClubIndex.open(store)), "s", "lower")}
+    results[f"club_lookup.{size}.index_open_s"] = metric(best_of(lambda: ClubIndex.open(store)), "s", "lower")
+
+    index = ClubIndex.open(store)
+    targets = [rng.choice(names) for _ in range(lookups)]
+    elapsed = best_of(lambda: [index.find_club(name) for name in targets])
+    results[f"club_lookup.{size}.indexed_lookup_us"] = metric(elapsed / lookups * 1e6, "us", "lower")
+
+    scanner = quiet_generator(use_club_index=False)
+    targets = [rng.choice(names) for _ in range(scans)]
+    elapsed = best_of(lambda: [scanner.find_club_file(name, store) for name in targets], 3)
+    results[f"club_lookup.{size}.scan_lookup_ms"] = metric(elapsed / scans * 1000, "ms", "lower")
+    return results
+
+
+def bench_json_and_prompt(store: str, files: int, prompts: int) -> Dict[str, Dict]:
+    generator = quiet_generator()
+    paths = sorted(str(p) for p in Path(store).glob("*/*.json"))[:files]
+    elapsed = best_of(lambda: [generator.load_club_data_from_file(p) for p in paths])
+    clubs = [generator.load_club_data_from_file(p) for p in paths]
+
+    topics = [f"Topic {i}" for i in range(prompts)]
+    prompt_elapsed = best_of(lambda: [generator.create_presentation_prompt(clubs[i % len(clubs)], topic)
+                                        for i, topic in enumerate(topics)])
+    # Batch shape: many topics per club, with and without the per-club section cache
+    batch_clubs = clubs[:100]
+    batch_topics = topics[:max(1, prompts // len(batch_clubs))]
+    template = default_templates().get("presentation")
+
+    def cached_batch():
+        templates = default_templates()
+        for club in batch_clubs:
+            for topic in batch_topics:
+                templates.render("presentation", club, topic=topic)
+
+    def uncached_batch():
+        for club in batch_clubs:
+            for topic in batch_topics:
+                template.render(club, topic=topic)
+
+    batch_prompts = len(batch_clubs) * len(batch_topics)
+    return {
+        "json_load.files_per_s": metric(len(paths) / elapsed, "files/s", "higher"),
+        "prompt_build.ops_per_s": metric(prompts / prompt_elapsed, "ops/s", "higher"),
+        "prompt_build.batch_cached_ops_per_s": metric(batch_prompts / best_of(cached_batch), "ops/s", "higher"),
+        "prompt_build.batch_uncached_ops_per_s": metric(batch_prompts / best_of(uncached_batch), "ops/s", "higher")
+    }
+
+
+@dataclass
+class DictBackedClubData:
+    """The pre-slots ClubData layout, kept as the baseline for club_model metrics"""
+    clubId: str
+    userId: str
+    userName: str
+    userRole: str
+    clubName: str
+    description: str
+    mission: str
+    goals: str
+    createdAt: str
+    updatedAt: str
+
+
+def _bytes_per_instance(build: Callable[[Dict], object], rows: List[Dict]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [build(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(instances)
+
+
+def bench_club_model(store: str, files: int) -> Dict[str, Dict]:
+    """Per-instance memory and decode rate of the slotted ClubData against the old dict-backed copy"""
+    paths = sorted(str(p) for p in Path(store).glob("*/*.json"))[:files]
+    rows = []
+    for path in paths:
+        with open(path, 'r') as f:
+            rows.append(json.load(f))
+
+    def legacy_load(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return DictBackedClubData(**{name: data.get(name, '') for name in CLUB_FIELDS})
+
+    results = {
+        "club_model.slotted_bytes_per_instance": metric(
+            _bytes_per_instance(ClubData.from_dict, rows), "bytes", "lower"),
+        "club_model.dict_bytes_per_instance": metric(
+            _bytes_per_instance(lambda row: DictBackedClubData(**{n: row.get(n, '') for n in CLUB_FIELDS}), rows),
+            "bytes", "lower"),
+        "club_decode.legacy_files_per_s": metric(
+            len(paths) / best_of(lambda: [legacy_load(p) for p in paths]), "files/s", "higher")
+    }
+    for backend in DECODERS:
+        elapsed = best_of(lambda: [load_club_file(p, backend) for p in paths])
+        results[f"club_decode.{backend}_files_per_s"] = metric(len(paths) / elapsed, "files/s", "higher")
+    return results
+
+
+def bench_bulk_load(store: str, work_dir: str) -> Dict[str, Dict]:
+    """Whole-store load rate through ClubBulkLoader, from the tree and from an NDJSON snapshot"""
+    snapshot = os.path.join(work_dir, "clubs.ndjson")
+    files = write_snapshot(store, snapshot)
+    results = {}
+    for label, source in (("tree", store), ("snapshot", snapshot)):
+        elapsed = best_of(lambda: sum(1 for _ in ClubBulkLoader(source)), repeat=3)
+        results[f"club_bulk_load.{label}_files_per_s"] = metric(files / elapsed, "files/s", "higher")
+    return results
+
+
+def bench_end_to_end(store: str, names: List[str], runs: int, work_dir: str) -> Dict[str, Dict]:
+    latencies = []
+    with FakeSlidesGPTServer(FakeServerConfig(deck_size=256 * 1024)) as server:
+        generator = quiet_generator(base_url=server.base_url)
+        output_path = os.path.join(work_dir, "e2e.pptx")
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(runs):
+                latencies.append(time_call(lambda: generator.generate_club_presentation(
+                    names[i % len(names)], f"Topic {i}", output_path=output_path, data_directory=store)))
+    latencies.sort()
+    return {
+        "e2e_generate.p50_ms": metric(latencies[len(latencies) // 2] * 1000, "ms", "lower"),
+        "e2e_generate.p99_ms": metric(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, "ms", "lower")
+    }
+
+
+def bench_transfers(deck_mb: int, work_dir: str) -> Dict[str, Dict]:
+    results = {}
+    deck_size = deck_mb * MB
+    with FakeSlidesGPTServer(FakeServerConfig(deck_size=deck_size)) as server:
+        generator = quiet_generator(base_url=server.base_url)
+        output_path = os.path.join(work_dir, "download.pptx")
+        generator.download_presentation("warmup", output_path)
+        for parts, name in ((1, "download"), (4, "download_parallel")):
+            elapsed = best_of(lambda: generator.download_presentation("bench", output_path, parts=parts), 3)
+            results[f"{name}.mb_per_s"] = metric(deck_size / MB / elapsed, "MB/s", "higher")
+
+        upload = bench_upload(output_path, deck_size)
+        if upload is not None:
+            results["upload.mb_per_s"] = metric(upload, "MB/s", "higher")
+    return results
+
+
+def bench_upload(file_path: str, size: int) -> Optional[float]:
+    """Multipart upload throughput through S3Uploader against moto's in-memory S3; None without boto3/moto"""
+    try:
+        import boto3
+        from moto import mock_aws
+        from upload_to_s3 import S3Uploader
+    except ImportError:
+        return None
+
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-west-1')
+        client.create_bucket(Bucket='benchmark', CreateBucketConfiguration={'LocationConstraint': 'us-west-1'})
+        uploader = S3Uploader('benchmark', client=client, part_size=8 * MB)
+        elapsed = min(time_call(lambda: uploader.upload(file_path, f"bench-{i}.pptx")) for i in range(3))
+    return size / MB / elapsed
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Top-level modules and their cumulative import time in microseconds from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or parts[2].startswith("  ") or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def measure_startup(args: List[str], runs: int, interpreter_modules: Optional[set] = None) -> Dict:
+    """
+    Run the generator CLI `runs` times under -X importtime.
+
+    import_ms only counts modules the CLI pulls in beyond a bare interpreter
+    start (site, encodings), so it tracks what this repo controls.
+    """
+    import_times, wall_times, loaded = [], [], set()
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", GENERATOR_SCRIPT, *args],
+                                 capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - started)
+        if process.returncode != 0:
+            raise RuntimeError(f"Generator exited with {process.returncode}: {process.stderr[-500:]}")
+        modules = parse_importtime(process.stderr)
+        import_times.append(sum(us for name, us in modules.items() if name not in (interpreter_modules or ())))
+        for line in process.stderr.splitlines():
+            if line.startswith("import time:"):
+                loaded.add(line.rsplit("|", 1)[-1].strip())
+    import_times.sort()
+    wall_times.sort()
+    return {
+        "import_ms": import_times[len(import_times) // 2] / 1000,
+        "wall_ms": wall_times[len(wall_times) // 2] * 1000,
+        "heavy_modules": sorted(loaded & set(HEAVY_MODULES)),
+        "stdout": process.stdout
+    }
+
+
+def bench_startup(work_dir: str, runs: int = 5) -> Dict[str, Dict]:
+    """Cold start of the generator CLI for --help and for a cache hit, which should never import requests/boto3"""
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    interpreter_modules = set(parse_importtime(baseline.stderr))
+
+    data_dir = os.path.join(work_dir, "startup-clubs")
+    cache_dir = os.path.join(work_dir, "startup-cache")
+    os.makedirs(os.path.join(data_dir, "user-1"), exist_ok=True)
+    with open(os.path.join(data_dir, "user-1", "Startup_Club_club-1.json"), 'w') as f:
+        json.dump({"clubId": "club-1", "userId": "user-1", "clubName": "Startup Club", "updatedAt": "2024-01-15T10:30:00Z"}, f)
+    # Fresh templates: the shared ones may hold a section cached for another club-1
+    generator = quiet_generator(prompt_templates=default_templates())
+    prompt = generator.create_presentation_prompt(load_club_file(os.path.join(data_dir, "user-1", "Startup_Club_club-1.json")), "Cold Starts")
+    PresentationCache(cache_dir).put(PresentationCache.make_key(prompt, "modern", 10), {"presentation_id": "cached-deck"})
+
+    scenarios = {
+        "help": ["--help"],
+        "cache_hit": ["--club", "Startup Club", "--topic", "Cold Starts", "--api-key", "benchmark-key",
+                      "--data-dir", data_dir, "--cache-dir", cache_dir]
+    }
+    results = {}
+    for name, args in scenarios.items():
+        startup = measure_startup(args, runs, interpreter_modules)
+        if name == "cache_hit" and "cached-deck" not in startup["stdout"]:
+            raise RuntimeError("Startup cache-hit scenario did not hit the cache")
+        results[f"startup.{name}_import_ms"] = metric(startup["import_ms"], "ms", "lower")
+        results[f"startup.{name}_wall_ms"] = metric(startup["wall_ms"], "ms", "lower")
+        results[f"startup.{name}_heavy_modules"] = metric(len(startup["heavy_modules"]), "modules", "lower")
+    return results
+
+
+def check_startup_budget(metrics: Dict[str, Dict], budget_ms: float) -> List[str]:
+    """Problems with a startup run: import time over budget, or heavy modules loaded at all"""
+    problems = []
+    for name, value in sorted(metrics.items()):
+        if name.endswith("_import_ms") and value["value"] > budget_ms:
+            problems.append(f"{name} is {value['value']:.1f} ms (budget {budget_ms:.0f} ms)")
+        if name.endswith("_heavy_modules") and value["value"]:
+            problems.append(f"{name}: {value['value']:.0f} of {', '.join(HEAVY_MODULES)} imported")
+    return problems
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes=DEFAULT_STORE_SIZES, quick: bool = False, deck_mb: int = 32, store_dir: Optional[str] = None) -> Dict:
+    """Run every benchmark and return the results document"""
+    metrics: Dict[str, Dict] = {}
+    work_dir = tempfile.mkdtemp(prefix="clubly-bench-")
+    try:
+        stores_root = store_dir or os.path.join(work_dir, "stores")
+        for size in sizes:
+            store = os.path.join(stores_root, f"clubs-{size}")
+            print(f"🏗️  Building synthetic store with {size} clubs...")
+            if os.path.isdir(store):
+                shutil.rmtree(store)
+            names = build_synthetic_store(store, size)
+            print(f"⏱️  Club lookup ({size} files)...")
+            metrics.update(bench_club_lookup(store, names, lookups=1000, scans=1 if quick else 3))
+            if size == sizes[0]:
+                print("⏱️  JSON load and prompt construction...")
+                metrics.update(bench_json_and_prompt(store, files=min(size, 2000), prompts=2000 if quick else 20000))
+                print("⏱️  Club model memory and decoders...")
+                metrics.update(bench_club_model(store, files=min(size, 5000)))
+                print("⏱️  Bulk club loading...")
+                metrics.update(bench_bulk_load(store, work_dir))
+                print("⏱️  End-to-end generate against the fake server...")
+                metrics.update(bench_end_to_end(store, names, runs=10 if quick else 100, work_dir=work_dir))
+
+        print(f"⏱️  Download/upload throughput ({deck_mb} MB deck)...")
+        metrics.update(bench_transfers(deck_mb, work_dir))
+        print("⏱️  Generator CLI cold start...")
+        metrics.update(bench_startup(work_dir, runs=3 if quick else 10))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "metrics": metrics
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare two results documents metric by metric.
+
+    change is the relative difference in the metric's "better" direction, so a
+    positive change is an improvement; a metric regresses when change < -threshold.
+    A metric missing from current (a crashed or renamed benchmark) is marked
+    missing and counts as regressed, and one whose baseline is 0 regresses on
+    any move in the wrong direction.
+    """
+    for document in (baseline, current):
+        if document.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported results schema version: {document.get('schema_version')}")
+
+    rows = []
+    names = sorted(set(baseline["metrics"]) | set(current["metrics"]))
+    for name in names:
+        old, new = baseline["metrics"].get(name), current["metrics"].get(name)
+        row = {"name": name, "baseline": old and old["value"], "current": new and new["value"],
+               "unit": (new or old)["unit"], "change": None, "regressed": False, "missing": False}
+        if old and not new:
+            row["missing"] = row["regressed"] = True
+        elif old and new and old["value"]:
+            change = (new["value"] - old["value"]) / old["value"]
+            row["change"] = change if new["better"] == "higher" else -change
+            row["regressed"] = row["change"] < -threshold
+        elif old and new:
+            # No relative change from zero; any step the wrong way is a regression
+            worse = new["value"] < 0 if new["better"] == "higher" else new["value"] > 0
+            row["regressed"] = worse
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict], threshold: float):
+    print(f"{'metric':<42} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        baseline = f"{row['baseline']:.4g}" if row['baseline'] is not None else "-"
+        current = f"{row['current']:.4g}" if row['current'] is not None else "-"
+        change = f"{row['change'] * 100:+.1f}%" if row['change'] is not None else "n/a"
+        flag = " ❌ missing" if row["missing"] else " ❌" if row["regressed"] else ""
+        print(f"{row['name']:<42} {baseline:>12} {current:>12} {change:>9}{flag}")
+    missing = sum(row["missing"] for row in rows)
+    regressions = sum(row["regressed"] for row in rows) - missing
+    if missing:
+        print(f"\n❌ {missing} baseline metric(s) missing from the current results")
+    if regressions:
+        print(f"\n❌ {regressions} metric(s) regressed by more than {threshold * 100:.0f}%")
+    elif not missing:
+        print(f"\n✅ No metric regressed by more than {threshold * 100:.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run or compare Clubly pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and write a results file')
+    run_parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_STORE_SIZES),
+                            help='Comma-separated synthetic store sizes (default: 1000,10000,100000)')
+    run_parser.add_argument('--quick', action='store_true', help='Fewer iterations, for a smoke run')
+    run_parser.add_argument('--deck-mb', type=int, default=32, help='Deck size for transfer benchmarks in MB (default: 32)')
+    run_parser.add_argument('--store-dir', help='Where to build synthetic stores (default: a temporary directory)')
+    run_parser.add_argument('--output', help='Results file (default: benchmark_results_<timestamp>.json)')
+
+    compare_parser = subparsers.add_parser('compare', help='Fail if current results regress against a baseline')
+    compare_parser.add_argument('baseline', help='Baseline results file')
+    compare_parser.add_argument('current', help='Results file to check')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Allowed relative regression per metric (default: 0.10)')
+
+    startup_parser = subparsers.add_parser('startup', help='Fail if the generator CLI cold start exceeds a budget')
+    startup_parser.add_argument('--budget-ms', type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                                help=f'Allowed import time for --help and a cache hit (default: {DEFAULT_STARTUP_BUDGET_MS:.0f})')
+    startup_parser.add_argument('--runs', type=int, default=10, help='Runs per scenario; the median is reported (default: 10)')
+
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        work_dir = tempfile.mkdtemp(prefix="clubly-startup-")
+        try:
+            metrics = bench_startup(work_dir, runs=args.runs)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        for name, value in metrics.items():
+            print(f"   {name}: {value['value']:.4g} {value['unit']}")
+        problems = check_startup_budget(metrics, args.budget_ms)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print(f"\n✅ Cold start within {args.budget_ms:.0f} ms and no heavy imports")
+        return 1 if problems else 0
+
+    if args.command == 'run':
+        sizes = tuple(int(size) for size in args.sizes.split(','))
+        results = run_suite(sizes, quick=args.quick, deck_mb=args.deck_mb, store_dir=args.store_dir)
+        output = args.output or f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        for name, value in results["metrics"].items():
+            print(f"   {name}: {value['value']:.4g} {value['unit']}")
+        print(f"\n💾 Results saved to: {output}")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold)
+    print_comparison(rows, args.threshold)
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
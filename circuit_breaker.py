@@ -0,0 +1,111 @@
+"""
+Circuit breaker for SlidesGPT calls
+After several consecutive upstream failures the breaker opens and calls fail
+immediately instead of each waiting out its own timeout. Once reset_timeout has
+passed a trial call is let through: a success closes the breaker again, a
+failure reopens it.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from slidesgpt_transport import SlidesGPTAPIError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(SlidesGPTAPIError):
+    """Raised instead of calling SlidesGPT while the breaker is open; retry_after is when it will try again"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one upstream.
+
+    closed: calls go through and failure_threshold failures in a row open it.
+    open: before_call() raises CircuitOpenError until reset_timeout has passed.
+    half_open: up to half_open_max_calls trial calls go through; the first
+    result decides whether it closes or opens for another reset_timeout.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 half_open_max_calls: int = 1,
+                 clock=time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _current_state(self, now: float) -> str:
+        # Caller holds the lock
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self._clock())
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call should not be made"""
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self._opened_at + self.reset_timeout - now)
+        raise CircuitOpenError(f"SlidesGPT circuit is open after {self.failure_threshold} consecutive failures",
+                               retry_after=retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+
+    def record_failure(self) -> bool:
+        """Count a failed call; returns True if this failure opened the breaker"""
+        with self._lock:
+            self._failures += 1
+            state = self._current_state(self._clock())
+            if state == HALF_OPEN or (state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.times_opened += 1
+                return True
+            return False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._current_state(self._clock()),
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected
+            }
+
+
+def is_upstream_failure(status_code: Optional[int]) -> bool:
+    """Whether a result should count against the breaker: no response, throttling or a server error"""
+    return status_code is None or status_code == 429 or status_code >= 500
@@ -0,0 +1,163 @@
+"""
+Shared club data model for Clubly
+ClubData is a slotted dataclass (Python 3.10+) decoded straight from the
+onboarding JSON files.
+Decoding uses msgspec or orjson when installed and falls back to the standard
+json module, so loading thousands of clubs for a batch stays cheap. The fast
+decoders are imported when a second club is decoded, so a CLI run that reads
+one club (or none) doesn't pay their import cost.
+"""
+
+import importlib.util
+import json
+import os
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+@dataclass(slots=True, init=False)
+class ClubData:
+    clubId: str = ''
+    userId: str = ''
+    userName: str = ''
+    userRole: str = ''
+    clubName: str = ''
+    description: str = ''
+    mission: str = ''
+    goals: str = ''
+    createdAt: str = ''
+    updatedAt: str = ''
+
+    def __init__(self, clubId: str = '', userId: str = '', userName: str = '', userRole: str = '',
+                 clubName: str = '', description: str = '', mission: str = '', goals: str = '',
+                 createdAt: str = '', updatedAt: str = '', *,
+                 name: Optional[str] = None, user_role: Optional[str] = None, user_name: Optional[str] = None):
+        # name/user_role/user_name are accepted so code written against the original
+        # slidesgpt_generator ClubData(name=..., user_role=..., user_name=...) keeps working
+        self.clubId = clubId
+        self.userId = userId
+        self.userName = userName if user_name is None else user_name
+        self.userRole = userRole if user_role is None else user_role
+        self.clubName = clubName if name is None else name
+        self.description = description
+        self.mission = mission
+        self.goals = goals
+        self.createdAt = createdAt
+        self.updatedAt = updatedAt
+
+    # Names used by the original slidesgpt_generator schema
+    @property
+    def name(self) -> str:
+        return self.clubName
+
+    @property
+    def user_role(self) -> str:
+        return self.userRole
+
+    @property
+    def user_name(self) -> str:
+        return self.userName
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ClubData":
+        """Build from a parsed club object; missing or null fields become '', numbers are stringified"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Club data must be a JSON object, not {type(data).__name__}")
+        values = {}
+        for name in CLUB_FIELDS:
+            value = data.get(name)
+            if value is None:
+                continue
+            if isinstance(value, (dict, list)):
+                raise ValueError(f"Club field '{name}' must be a string")
+            values[name] = value if isinstance(value, str) else str(value)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {name: getattr(self, name) for name in CLUB_FIELDS}
+
+
+CLUB_FIELDS = tuple(f.name for f in fields(ClubData))
+
+
+def _decode_with_json(raw: bytes) -> ClubData:
+    return ClubData.from_dict(json.loads(raw))
+
+
+def _make_orjson_decoder():
+    import orjson
+
+    def decode(raw: bytes) -> ClubData:
+        return ClubData.from_dict(orjson.loads(raw))
+
+    return decode
+
+
+def _make_msgspec_decoder():
+    import msgspec
+    decoder = msgspec.json.Decoder(ClubData)
+
+    def decode(raw: bytes) -> ClubData:
+        try:
+            return decoder.decode(raw)
+        except msgspec.ValidationError:
+            # Valid JSON with nulls or numbers in string fields: take the lenient path
+            return ClubData.from_dict(msgspec.json.decode(raw))
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+    return decode
+
+
+def _lazy_decoder(backend: str, build: Callable[[], Callable[[bytes], ClubData]]):
+    # The first club goes through json (already imported, and faster than importing
+    # msgspec for one file); the second builds the real decoder and swaps it in
+    calls = []
+
+    def decode(raw: bytes) -> ClubData:
+        if not calls:
+            calls.append(None)
+            return _decode_with_json(raw)
+        DECODERS[backend] = build()
+        return DECODERS[backend](raw)
+
+    return decode
+
+
+DECODERS = {"json": _decode_with_json}
+if importlib.util.find_spec("orjson") is not None:
+    DECODERS["orjson"] = _lazy_decoder("orjson", _make_orjson_decoder)
+if importlib.util.find_spec("msgspec") is not None:
+    DECODERS["msgspec"] = _lazy_decoder("msgspec", _make_msgspec_decoder)
+
+DEFAULT_BACKEND = os.getenv("CLUBLY_JSON_BACKEND") or next(
+    backend for backend in ("msgspec", "orjson", "json") if backend in DECODERS)
+
+
+def decode_club(raw: bytes, backend: Optional[str] = None) -> ClubData:
+    """Parse one club JSON document; raises ValueError if it is malformed"""
+    try:
+        decode = DECODERS[backend or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(f"JSON backend not available: {backend or DEFAULT_BACKEND}")
+    # json, orjson and Unicode decode errors all subclass ValueError
+    return decode(raw)
+
+
+def load_club_file(path: str, backend: Optional[str] = None) -> ClubData:
+    """Read and decode one club file (FileNotFoundError / ValueError on failure)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return decode_club(raw, backend)
+
+
+def load_club_files(paths: Iterable[str], backend: Optional[str] = None, skip_invalid: bool = False) -> List[ClubData]:
+    """Decode many club files with one decoder; malformed files raise unless skip_invalid"""
+    clubs = []
+    for path in paths:
+        try:
+            clubs.append(load_club_file(path, backend))
+        except (OSError, ValueError):
+            if not skip_invalid:
+                raise
+    return clubs
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Persistent club index for Clubly
+Maps clubName/clubId/userId to club JSON files under data/clubs so a lookup is a
+dictionary hit instead of a walk over every user directory.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILENAME = ".club_index.json"
+DEFAULT_MISS_REFRESH_INTERVAL = 10.0
+
+
+class ClubIndex:
+    """
+    On-disk index of club files, keyed by path relative to the data directory.
+
+    Each entry records clubName/clubId/userId plus the file's mtime and size.
+    Directory mtimes are stored too, so refresh() only rescans user directories
+    whose listing changed (files added, renamed or deleted). Lookups re-stat the
+    matched file, which catches files rewritten in place. A miss re-stats every
+    file (to find a club renamed in place) at most once per
+    miss_refresh_interval seconds, so repeated lookups of unknown names stay cheap.
+
+    A filesystem watcher (club_watcher.py) can instead push changes through
+    update_file()/remove_file() and set live=True; lookups then trust memory and
+    neither stat, rescan nor save.
+    """
+
+    def __init__(self, data_directory: str = "data/clubs", index_path: Optional[str] = None,
+                 miss_refresh_interval: float = DEFAULT_MISS_REFRESH_INTERVAL, clock=time.monotonic):
+        self.data_directory = Path(data_directory)
+        self.index_path = Path(index_path) if index_path else self.data_directory / DEFAULT_INDEX_FILENAME
+        self.directories: Dict[str, int] = {}
+        self.entries: Dict[str, Dict] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_id: Dict[str, List[str]] = {}
+        self._by_user: Dict[str, List[str]] = {}
+        self._dirty = False
+        self.live = False
+        self.miss_refresh_interval = miss_refresh_interval
+        self._clock = clock
+        self._last_deep_refresh: Optional[float] = None
+
+    @classmethod
+    def open(cls, data_directory: str = "data/clubs", index_path: Optional[str] = None) -> "ClubIndex":
+        """Load the persisted index (building it on first use) and bring it up to date"""
+        index = cls(data_directory, index_path)
+        if index.load():
+            index.refresh()
+        else:
+            index.rebuild()
+        index.save()
+        return index
+
+    def load(self) -> bool:
+        """Load the index file; returns False if it is missing, corrupt or for another tree"""
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return False
+
+        if data.get('version') != INDEX_VERSION:
+            return False
+        if data.get('data_directory') != str(self.data_directory.resolve()):
+            return False
+
+        self.directories = data.get('directories', {})
+        self.entries = data.get('entries', {})
+        self._reindex()
+        self._dirty = False
+        return True
+
+    def save(self) -> bool:
+        """Atomically write the index file if anything changed"""
+        if not self._dirty:
+            return True
+
+        payload = {
+            "version": INDEX_VERSION,
+            "data_directory": str(self.data_directory.resolve()),
+            "directories": self.directories,
+            "entries": self.entries
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # A read-only data directory still gets an in-memory index
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        self._dirty = False
+        return True
+
+    def rebuild(self) -> int:
+        """Discard everything and rescan the whole tree; returns the number of indexed clubs"""
+        self.directories = {}
+        self.entries = {}
+        self.refresh()
+        self._dirty = True
+        return len(self._by_id)
+
+    def refresh(self, deep: bool = False) -> int:
+        """
+        Bring the index up to date and return the number of changed entries.
+
+        Only user directories whose mtime changed are rescanned. With deep=True
+        every file is re-stat'ed as well, which picks up in-place rewrites; files
+        whose mtime and size are unchanged are never re-parsed.
+        """
+        if not self.data_directory.exists():
+            raise FileNotFoundError(f"Data directory not found: {self.data_directory}")
+        if deep:
+            self._last_deep_refresh = self._clock()
+
+        changes = 0
+        seen = set()
+        known = None
+        with os.scandir(self.data_directory) as it:
+            for dir_entry in it:
+                if not dir_entry.is_dir():
+                    continue
+                seen.add(dir_entry.name)
+                mtime_ns = dir_entry.stat().st_mtime_ns
+                if deep or self.directories.get(dir_entry.name) != mtime_ns:
+                    if known is None:
+                        known = self._paths_by_directory()
+                    changes += self._scan_directory(dir_entry.name, known.get(dir_entry.name, ()))
+                    self.directories[dir_entry.name] = mtime_ns
+
+        removed = [name for name in self.directories if name not in seen]
+        if removed and known is None:
+            known = self._paths_by_directory()
+        for name in removed:
+            changes += self._drop_directory(known.get(name, ()))
+            del self.directories[name]
+
+        if changes:
+            self._reindex()
+            self._dirty = True
+        return changes
+
+    def _paths_by_directory(self) -> Dict[str, List[str]]:
+        # Grouped once per refresh so stale-entry checks don't walk every entry for every directory
+        grouped: Dict[str, List[str]] = {}
+        for rel_path in self.entries:
+            grouped.setdefault(rel_path.split('/', 1)[0], []).append(rel_path)
+        return grouped
+
+    def _scan_directory(self, dir_name: str, known_paths) -> int:
+        changes = 0
+        present = set()
+        try:
+            with os.scandir(self.data_directory / dir_name) as it:
+                for file_entry in it:
+                    if not file_entry.name.endswith('.json') or not file_entry.is_file():
+                        continue
+                    rel_path = f"{dir_name}/{file_entry.name}"
+                    present.add(rel_path)
+                    st = file_entry.stat()
+                    current = self.entries.get(rel_path)
+                    if current and current['mtime_ns'] == st.st_mtime_ns and current['size'] == st.st_size:
+                        continue
+                    self.entries[rel_path] = self._read_entry(file_entry.path, st)
+                    changes += 1
+        except FileNotFoundError:
+            pass
+
+        for rel_path in known_paths:
+            if rel_path not in present:
+                del self.entries[rel_path]
+                changes += 1
+        return changes
+
+    def _drop_directory(self, known_paths) -> int:
+        for rel_path in known_paths:
+            del self.entries[rel_path]
+        return len(known_paths)
+
+    @staticmethod
+    def _read_entry(path: str, st: os.stat_result) -> Dict:
+        entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        try:
+            with open(path, 'r') as f:
+                club_data = json.load(f)
+            entry["clubName"] = club_data.get('clubName')
+            entry["clubId"] = club_data.get('clubId')
+            entry["userId"] = club_data.get('userId')
+        except (json.JSONDecodeError, AttributeError, UnicodeDecodeError, OSError):
+            # Malformed files are remembered so they aren't re-parsed until they change
+            entry["invalid"] = True
+        return entry
+
+    def update_file(self, rel_path: str) -> bool:
+        """Re-read one club file ("<user dir>/<file>.json") after it was written; returns True if it changed"""
+        path = self.data_directory / rel_path
+        try:
+            st = os.stat(path)
+        except OSError:
+            return self.remove_file(rel_path)
+        current = self.entries.get(rel_path)
+        if current and current['mtime_ns'] == st.st_mtime_ns and current['size'] == st.st_size:
+            return False
+        self._unindex(rel_path)
+        self.entries[rel_path] = self._read_entry(str(path), st)
+        self._index(rel_path)
+        self._touch_directory(rel_path.split('/', 1)[0])
+        return True
+
+    def remove_file(self, rel_path: str) -> bool:
+        """Forget a deleted or renamed-away club file"""
+        if rel_path not in self.entries:
+            return False
+        self._unindex(rel_path)
+        del self.entries[rel_path]
+        self._touch_directory(rel_path.split('/', 1)[0])
+        return True
+
+    def remove_directory(self, dir_name: str) -> int:
+        """Forget a deleted user directory and every club file in it"""
+        rel_paths = [p for p in self.entries if p.split('/', 1)[0] == dir_name]
+        for rel_path in rel_paths:
+            self._unindex(rel_path)
+            del self.entries[rel_path]
+        if self.directories.pop(dir_name, None) is not None or rel_paths:
+            self._dirty = True
+        return len(rel_paths)
+
+    def _touch_directory(self, dir_name: str):
+        # Record the directory's new mtime so a later refresh() doesn't rescan it
+        try:
+            self.directories[dir_name] = os.stat(self.data_directory / dir_name).st_mtime_ns
+        except OSError:
+            self.directories.pop(dir_name, None)
+        self._dirty = True
+
+    def _reindex(self):
+        self._by_name = {}
+        self._by_id = {}
+        self._by_user = {}
+        for rel_path in sorted(self.entries):
+            self._index(rel_path)
+
+    def _keys(self, rel_path: str):
+        entry = self.entries[rel_path]
+        if entry.get('invalid'):
+            return
+        if entry.get('clubName') is not None:
+            yield self._by_name, entry['clubName']
+        if entry.get('clubId'):
+            yield self._by_id, entry['clubId']
+        if entry.get('userId'):
+            yield self._by_user, entry['userId']
+
+    def _index(self, rel_path: str):
+        for mapping, key in self._keys(rel_path):
+            bisect.insort(mapping.setdefault(key, []), rel_path)
+
+    def _unindex(self, rel_path: str):
+        if rel_path not in self.entries:
+            return
+        for mapping, key in self._keys(rel_path):
+            paths = mapping[key]
+            paths.remove(rel_path)
+            if not paths:
+                del mapping[key]
+
+    def _is_fresh(self, rel_path: str) -> bool:
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(self.data_directory / rel_path)
+        except OSError:
+            return False
+        return entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size
+
+    def _lookup(self, candidates_fn) -> Optional[str]:
+        if self.live:
+            candidates = candidates_fn()
+            return str(self.data_directory / candidates[0]) if candidates else None
+        # Fast path: verify the hit with a single stat. On a stale hit or a miss,
+        # rescan changed directories, then fall back to re-stat'ing every file
+        # (always for a stale hit, rate-limited for a plain miss).
+        stale_hit = False
+        for deep in (None, False, True):
+            if deep and not stale_hit and not self._miss_refresh_due():
+                break
+            if deep is not None and not self.refresh(deep=deep):
+                continue
+            for rel_path in candidates_fn():
+                if self._is_fresh(rel_path):
+                    return str(self.data_directory / rel_path)
+                stale_hit = True
+        return None
+
+    def _miss_refresh_due(self) -> bool:
+        return (self._last_deep_refresh is None
+                or self._clock() - self._last_deep_refresh >= self.miss_refresh_interval)
+
+    def find_club(self, club_name: str, user_id: Optional[str] = None) -> Optional[str]:
+        """Return the path of the club file with this clubName (optionally for one user)"""
+        def candidates():
+            paths = self._by_name.get(club_name, [])
+            if user_id is not None:
+                paths = [p for p in paths if self.entries[p].get('userId') == user_id]
+            return paths
+
+        path = self._lookup(candidates)
+        if not self.live:
+            self.save()
+        return path
+
+    def find_club_by_id(self, club_id: str) -> Optional[str]:
+        """Return the path of the club file with this clubId"""
+        path = self._lookup(lambda: self._by_id.get(club_id, []))
+        if not self.live:
+            self.save()
+        return path
+
+    def clubs_for_user(self, user_id: str) -> List[str]:
+        """Return the paths of every club file owned by a user"""
+        if not self.live:
+            self.refresh()
+            self.save()
+        return [str(self.data_directory / p) for p in self._by_user.get(user_id, [])]
+
+    def stats(self) -> Dict:
+        return {
+            "index_path": str(self.index_path),
+            "directories": len(self.directories),
+            "files": len(self.entries),
+            "clubs": len(self._by_id),
+            "invalid_files": sum(1 for e in self.entries.values() if e.get('invalid'))
+        }
+
+
+def main():
+    """Command-line interface for maintaining the club index"""
+    parser = argparse.ArgumentParser(description='Build and query the persistent club index')
+    parser.add_argument('command', choices=['rebuild', 'refresh', 'lookup', 'stats'],
+                        help='rebuild: full rescan; refresh: rescan changed directories; lookup: find a club; stats: show index size')
+    parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
+    parser.add_argument('--index', help='Index file path (default: <data-dir>/.club_index.json)')
+    parser.add_argument('--club', help='Club name to look up')
+    parser.add_argument('--club-id', help='Club id to look up')
+    parser.add_argument('--deep', action='store_true', help='With refresh: re-stat every file, not just changed directories')
+
+    args = parser.parse_args()
+
+    try:
+        index = ClubIndex(args.data_dir, args.index)
+
+        if args.command == 'rebuild':
+            count = index.rebuild()
+            index.save()
+            print(f"Indexed {count} clubs in {args.data_dir}")
+        elif args.command == 'refresh':
+            if not index.load():
+                index.rebuild()
+            changes = index.refresh(deep=args.deep)
+            index.save()
+            print(f"Updated {changes} entries")
+        elif args.command == 'lookup':
+            if not args.club and not args.club_id:
+                parser.error('lookup requires --club or --club-id')
+            if not index.load():
+                index.rebuild()
+            path = index.find_club_by_id(args.club_id) if args.club_id else index.find_club(args.club)
+            if path is None:
+                print(f"Club '{args.club_id or args.club}' not found in {args.data_dir}", file=sys.stderr)
+                sys.exit(1)
+            print(path)
+        else:
+            if not index.load():
+                print(f"No index found at {index.index_path}", file=sys.stderr)
+                sys.exit(1)
+            print(json.dumps(index.stats(), indent=2))
+
+    except FileNotFoundError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
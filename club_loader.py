@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Bulk club loader for Clubly
+Streams every club in a data/clubs tree (or a consolidated NDJSON snapshot, or a
+club_store .pack) as ClubData objects. Club files are read whole and snapshots
+are split into byte ranges over mmap; both are decoded in a process pool, with
+only a bounded number of chunks in flight at once, so memory use does not grow
+with the size of the store. Malformed files are skipped, as find_club_file does.
+A .pack may hold superseded records and deletion tombstones, so its clubs are
+merged by clubId (last record wins) before being yielded.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from club_data import CLUB_FIELDS, ClubData, decode_club
+
+DEFAULT_CHUNK_FILES = 256
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+SNAPSHOT_SUFFIXES = (".ndjson", ".jsonl", ".pack")
+PACK_SUFFIX = ".pack"
+CLUB_ID_INDEX = CLUB_FIELDS.index("clubId")
+
+
+def _read_file(path: str) -> bytes:
+    # The decoders need the whole document as bytes, and copying a mapping into
+    # bytes costs the same as read() plus the mmap setup, so just read it
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _as_row(club: ClubData) -> Tuple[str, ...]:
+    # Plain tuples pickle faster than dataclass instances on the way back from workers
+    return tuple(getattr(club, name) for name in CLUB_FIELDS)
+
+
+def _decode_files(paths: List[str], backend: Optional[str]) -> Tuple[List[Tuple[str, ...]], int]:
+    rows, skipped = [], 0
+    for path in paths:
+        try:
+            rows.append(_as_row(decode_club(_read_file(path), backend)))
+        except (OSError, ValueError):
+            skipped += 1
+    return rows, skipped
+
+
+def _snapshot_lines(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = start
+        while position < end:
+            newline = mapped.find(b"\n", position, end)
+            line_end = end if newline == -1 else newline
+            line = mapped[position:line_end]
+            position = line_end + 1
+            if line.strip():
+                yield line
+
+
+def _decode_snapshot_range(path: str, start: int, end: int, backend: Optional[str]) -> Tuple[List[Tuple[str, ...]], int]:
+    rows, skipped = [], 0
+    for line in _snapshot_lines(path, start, end):
+        try:
+            club = decode_club(line, backend)
+        except ValueError:
+            skipped += 1
+            continue
+        rows.append(_as_row(club))
+    return rows, skipped
+
+
+def _tombstone_id(line: bytes) -> Optional[str]:
+    """clubId of a club_store deletion record, or None for any other line"""
+    # Only parse the line fully when it could be a tombstone
+    if b'"deleted"' not in line:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and record.get('deleted') is True:
+        return record.get('clubId')
+    return None
+
+
+def _decode_pack_range(path: str, start: int, end: int, backend: Optional[str]) -> Tuple[List[Tuple[str, ...]], int, List[str]]:
+    """Rows for the clubs a pack range leaves live, plus the clubIds it leaves deleted"""
+    live, deleted, skipped = {}, set(), 0
+    for line in _snapshot_lines(path, start, end):
+        club_id = _tombstone_id(line)
+        if club_id is not None:
+            live.pop(club_id, None)
+            deleted.add(club_id)
+            continue
+        try:
+            club = decode_club(line, backend)
+        except ValueError:
+            skipped += 1
+            continue
+        deleted.discard(club.clubId)
+        live.pop(club.clubId, None)
+        live[club.clubId] = _as_row(club)
+    return list(live.values()), skipped, sorted(deleted)
+
+
+def iter_club_paths(data_directory: str) -> Iterator[str]:
+    """Club file paths under data_directory/<user>/, listed lazily one directory at a time"""
+    with os.scandir(data_directory) as users:
+        user_dirs = sorted(entry.path for entry in users if entry.is_dir())
+    for user_dir in user_dirs:
+        with os.scandir(user_dir) as files:
+            names = sorted(entry.name for entry in files if entry.name.endswith('.json') and entry.is_file())
+        for name in names:
+            yield os.path.join(user_dir, name)
+
+
+def snapshot_ranges(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Tuple[int, int]]:
+    """Split an NDJSON file into byte ranges of about chunk_bytes that end on line boundaries"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            newline = mapped.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+
+def write_snapshot(data_directory: str, snapshot_path: str) -> int:
+    """Consolidate a club tree into one NDJSON file (one club per line); malformed files are left out"""
+    written = 0
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as out:
+        for path in iter_club_paths(data_directory):
+            try:
+                raw = _read_file(path)
+                decode_club(raw)
+            except (OSError, ValueError):
+                continue
+            out.write(b" ".join(raw.splitlines()) + b"\n")
+            written += 1
+    os.replace(tmp_path, snapshot_path)
+    return written
+
+
+class ClubBulkLoader:
+    """
+    Iterating yields ClubData for every valid club in `source`, a data directory
+    or an NDJSON snapshot (.ndjson/.jsonl, or a club_store .pack).
+
+    Work is split into chunks of chunk_files files or chunk_bytes of snapshot and
+    decoded by `workers` processes (workers <= 1 decodes in this process). At most
+    max_pending chunks are queued, and results come back in source order.
+    loaded/skipped count the clubs seen so far. A .pack is merged by clubId,
+    dropping deleted and superseded records, so its live clubs are held in
+    memory and yielded once the whole pack is read, ordered by their last write.
+    """
+
+    def __init__(self,
+                 source: str,
+                 workers: Optional[int] = None,
+                 chunk_files: int = DEFAULT_CHUNK_FILES,
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                 max_pending: Optional[int] = None,
+                 backend: Optional[str] = None):
+        self.source = source
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_files = chunk_files
+        self.chunk_bytes = chunk_bytes
+        self.max_pending = max_pending or max(2, self.workers * 2)
+        self.backend = backend
+        self.loaded = 0
+        self.skipped = 0
+
+    def is_snapshot(self) -> bool:
+        return os.path.isfile(self.source) and self.source.endswith(SNAPSHOT_SUFFIXES)
+
+    def is_pack(self) -> bool:
+        return self.is_snapshot() and self.source.endswith(PACK_SUFFIX)
+
+    def _tasks(self) -> Iterator[Tuple]:
+        if self.is_snapshot():
+            decode = _decode_pack_range if self.is_pack() else _decode_snapshot_range
+            for start, end in snapshot_ranges(self.source, self.chunk_bytes):
+                yield decode, (self.source, start, end, self.backend)
+            return
+        if not os.path.isdir(self.source):
+            raise FileNotFoundError(f"Data directory not found: {self.source}")
+        chunk = []
+        for path in iter_club_paths(self.source):
+            chunk.append(path)
+            if len(chunk) >= self.chunk_files:
+                yield _decode_files, (chunk, self.backend)
+                chunk = []
+        if chunk:
+            yield _decode_files, (chunk, self.backend)
+
+    def _chunk_results(self) -> Iterator[Tuple]:
+        if self.workers <= 1:
+            for fn, args in self._tasks():
+                yield fn(*args)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for fn, args in self._tasks():
+                pending.append(pool.submit(fn, *args))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _merged_pack(self) -> Iterator[ClubData]:
+        live = {}
+        for rows, skipped, deleted in self._chunk_results():
+            self.skipped += skipped
+            for club_id in deleted:
+                live.pop(club_id, None)
+            for row in rows:
+                live.pop(row[CLUB_ID_INDEX], None)
+                live[row[CLUB_ID_INDEX]] = row
+        self.loaded += len(live)
+        for row in live.values():
+            yield ClubData(*row)
+
+    def __iter__(self) -> Iterator[ClubData]:
+        if self.is_pack():
+            yield from self._merged_pack()
+            return
+        for rows, skipped in self._chunk_results():
+            self.skipped += skipped
+            self.loaded += len(rows)
+            for row in rows:
+                yield ClubData(*row)
+
+
+def load_all_clubs(source: str, workers: Optional[int] = None, backend: Optional[str] = None) -> Iterator[ClubData]:
+    """Convenience generator over ClubBulkLoader(source, workers, backend=backend)"""
+    return iter(ClubBulkLoader(source, workers=workers, backend=backend))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load every club from a data directory or NDJSON snapshot')
+    parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
+    parser.add_argument('--snapshot', help='Read this NDJSON snapshot instead of --data-dir')
+    parser.add_argument('--write-snapshot', metavar='PATH', help='Consolidate --data-dir into an NDJSON snapshot and exit')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Decoder processes; 1 decodes in-process (default: CPU count)')
+    parser.add_argument('--chunk-files', type=int, default=DEFAULT_CHUNK_FILES, help=f'Files per work chunk (default: {DEFAULT_CHUNK_FILES})')
+    parser.add_argument('--backend', help='JSON decoder: json, orjson or msgspec (default: fastest installed)')
+    parser.add_argument('--output', help='Write the loaded clubs as NDJSON to this file')
+
+    args = parser.parse_args()
+
+    if args.write_snapshot:
+        written = write_snapshot(args.data_dir, args.write_snapshot)
+        print(f"Wrote {written} clubs to {args.write_snapshot}")
+        return 0
+
+    loader = ClubBulkLoader(args.snapshot or args.data_dir, workers=args.workers,
+                            chunk_files=args.chunk_files, backend=args.backend)
+    started = time.perf_counter()
+    out = open(args.output, 'w') if args.output else None
+    try:
+        for club in loader:
+            if out:
+                out.write(json.dumps(club.to_dict()) + "\n")
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"Loaded {loader.loaded} clubs in {elapsed:.2f}s "
+          f"({loader.loaded / elapsed if elapsed else 0:.0f} clubs/s, {loader.skipped} malformed skipped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
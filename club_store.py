@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Consolidated club data stores for Clubly
+Keeps every club in one SQLite database or one append-only packed NDJSON file
+with an offset index, instead of one JSON file per club. Lookups by name, id or
+user are indexed, and loading every club is a single sequential read.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from club_data import ClubData, decode_club, load_club_file
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+PACK_INDEX_VERSION = 1
+ITER_BATCH_SIZE = 500
+
+
+class ClubStore(ABC):
+    """
+    Common find/load API shared by the store backends.
+
+    find_* methods return a locator string ("<scheme>:<store path>#<clubId>")
+    that load() turns back into ClubData, mirroring find_club_file() and
+    load_club_data_from_file() for the JSON tree. put_raw() keeps the document's
+    content but the packed backend folds it onto one line, and put() re-serialises
+    from ClubData (dropping unknown fields), so exports match the original files
+    as JSON rather than byte for byte.
+    """
+
+    scheme = ""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+    def locator(self, club_id: str) -> str:
+        return f"{self.scheme}:{self.path}#{club_id}"
+
+    def owns(self, locator: str) -> bool:
+        return locator.startswith(f"{self.scheme}:{self.path}#")
+
+    def club_id_from(self, locator: str) -> str:
+        if not self.owns(locator):
+            raise ValueError(f"Locator does not belong to {self.path}: {locator}")
+        return locator.rsplit("#", 1)[1]
+
+    def load(self, locator: str) -> ClubData:
+        raw = self.get_raw(self.club_id_from(locator))
+        if raw is None:
+            raise FileNotFoundError(f"Club not found in store: {locator}")
+        return decode_club(raw)
+
+    def put_raw(self, raw: bytes) -> str:
+        """Insert or replace a club document; returns its locator"""
+        club = decode_club(raw)
+        if not club.clubId:
+            raise ValueError("Club document has no clubId")
+        self._put(club, raw)
+        return self.locator(club.clubId)
+
+    def put(self, club: ClubData) -> str:
+        return self.put_raw(json.dumps(club.to_dict(), ensure_ascii=False).encode('utf-8'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Implemented by backends
+    @abstractmethod
+    def _put(self, club: ClubData, raw: bytes):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_raw(self, club_id: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, club_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_club(self, club_name: str, user_id: Optional[str] = None) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_club_by_id(self, club_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clubs_for_user(self, user_id: str) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_raw(self) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def load_all(self) -> Iterator[ClubData]:
+        """Every club, decoded in one sequential pass over the store"""
+        for raw in self.iter_raw():
+            yield decode_club(raw)
+
+
+class SQLiteClubStore(ClubStore):
+    """Clubs in one SQLite table with indexes on clubName and userId"""
+
+    scheme = "sqlite"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS clubs (
+                club_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                club_name TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                document BLOB NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS clubs_by_name ON clubs (club_name, user_id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS clubs_by_user ON clubs (user_id)")
+        self._db.commit()
+
+    def _put(self, club: ClubData, raw: bytes):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO clubs VALUES (?, ?, ?, ?, ?)",
+                             (club.clubId, club.userId, club.clubName, club.updatedAt, raw))
+            self._db.commit()
+
+    def put_many_raw(self, documents: List[bytes]) -> int:
+        """Insert many documents in one transaction"""
+        rows = []
+        for raw in documents:
+            club = decode_club(raw)
+            if club.clubId:
+                rows.append((club.clubId, club.userId, club.clubName, club.updatedAt, raw))
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO clubs VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+        return len(rows)
+
+    def _query(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def get_raw(self, club_id: str) -> Optional[bytes]:
+        rows = self._query("SELECT document FROM clubs WHERE club_id = ?", (club_id,))
+        return bytes(rows[0][0]) if rows else None
+
+    def delete(self, club_id: str) -> bool:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM clubs WHERE club_id = ?", (club_id,)).rowcount
+            self._db.commit()
+        return bool(deleted)
+
+    def find_club(self, club_name: str, user_id: Optional[str] = None) -> Optional[str]:
+        if user_id is None:
+            rows = self._query("SELECT club_id FROM clubs WHERE club_name = ? ORDER BY user_id, club_id LIMIT 1",
+                               (club_name,))
+        else:
+            rows = self._query("SELECT club_id FROM clubs WHERE club_name = ? AND user_id = ? ORDER BY club_id LIMIT 1",
+                               (club_name, user_id))
+        return self.locator(rows[0][0]) if rows else None
+
+    def find_club_by_id(self, club_id: str) -> Optional[str]:
+        rows = self._query("SELECT club_id FROM clubs WHERE club_id = ?", (club_id,))
+        return self.locator(club_id) if rows else None
+
+    def clubs_for_user(self, user_id: str) -> List[str]:
+        rows = self._query("SELECT club_id FROM clubs WHERE user_id = ? ORDER BY club_id", (user_id,))
+        return [self.locator(row[0]) for row in rows]
+
+    def iter_raw(self) -> Iterator[bytes]:
+        # Fetched in batches so a bulk load holds ITER_BATCH_SIZE documents, not the whole table
+        with self._lock:
+            cursor = self._db.execute("SELECT document FROM clubs ORDER BY rowid")
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(ITER_BATCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield bytes(row[0])
+        finally:
+            cursor.close()
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM clubs", ())[0][0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class PackedClubStore(ClubStore):
+    """
+    Clubs as lines of one append-only NDJSON file plus an offset index.
+
+    A put appends the document and points the index at it; a delete appends a
+    {"clubId": ..., "deleted": true} tombstone. <path>.idx records
+    clubId -> (offset, length) along with the pack size it describes; if the pack
+    has grown past that (another writer, or a crash before the index was saved)
+    the index is rebuilt with one sequential scan. compact() rewrites only the
+    live records.
+    """
+
+    scheme = "pack"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.index_path = self.path + ".idx"
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._by_name: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_user: Dict[str, List[str]] = {}
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        Path(self.path).touch(exist_ok=True)
+        if not self._load_index():
+            self._rebuild_index()
+        self._pack = open(self.path, 'ab')
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if data.get('version') != PACK_INDEX_VERSION or data.get('pack_size') != os.path.getsize(self.path):
+            return False
+        for club_id, (offset, length, club_name, user_id) in data['clubs'].items():
+            self._remember(club_id, offset, length, club_name, user_id)
+        return True
+
+    def _rebuild_index(self):
+        self._offsets, self._by_name, self._by_user, self._meta = {}, {}, {}, {}
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._apply_line(line, offset, len(line))
+                offset += len(line)
+        if offset < os.path.getsize(self.path):
+            # Torn last line from a crash mid-append: drop it so the next put starts a clean line
+            os.truncate(self.path, offset)
+
+    def _apply_line(self, line: bytes, offset: int, length: int):
+        # Records that don't decode to a club (bad JSON, structured field values) are skipped
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or not record.get('clubId'):
+                return
+            club_id = str(record['clubId'])
+            club = None if record.get('deleted') else ClubData.from_dict(record)
+        except ValueError:
+            return
+        if club is None:
+            self._forget(club_id)
+        else:
+            self._remember(club_id, offset, length, club.clubName, club.userId)
+
+    def _remember(self, club_id: str, offset: int, length: int, club_name: str, user_id: str):
+        self._forget(club_id)
+        self._offsets[club_id] = (offset, length)
+        self._meta[club_id] = (club_name, user_id)
+        self._by_name.setdefault(club_name, []).append((user_id, club_id))
+        self._by_user.setdefault(user_id, []).append(club_id)
+
+    def _forget(self, club_id: str):
+        if club_id not in self._offsets:
+            return
+        club_name, user_id = self._meta.pop(club_id)
+        del self._offsets[club_id]
+        self._by_name[club_name].remove((user_id, club_id))
+        self._by_user[user_id].remove(club_id)
+
+    def _append(self, line: bytes) -> int:
+        self._pack.seek(0, os.SEEK_END)
+        offset = self._pack.tell()
+        self._pack.write(line)
+        self._pack.flush()
+        return offset
+
+    def _put(self, club: ClubData, raw: bytes):
+        line = b" ".join(raw.splitlines()) + b"\n"
+        with self._lock:
+            offset = self._append(line)
+            self._remember(club.clubId, offset, len(line), club.clubName, club.userId)
+
+    def delete(self, club_id: str) -> bool:
+        with self._lock:
+            if club_id not in self._offsets:
+                return False
+            self._append(json.dumps({"clubId": club_id, "deleted": True}).encode('utf-8') + b"\n")
+            self._forget(club_id)
+            return True
+
+    def get_raw(self, club_id: str) -> Optional[bytes]:
+        with self._lock:
+            location = self._offsets.get(club_id)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).rstrip(b"\n")
+
+    def find_club(self, club_name: str, user_id: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            matches = sorted(m for m in self._by_name.get(club_name, ()) if user_id is None or m[0] == user_id)
+        return self.locator(matches[0][1]) if matches else None
+
+    def find_club_by_id(self, club_id: str) -> Optional[str]:
+        with self._lock:
+            return self.locator(club_id) if club_id in self._offsets else None
+
+    def clubs_for_user(self, user_id: str) -> List[str]:
+        with self._lock:
+            return [self.locator(club_id) for club_id in sorted(self._by_user.get(user_id, ()))]
+
+    def iter_raw(self) -> Iterator[bytes]:
+        with self._lock:
+            live = {offset for offset, _ in self._offsets.values()}
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if offset in live:
+                    yield line.rstrip(b"\n")
+                offset += len(line)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._offsets)
+
+    def save_index(self):
+        with self._lock:
+            self._pack.flush()
+            data = {
+                "version": PACK_INDEX_VERSION,
+                "pack_size": os.path.getsize(self.path),
+                "clubs": {club_id: [offset, length, *self._meta[club_id]]
+                          for club_id, (offset, length) in self._offsets.items()}
+            }
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+
+    def compact(self) -> int:
+        """Rewrite the pack with only live records; returns bytes reclaimed"""
+        before = os.path.getsize(self.path)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as out:
+            for raw in self.iter_raw():
+                out.write(raw + b"\n")
+        with self._lock:
+            self._pack.close()
+            os.replace(tmp_path, self.path)
+            self._pack = open(self.path, 'ab')
+            self._rebuild_index()
+        self.save_index()
+        return before - os.path.getsize(self.path)
+
+    def close(self):
+        self.save_index()
+        with self._lock:
+            self._pack.close()
+
+
+def open_club_store(path: str, create: bool = False) -> ClubStore:
+    """
+    Open a store, choosing the backend from the file extension (.db/.sqlite -> SQLite, else packed)
+
+    A missing store raises FileNotFoundError unless create is set, so a mistyped
+    path on a read doesn't quietly leave an empty store behind.
+    """
+    if not create and not os.path.exists(path):
+        raise FileNotFoundError(f"Club store not found: {path}")
+    if str(path).lower().endswith(SQLITE_SUFFIXES):
+        return SQLiteClubStore(path)
+    return PackedClubStore(path)
+
+
+def iter_club_tree(data_directory: str) -> Iterator[Tuple[str, bytes]]:
+    """(path, raw document) for every readable club file under data_directory/<user>/"""
+    with os.scandir(data_directory) as users:
+        for user_dir in sorted(users, key=lambda entry: entry.name):
+            if not user_dir.is_dir():
+                continue
+            with os.scandir(user_dir.path) as files:
+                for file_entry in sorted(files, key=lambda entry: entry.name):
+                    if file_entry.name.endswith('.json') and file_entry.is_file():
+                        with open(file_entry.path, 'rb') as f:
+                            yield file_entry.path, f.read()
+
+
+def import_tree(store: ClubStore, data_directory: str) -> Dict[str, int]:
+    """Copy every club file into the store; malformed files are skipped like find_club_file does"""
+    imported, skipped, batch = 0, 0, []
+    for _, raw in iter_club_tree(data_directory):
+        try:
+            club = decode_club(raw)
+        except ValueError:
+            skipped += 1
+            continue
+        if not club.clubId:
+            skipped += 1
+            continue
+        if isinstance(store, SQLiteClubStore):
+            batch.append(raw)
+            if len(batch) >= 1000:
+                imported += store.put_many_raw(batch)
+                batch = []
+        else:
+            store.put_raw(raw)
+            imported += 1
+    if batch:
+        imported += store.put_many_raw(batch)
+    return {"imported": imported, "skipped": skipped}
+
+
+def club_file_name(club: ClubData) -> str:
+    """Same naming as the frontend's /api/clubs/save route"""
+    return f"{re.sub(r'[^a-zA-Z0-9]', '_', club.clubName)}_{club.clubId}.json"
+
+
+def export_tree(store: ClubStore, data_directory: str) -> int:
+    """Write every club back out as data_directory/<userId>/<clubName>_<clubId>.json"""
+    exported = 0
+    for raw in store.iter_raw():
+        club = decode_club(raw)
+        user_dir = Path(data_directory) / (club.userId or "unknown")
+        user_dir.mkdir(parents=True, exist_ok=True)
+        with open(user_dir / club_file_name(club), 'wb') as f:
+            f.write(raw)
+        exported += 1
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import, export and query a consolidated club store (.db = SQLite, otherwise packed NDJSON)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Copy the JSON club tree into a store')
+    import_parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
+    import_parser.add_argument('--store', required=True, help='Store file, e.g. clubs.db or clubs.pack')
+
+    export_parser = subparsers.add_parser('export', help='Write a store back out as a JSON club tree')
+    export_parser.add_argument('--store', required=True, help='Store file')
+    export_parser.add_argument('--data-dir', required=True, help='Directory to write club files into')
+
+    lookup_parser = subparsers.add_parser('lookup', help='Look up a club by name or id')
+    lookup_parser.add_argument('--store', required=True, help='Store file')
+    lookup_parser.add_argument('--club', help='Club name')
+    lookup_parser.add_argument('--club-id', help='Club id')
+    lookup_parser.add_argument('--user', help='Restrict a name lookup to this user id')
+
+    stats_parser = subparsers.add_parser('stats', help='Show store statistics')
+    stats_parser.add_argument('--store', required=True, help='Store file')
+
+    compact_parser = subparsers.add_parser('compact', help='Drop superseded and deleted records from a packed store')
+    compact_parser.add_argument('--store', required=True, help='Packed store file')
+
+    args = parser.parse_args()
+
+    try:
+        store = open_club_store(args.store, create=args.command == 'import')
+    except FileNotFoundError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    with store:
+        if args.command == 'import':
+            result = import_tree(store, args.data_dir)
+            print(f"Imported {result['imported']} clubs into {args.store} ({result['skipped']} malformed files skipped)")
+        elif args.command == 'export':
+            print(f"Exported {export_tree(store, args.data_dir)} clubs to {args.data_dir}")
+        elif args.command == 'lookup':
+            if not args.club and not args.club_id:
+                parser.error('lookup needs --club or --club-id')
+            locator = store.find_club_by_id(args.club_id) if args.club_id else store.find_club(args.club, args.user)
+            if locator is None:
+                print("Club not found", file=sys.stderr)
+                return 1
+            print(json.dumps(store.load(locator).to_dict(), indent=2))
+        elif args.command == 'stats':
+            print(json.dumps({"backend": store.scheme, "clubs": store.count(),
+                              "bytes": os.path.getsize(args.store)}, indent=2))
+        elif args.command == 'compact':
+            if not isinstance(store, PackedClubStore):
+                parser.error('compact only applies to packed stores')
+            print(f"Reclaimed {store.compact()} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
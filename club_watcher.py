@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Live club index for long-running Clubly processes
+Keeps an in-memory ClubIndex current as the frontend writes club files. On
+Linux this uses inotify (through ctypes, no extra dependency); elsewhere, or if
+inotify is unavailable, it falls back to polling refresh() on an interval.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from club_index import ClubIndex
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+USER_DIR_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyUnavailable(OSError):
+    pass
+
+
+class Inotify:
+    """Minimal non-blocking inotify wrapper"""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise InotifyUnavailable("inotify is only available on Linux")
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+            init1 = libc.inotify_init1
+        except (OSError, AttributeError) as e:
+            raise InotifyUnavailable(f"libc has no inotify: {e}")
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise InotifyUnavailable(err, f"inotify_init1 failed: {os.strerror(err)}")
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch({path}) failed: {os.strerror(err)}")
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List:
+        """(wd, mask, name) for every queued event; empty if none are pending"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ClubWatcher:
+    """
+    ClubIndex kept up to date by filesystem events.
+
+    With inotify, the root data directory and every user directory are watched;
+    each written, renamed or deleted club file updates the index in place, and
+    find_club() drains pending events first, so a lookup right after a write
+    sees it without stat'ing or rescanning anything. If the event queue
+    overflows, new user directories are watched and the index does one deep
+    refresh. An event that can't be applied (say a new user directory that
+    vanished or is unreadable) triggers a deep refresh instead, and if the
+    watcher thread itself fails it falls back to polling so lookups go back
+    to checking the disk.
+
+    With polling (backend="poll", or when inotify is unavailable) a background
+    thread runs refresh() every poll_interval seconds and lookups keep the
+    index's usual stat-and-rescan checks. A file rewritten in place under a new
+    club name is only found by a deep refresh, which misses run at most once
+    per miss_refresh_interval; sync() forces one.
+
+    The index file is saved at most every save_interval seconds and on stop().
+    """
+
+    def __init__(self,
+                 data_directory: str = "data/clubs",
+                 index_path: Optional[str] = None,
+                 backend: str = "auto",
+                 poll_interval: float = 1.0,
+                 save_interval: float = 30.0):
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"Unknown watch backend: {backend}")
+        self.data_directory = data_directory
+        self.index = ClubIndex.open(data_directory, index_path)
+        self.poll_interval = poll_interval
+        self.save_interval = save_interval
+        self.events_applied = 0
+        self.overflows = 0
+        self.errors = 0
+        self._requested_backend = backend
+        self.backend: Optional[str] = None
+        self._inotify: Optional[Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_save = time.monotonic()
+
+    def start(self) -> "ClubWatcher":
+        if self._thread is not None:
+            return self
+        if self._requested_backend != "poll":
+            try:
+                self._start_inotify()
+            except OSError:
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+                self._watches = {}
+                if self._requested_backend == "inotify":
+                    raise
+        if self._inotify is None:
+            self.backend = "poll"
+            target = self._poll_loop
+        else:
+            self.backend = "inotify"
+            target = self._inotify_loop
+        self._thread = threading.Thread(target=target, name="club-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            self.index.live = False
+            self.index.save()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _start_inotify(self):
+        self._inotify = Inotify()
+        self._watches = {self._inotify.add_watch(self.data_directory, ROOT_MASK): ""}
+        self._watch_new_user_directories()
+        # Catch anything written between ClubIndex.open() and the watches being added
+        self.index.refresh(deep=True)
+        self.index.live = True
+
+    def _watch_user_directory(self, dir_name: str) -> bool:
+        try:
+            wd = self._inotify.add_watch(os.path.join(self.data_directory, dir_name), USER_DIR_MASK)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.ENOTDIR):
+                return False
+            raise
+        self._watches[wd] = dir_name
+        return True
+
+    def _watch_new_user_directories(self):
+        watched = set(self._watches.values())
+        try:
+            with os.scandir(self.data_directory) as it:
+                user_dirs = [entry.name for entry in it if entry.is_dir() and entry.name not in watched]
+        except FileNotFoundError:
+            return
+        for dir_name in user_dirs:
+            self._watch_user_directory(dir_name)
+
+    def _apply(self, wd: int, mask: int, name: str):
+        if mask & IN_Q_OVERFLOW:
+            self.overflows += 1
+            # Directories created while events were being dropped have no watch yet
+            self._watch_new_user_directories()
+            self.index.refresh(deep=True)
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        dir_name = self._watches.get(wd)
+        if dir_name is None:
+            return
+        if dir_name == "":
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The data directory itself went away; nothing left to index
+                for user_dir in list(self.index.directories):
+                    self.index.remove_directory(user_dir)
+                return
+            if not mask & IN_ISDIR:
+                return
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                if self._watch_user_directory(name):
+                    # Files may have landed before the watch was added
+                    with os.scandir(os.path.join(self.data_directory, name)) as it:
+                        for entry in it:
+                            if entry.name.endswith('.json') and entry.is_file():
+                                self.index.update_file(f"{name}/{entry.name}")
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self.index.remove_directory(name)
+            self.events_applied += 1
+            return
+        if not name.endswith('.json') or mask & IN_ISDIR:
+            return
+        rel_path = f"{dir_name}/{name}"
+        if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            self.index.update_file(rel_path)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self.index.remove_file(rel_path)
+        self.events_applied += 1
+
+    def _drain(self):
+        # Caller holds the lock
+        if self._inotify is None:
+            return
+        while True:
+            events = self._inotify.read_events()
+            if not events:
+                break
+            for event in events:
+                try:
+                    self._apply(*event)
+                except OSError:
+                    # Rescan instead of losing the event, and keep going with the rest of the batch
+                    self.errors += 1
+                    self._refresh_after_error()
+
+    def _refresh_after_error(self):
+        try:
+            self.index.refresh(deep=True)
+        except OSError:
+            # The data directory itself is gone or unreadable; its root events say so
+            self.errors += 1
+
+    def _fall_back_to_polling(self, error: Exception):
+        # Caller holds the lock. Without events the index can't stay live, so lookups check the disk again
+        print(f"Club watcher: inotify failed ({error!r}), falling back to polling", file=sys.stderr)
+        self.errors += 1
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches = {}
+        self.index.live = False
+        self.backend = "poll"
+
+    def _maybe_save(self):
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.index.save()
+            self._last_save = time.monotonic()
+
+    def _inotify_loop(self):
+        try:
+            while not self._stop.is_set():
+                readable, _, _ = select.select([self._inotify.fd], [], [], min(self.poll_interval, 0.5))
+                with self._lock:
+                    if readable:
+                        self._drain()
+                    self._maybe_save()
+        except Exception as e:
+            with self._lock:
+                self._fall_back_to_polling(e)
+            self._poll_loop()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                try:
+                    self.events_applied += self.index.refresh()
+                except FileNotFoundError:
+                    continue
+                self._maybe_save()
+
+    def sync(self):
+        """Apply every change the watcher has been told about so far"""
+        with self._lock:
+            if self._inotify is not None:
+                self._drain()
+            else:
+                self.events_applied += self.index.refresh(deep=True)
+
+    def find_club(self, club_name: str, user_id: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            self._drain()
+            return self.index.find_club(club_name, user_id)
+
+    def find_club_by_id(self, club_id: str) -> Optional[str]:
+        with self._lock:
+            self._drain()
+            return self.index.find_club_by_id(club_id)
+
+    def clubs_for_user(self, user_id: str) -> List[str]:
+        with self._lock:
+            self._drain()
+            return self.index.clubs_for_user(user_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = self.index.stats()
+        stats.update(backend=self.backend, watches=len(self._watches),
+                     events_applied=self.events_applied, overflows=self.overflows, errors=self.errors)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch a club data directory and keep its index current')
+    parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
+    parser.add_argument('--index', help='Index file path (default: <data-dir>/.club_index.json)')
+    parser.add_argument('--backend', choices=['auto', 'inotify', 'poll'], default='auto', help='Change detection (default: inotify if available)')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls with the poll backend (default: 1)')
+    parser.add_argument('--save-interval', type=float, default=30.0, help='Seconds between index file saves (default: 30)')
+    parser.add_argument('--stats-every', type=float, default=10.0, help='Print index stats this often in seconds (default: 10)')
+
+    args = parser.parse_args()
+
+    try:
+        watcher = ClubWatcher(args.data_dir, args.index, args.backend, args.poll_interval, args.save_interval).start()
+    except (FileNotFoundError, InotifyUnavailable) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"Watching {args.data_dir} with {watcher.backend} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.stats_every)
+            print(watcher.stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
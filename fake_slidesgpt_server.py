@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the SlidesGPT API
+Implements POST /generate, POST /v1/presentations/generate and GET /download/{id}
+with configurable latency, injected 429/5xx errors and synthetic .pptx bodies, so
+throughput, retry and download benchmarks can run without network access.
+"""
+
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+LATENCY_KINDS = ("fixed", "uniform", "exponential", "lognormal")
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Turn a latency spec into a sampler returning seconds.
+
+    Specs: "0.2" or "fixed:0.2", "uniform:0.1,0.5", "exponential:0.3" (mean),
+    "lognormal:0.5,0.4" (median, sigma).
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    try:
+        values = [float(v) for v in args.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exponential" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) if values[0] > 0 else 0.0
+    raise ValueError(f"Invalid latency spec: {spec} (expected one of {', '.join(LATENCY_KINDS)})")
+
+
+def parse_size(value) -> int:
+    """Parse 5242880, '512KB' or '5MB' into bytes"""
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def synthetic_pptx(size: int, seed: int = 0) -> bytes:
+    """A valid zip with a minimal [Content_Types].xml, padded with incompressible bytes to ~size"""
+    content_types = ('<?xml version="1.0" encoding="UTF-8"?>'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+
+    def build(padding: int) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as deck:
+            deck.writestr("[Content_Types].xml", content_types)
+            deck.writestr("ppt/media/padding.bin", random.Random(seed).randbytes(padding))
+        return buffer.getvalue()
+
+    overhead = len(build(0))
+    return build(max(0, size - overhead))
+
+
+@dataclass
+class FakeServerConfig:
+    latency: str = "0"
+    download_latency: str = "0"
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    deck_size: int = 256 * 1024
+    bandwidth: Optional[int] = None
+    seed: Optional[int] = None
+
+
+class FakeSlidesGPTServer:
+    """
+    Threaded fake SlidesGPT server, usable as a context manager.
+
+    Each request first sleeps for a sampled latency, then fails with a 429
+    (throttle_rate, with Retry-After) or a 500 (error_rate); otherwise it is
+    served normally. Downloads are a synthetic .pptx of deck_size bytes with an
+    ETag and Range support, optionally paced to `bandwidth` bytes/second.
+    """
+
+    def __init__(self, config: Optional[FakeServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._generate_latency = parse_latency(self.config.latency)
+        self._download_latency = parse_latency(self.config.download_latency)
+        self._ids = itertools.count(1)
+        self._decks: Dict[int, bytes] = {}
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), _FakeHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSlidesGPTServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def sample(self, sampler: Callable[[random.Random], float]) -> float:
+        with self._rng_lock:
+            return max(0.0, sampler(self._rng))
+
+    def injected_failure(self) -> Optional[int]:
+        with self._rng_lock:
+            roll = self._rng.random()
+        if roll < self.config.throttle_rate:
+            return 429
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return 500
+        return None
+
+    def next_presentation_id(self) -> str:
+        return f"fake-{next(self._ids)}"
+
+    def deck(self) -> bytes:
+        size = self.config.deck_size
+        with self._rng_lock:
+            if size not in self._decks:
+                self._decks[size] = synthetic_pptx(size, seed=size)
+            return self._decks[size]
+
+    def record(self, endpoint: str, status: int):
+        with self._stats_lock:
+            counts = self._stats.setdefault(endpoint, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Responses served so far, by endpoint and status code"""
+        with self._stats_lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._stats.items()}
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY the body waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            # The client hung up mid-response (a hedged loser, a cancelled download); not a server error
+            self.close_connection = True
+
+    @property
+    def fake(self) -> FakeSlidesGPTServer:
+        return self.server.fake
+
+    def _send_json(self, endpoint: str, status: int, body: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.fake.record(endpoint, status)
+
+    def _fail_if_injected(self, endpoint: str) -> bool:
+        status = self.fake.injected_failure()
+        if status == 429:
+            self._send_json(endpoint, 429, {"error": "rate limit exceeded"},
+                            {"Retry-After": f"{self.fake.config.retry_after:g}"})
+        elif status:
+            self._send_json(endpoint, status, {"error": "internal server error"})
+        return status is not None
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path not in ("/generate", "/v1/presentations/generate"):
+            self._send_json(self.path, 404, {"error": "not found"})
+            return
+        endpoint = self.path
+
+        time.sleep(self.fake.sample(self.fake._generate_latency))
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(endpoint, 401, {"error": "unauthorized"})
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(endpoint, 400, {"error": "invalid JSON"})
+            return
+        if not payload.get("prompt"):
+            self._send_json(endpoint, 400, {"error": "prompt is required"})
+            return
+        if self._fail_if_injected(endpoint):
+            return
+
+        presentation_id = self.fake.next_presentation_id()
+        download_url = f"{self.fake.base_url}/download/{presentation_id}"
+        if endpoint == "/generate":
+            result = {"presentation_id": presentation_id, "download_url": download_url,
+                      "theme": payload.get("theme", "modern"), "slides_count": payload.get("slides_count", 10)}
+        else:
+            result = {"id": presentation_id, "download": download_url,
+                      "embed": f"{self.fake.base_url}/embed/{presentation_id}"}
+        self._send_json(endpoint, 200, result)
+
+    def do_GET(self):
+        if not self.path.startswith("/download/"):
+            self._send_json(self.path, 404, {"error": "not found"})
+            return
+        endpoint = "/download"
+
+        time.sleep(self.fake.sample(self.fake._download_latency))
+        if self._fail_if_injected(endpoint):
+            return
+
+        deck = self.fake.deck()
+        etag = f'"{hashlib.sha256(deck).hexdigest()[:16]}"'
+        start, end = 0, len(deck) - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header)
+            if (not match or int(match.group(1)) >= len(deck)
+                    or (match.group(2) and int(match.group(2)) < int(match.group(1)))):
+                self._send_json(endpoint, 416, {"error": "range not satisfiable"},
+                                {"Content-Range": f"bytes */{len(deck)}"})
+                return
+            start = int(match.group(1))
+            end = min(int(match.group(2)), len(deck) - 1) if match.group(2) else len(deck) - 1
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.presentationml.presentation")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(deck)}")
+        self.end_headers()
+        self._write_paced(memoryview(deck)[start:end + 1])
+        self.fake.record(endpoint, status)
+
+    def _write_paced(self, body: memoryview):
+        bandwidth = self.fake.config.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        chunk = max(1, bandwidth // 20)
+        for offset in range(0, len(body), chunk):
+            self.wfile.write(body[offset:offset + chunk])
+            time.sleep(len(body[offset:offset + chunk]) / bandwidth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local fake SlidesGPT API')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--latency', default='0', help='Generate latency, e.g. 0.5, uniform:0.2,1, lognormal:0.5,0.4')
+    parser.add_argument('--download-latency', default='0', help='Time to first byte for downloads (same format)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s (default: 1)')
+    parser.add_argument('--deck-size', default='256KB', help='Size of downloaded decks, e.g. 512KB or 20MB (default: 256KB)')
+    parser.add_argument('--bandwidth', help='Download speed per connection, e.g. 2MB (default: unlimited)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible latency and errors')
+
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency=args.latency,
+        download_latency=args.download_latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        deck_size=parse_size(args.deck_size),
+        bandwidth=parse_size(args.bandwidth) if args.bandwidth else None,
+        seed=args.seed
+    )
+    server = FakeSlidesGPTServer(config, host=args.host, port=args.port)
+    print(f"🧪 Fake SlidesGPT API listening on {server.base_url}")
+    print(f"   Point clients at it with base_url={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n📊 Responses served:")
+        for endpoint, counts in server.stats().items():
+            print(f"   {endpoint}: {counts}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
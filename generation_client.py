@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Submit/poll client for the generation worker
+Submitting returns a job id right away instead of holding one HTTP request
+open for the whole generation. Jobs are then polled with exponentially growing
+intervals, many at once in a single batched loop, and every submission and
+result is written to a small journal so a restarted client can pick up where
+it left off.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from generation_protocol import DEFAULT_PORT, FINISHED, MAX_POLL_IDS
+
+DEFAULT_JOURNAL = ".generation_jobs.jsonl"
+DEFAULT_INITIAL_INTERVAL = 0.5
+DEFAULT_MAX_INTERVAL = 10.0
+DEFAULT_BACKOFF = 2.0
+
+
+class GenerationClientError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class JobJournal:
+    """
+    Append-only JSON-lines record of submitted and finished jobs.
+
+    A "submitted" line holds the job request and is written before the job is
+    sent, so a crash between the two is recovered by resubmitting with the same
+    id (the worker ignores duplicates). A "finished" line holds the final job.
+    forget() drops a job once its result has been used, and the file is
+    compacted when most of its lines are dead.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.pending: Dict[str, Dict] = {}
+        self.finished: Dict[str, Dict] = {}
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # Torn last line from a crash mid-write: drop it so the next record starts a fresh line
+            os.truncate(self.path, complete)
+        for line in data[:complete].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._apply(record)
+            self._lines += 1
+
+    def _apply(self, record: Dict):
+        job_id = record.get('id')
+        event = record.get('event')
+        if event == 'submitted':
+            self.pending[job_id] = record['request']
+        elif event == 'finished':
+            self.pending.pop(job_id, None)
+            self.finished[job_id] = record['job']
+        elif event == 'forgotten':
+            self.pending.pop(job_id, None)
+            self.finished.pop(job_id, None)
+
+    def _append(self, record: Dict):
+        self._apply(record)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._lines += 1
+        if self._lines > 100 and self._lines > 4 * (len(self.pending) + len(self.finished)):
+            self.compact()
+
+    def record_submitted(self, job_id: str, request: Dict):
+        self._append({"event": "submitted", "id": job_id, "request": request, "time": time.time()})
+
+    def record_finished(self, job_id: str, job: Dict):
+        self._append({"event": "finished", "id": job_id, "job": job, "time": time.time()})
+
+    def forget(self, job_id: str):
+        if job_id in self.pending or job_id in self.finished:
+            self._append({"event": "forgotten", "id": job_id, "time": time.time()})
+
+    def compact(self):
+        records = [{"event": "submitted", "id": job_id, "request": request}
+                   for job_id, request in self.pending.items()]
+        records += [{"event": "finished", "id": job_id, "job": job} for job_id, job in self.finished.items()]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(records)
+
+
+class GenerationClient:
+    """
+    Client for generation_worker.py.
+
+    Each HTTP call is short (timeout seconds), so a slow generation shows up as
+    a job that stays "running" while an unreachable worker shows up as
+    connection errors. Polling intervals start at initial_interval and grow by
+    `backoff` up to max_interval per job.
+    """
+
+    def __init__(self,
+                 base_url: str = f"http://127.0.0.1:{DEFAULT_PORT}",
+                 token: Optional[str] = None,
+                 journal: Optional[JobJournal] = None,
+                 timeout: float = 10,
+                 initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 backoff: float = DEFAULT_BACKOFF,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.base_url = base_url.rstrip('/')
+        self.journal = journal
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.clock = clock
+        self.sleep = sleep
+        self.polls = 0
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        if response.status_code >= 400 and response.status_code != 404:
+            try:
+                message = response.json().get('error', response.text)
+            except ValueError:
+                message = response.text
+            raise GenerationClientError(f"Worker returned {response.status_code}: {message}", response.status_code)
+        return response
+
+    def submit(self, club: str, topic: str, theme: str = "modern", slides: int = 10,
+               output: Optional[str] = None, priority: int = 0, refresh: bool = False,
+               job_id: Optional[str] = None) -> str:
+        """Queue a generation and return its job id without waiting for it"""
+        job_id = job_id or uuid.uuid4().hex
+        request = {"id": job_id, "club": club, "topic": topic, "theme": theme, "slides": slides,
+                   "output": output, "priority": priority, "refresh": refresh}
+        if self.journal is not None:
+            self.journal.record_submitted(job_id, request)
+        try:
+            self._send(request)
+        except GenerationClientError as e:
+            if self.journal is not None and e.status_code == 400:
+                # Rejected outright: record it so recovery doesn't resubmit it forever
+                self.journal.record_finished(job_id, {**request, "status": "failed", "error": str(e)})
+            raise
+        return job_id
+
+    def _send(self, request: Dict):
+        self._request("POST", "/jobs", json=request)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """The job's current state, or None if the worker doesn't know it"""
+        response = self._request("GET", f"/jobs/{job_id}")
+        return None if response.status_code == 404 else response.json()
+
+    def poll_many(self, job_ids: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """One batched status request per MAX_POLL_IDS jobs; returns (jobs by id, unknown ids)"""
+        jobs, missing = {}, []
+        for start in range(0, len(job_ids), MAX_POLL_IDS):
+            chunk = job_ids[start:start + MAX_POLL_IDS]
+            data = self._request("GET", "/jobs", params={"ids": ",".join(chunk)}).json()
+            self.polls += 1
+            jobs.update((job['id'], job) for job in data['jobs'])
+            missing.extend(data['missing'])
+        return jobs, missing
+
+    def iter_completed(self, job_ids: Iterable[str], timeout: Optional[float] = None,
+                       resubmit_lost: bool = True) -> Iterator[Dict]:
+        """
+        Yield each job as it finishes, polling every outstanding job from one loop.
+
+        Each job has its own next-poll time and interval; all jobs due at the
+        same moment share one request. Jobs the worker no longer knows (it was
+        restarted) are resubmitted from the journal when resubmit_lost, otherwise
+        yielded with status "lost". Connection errors back off like a poll that
+        saw no change; TimeoutError is raised once `timeout` passes.
+        """
+        now = self.clock()
+        deadline = None if timeout is None else now + timeout
+        schedule = {job_id: (now, self.initial_interval) for job_id in dict.fromkeys(job_ids)}
+        while schedule:
+            now = self.clock()
+            due = [job_id for job_id, (at, _) in schedule.items() if at <= now]
+            if due:
+                try:
+                    jobs, missing = self.poll_many(due)
+                except requests.exceptions.RequestException:
+                    jobs, missing = {}, []
+                for job_id in due:
+                    job = jobs.get(job_id)
+                    if job is None and job_id in missing:
+                        job = self._handle_lost(job_id, resubmit_lost)
+                    if job is not None and job['status'] in FINISHED + ("lost",):
+                        del schedule[job_id]
+                        if self.journal is not None and job['status'] != "lost":
+                            self.journal.record_finished(job_id, job)
+                        yield job
+                        continue
+                    _, interval = schedule[job_id]
+                    schedule[job_id] = (now + interval, min(interval * self.backoff, self.max_interval))
+                continue
+            if deadline is not None and now >= deadline:
+                raise TimeoutError(f"{len(schedule)} jobs still running after {timeout:g}s")
+            next_poll = min(at for at, _ in schedule.values())
+            if deadline is not None:
+                next_poll = min(next_poll, deadline)
+            self.sleep(max(0.0, next_poll - now))
+
+    def _handle_lost(self, job_id: str, resubmit_lost: bool) -> Optional[Dict]:
+        request = self.journal.pending.get(job_id) if self.journal is not None else None
+        if resubmit_lost and request is not None:
+            try:
+                self._send(request)
+                return None
+            except (GenerationClientError, requests.exceptions.RequestException):
+                pass
+        return {"id": job_id, "status": "lost", "error": "Worker has no record of this job"}
+
+    def wait_all(self, job_ids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        return {job['id']: job for job in self.iter_completed(job_ids, timeout)}
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict:
+        return self.wait_all([job_id], timeout)[job_id]
+
+    def recover(self, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """Finish every job the journal still lists as pending and return all known results"""
+        if self.journal is None:
+            raise GenerationClientError("recover() needs a journal")
+        if self.journal.pending:
+            self.wait_all(list(self.journal.pending), timeout)
+        return dict(self.journal.finished)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Submit presentation jobs to a generation worker and poll for results')
+    parser.add_argument('--worker', default=f"http://127.0.0.1:{DEFAULT_PORT}", help=f'Worker URL (default: http://127.0.0.1:{DEFAULT_PORT})')
+    parser.add_argument('--token', default=os.getenv('CLUBLY_WORKER_TOKEN'), help='Worker bearer token (default: $CLUBLY_WORKER_TOKEN)')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, help=f'Job journal file (default: {DEFAULT_JOURNAL})')
+    parser.add_argument('--timeout', type=float, help='Give up waiting after this many seconds')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit_parser = subparsers.add_parser('submit', help='Queue a presentation and print its job id')
+    submit_parser.add_argument('--club', required=True, help='Name of the club')
+    submit_parser.add_argument('--topic', required=True, help='Presentation topic')
+    submit_parser.add_argument('--theme', default='modern', help='Presentation theme (default: modern)')
+    submit_parser.add_argument('--slides', type=int, default=10, help='Number of slides (default: 10)')
+    submit_parser.add_argument('--output', help="Output file path for the downloaded presentation, relative to the worker's --output-dir")
+    submit_parser.add_argument('--priority', type=int, default=0, help='Higher runs first (default: 0)')
+    submit_parser.add_argument('--wait', action='store_true', help='Poll until the job finishes and print it')
+
+    status_parser = subparsers.add_parser('status', help='Show a job')
+    status_parser.add_argument('job_id')
+
+    wait_parser = subparsers.add_parser('wait', help='Poll jobs until they finish')
+    wait_parser.add_argument('job_ids', nargs='+')
+
+    subparsers.add_parser('recover', help='Finish jobs left pending by an earlier run and print every result in the journal')
+
+    args = parser.parse_args()
+
+    client = GenerationClient(args.worker, args.token, JobJournal(args.journal))
+    try:
+        if args.command == 'submit':
+            job_id = client.submit(args.club, args.topic, args.theme, args.slides, args.output, args.priority)
+            if not args.wait:
+                print(job_id)
+                return 0
+            result = client.wait(job_id, args.timeout)
+        elif args.command == 'status':
+            result = client.status(args.job_id)
+            if result is None:
+                print(f"Job not found: {args.job_id}", file=sys.stderr)
+                return 1
+        elif args.command == 'wait':
+            result = client.wait_all(args.job_ids, args.timeout)
+        else:
+            result = client.recover(args.timeout)
+    except (GenerationClientError, TimeoutError, requests.exceptions.RequestException) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Constants shared by the generation worker and its submit/poll client
+Kept apart from generation_worker so the client doesn't import the generator,
+cache and transport stack just to talk to the worker over HTTP.
+"""
+
+DEFAULT_PORT = 8765
+MAX_POLL_IDS = 500
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Presentation generation worker daemon for Clubly
+Keeps one warm ProductionSlidesGPTGenerator (pooled SlidesGPT connections, club
+index, result cache, compiled prompts) in a long-running process and runs
+generation jobs from a priority queue, so callers skip Python startup, imports
+and connection setup. Jobs are submitted and polled over a small local HTTP API.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from circuit_breaker import DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT, CircuitBreaker
+from generation_protocol import CANCELLED, DEFAULT_PORT, FAILED, FINISHED, MAX_POLL_IDS, QUEUED, RUNNING, SUCCEEDED
+from instrumentation import Instrumentation, PrometheusExporter
+from presentation_cache import DEFAULT_CACHE_DIRECTORY, PresentationCache
+from presentation_download import HedgePolicy
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import DEFAULT_BURST, configure_shared_rate_limiter
+from slidesgpt_transport import configure_shared_transport
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 1000
+DEFAULT_HISTORY = 1000
+DEFAULT_OUTPUT_DIRECTORY = "presentations"
+MAX_BODY_BYTES = 64 * 1024
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class GenerationJob:
+    club: str
+    topic: str
+    theme: str = "modern"
+    slides: int = 10
+    output: Optional[str] = None
+    priority: int = 0
+    refresh: bool = False
+    s3_bucket: Optional[str] = None
+    s3_key: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_request(cls, payload: Dict) -> "GenerationJob":
+        """Validate a submitted job document; raises ValueError with a message for the client"""
+        if not isinstance(payload, dict):
+            raise ValueError("Job must be a JSON object")
+        club, topic = payload.get('club'), payload.get('topic')
+        if not isinstance(club, str) or not club or not isinstance(topic, str) or not topic:
+            raise ValueError("'club' and 'topic' are required strings")
+        try:
+            slides = int(payload.get('slides', 10))
+            priority = int(payload.get('priority', 0))
+        except (TypeError, ValueError):
+            raise ValueError("'slides' and 'priority' must be integers")
+        if slides < 1:
+            raise ValueError("'slides' must be at least 1")
+        for name in ('theme', 'output', 's3_bucket', 's3_key'):
+            if payload.get(name) is not None and not isinstance(payload[name], str):
+                raise ValueError(f"'{name}' must be a string")
+        output = payload.get('output') or None
+        # Outputs are resolved under the worker's output directory, so they must stay inside it
+        if output and (os.path.isabs(output) or ".." in re.split(r"[\\/]", output)):
+            raise ValueError("'output' must be a relative path without '..'")
+        # Clients may choose the id so a retried submission is recognised instead of run twice
+        extra = {}
+        if payload.get('id') is not None:
+            if not isinstance(payload['id'], str) or not JOB_ID_PATTERN.match(payload['id']):
+                raise ValueError("'id' must be 1-64 letters, digits, '-' or '_'")
+            extra['id'] = payload['id']
+        return cls(**extra, club=club, topic=topic, theme=payload.get('theme') or "modern", slides=slides,
+                   output=output, priority=priority, refresh=bool(payload.get('refresh', False)),
+                   s3_bucket=payload.get('s3_bucket'), s3_key=payload.get('s3_key'))
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class GenerationWorker:
+    """
+    Priority job queue served by `concurrency` threads sharing one generator.
+
+    Higher priority runs first; equal priorities run in submission order.
+    Finished jobs are kept for status polling until `history` newer jobs have
+    finished. submit() raises QueueFull once max_queue jobs are waiting.
+    Job outputs are written under output_directory.
+    """
+
+    def __init__(self,
+                 generator: ProductionSlidesGPTGenerator,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 data_directory: str = "data/clubs",
+                 max_queue: int = DEFAULT_MAX_QUEUE,
+                 history: int = DEFAULT_HISTORY,
+                 output_directory: str = DEFAULT_OUTPUT_DIRECTORY):
+        self.generator = generator
+        self.concurrency = max(1, concurrency)
+        self.data_directory = data_directory
+        self.max_queue = max_queue
+        self.history = history
+        self.output_directory = output_directory
+        self._queue: List = []
+        self._sequence = itertools.count()
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._finished: List[str] = []
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._running = 0
+        self.counts = {SUCCEEDED: 0, FAILED: 0, CANCELLED: 0}
+        self.started_at = time.time()
+
+    def warm_up(self):
+        """Open the club index and a pooled connection before the first job arrives"""
+        obs = self.generator.instrumentation
+        with obs.span("warm_up"):
+            try:
+                self.generator.find_club_file("", self.data_directory)
+            except FileNotFoundError:
+                pass
+            try:
+                self.generator.transport.session.head(self.generator.base_url, timeout=5)
+            except Exception:
+                # The API may reject HEAD or be briefly unreachable; the first job will connect instead
+                pass
+
+    def start(self) -> "GenerationWorker":
+        for number in range(self.concurrency):
+            thread = threading.Thread(target=self._run, name=f"generation-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait: bool = True):
+        """Stop taking jobs; queued jobs are cancelled and running ones finish if wait"""
+        with self._condition:
+            self._stopping = True
+            while self._queue:
+                _, _, job = heapq.heappop(self._queue)
+                self._finish(job, CANCELLED, error="Worker shutting down")
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, job: GenerationJob) -> GenerationJob:
+        """Queue a job; a job whose id is already known is not queued again and the existing one is returned"""
+        with self._condition:
+            existing = self._jobs.get(job.id)
+            if existing is not None:
+                return existing
+            if self._stopping:
+                raise QueueFull("Worker is shutting down")
+            if len(self._queue) >= self.max_queue:
+                raise QueueFull(f"Queue is full ({self.max_queue} jobs waiting)")
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (-job.priority, next(self._sequence), job))
+            self._condition.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict]:
+        """The job as a dict, with its queue position while it waits"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            data = job.to_dict()
+            if job.status == QUEUED:
+                entry = next(entry for entry in self._queue if entry[2] is job)
+                data['queue_position'] = sum(1 for other in self._queue if other[:2] < entry[:2])
+            return data
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            self._finish(job, CANCELLED)
+            return True
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[GenerationJob]:
+        """Block until a job finishes (or timeout); returns the job"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job.status in FINISHED:
+                    return job
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return job
+                self._condition.wait(remaining)
+
+    def stats(self) -> Dict:
+        with self._condition:
+            stats = {
+                "queued": len(self._queue),
+                "running": self._running,
+                "concurrency": self.concurrency,
+                "uptime_seconds": time.time() - self.started_at,
+                **self.counts
+            }
+        stats["connections"] = self.generator.transport.connection_stats()
+        if self.generator.cache:
+            stats["cache"] = self.generator.cache.stats()
+        stats["prompt_templates"] = self.generator.prompt_templates.stats()
+        stats["coalescing"] = self.generator.single_flight.stats()
+        if self.generator.circuit_breaker:
+            stats["circuit_breaker"] = self.generator.circuit_breaker.stats()
+        if self.generator.hedge_policy:
+            stats["hedging"] = self.generator.hedge_policy.stats()
+        return stats
+
+    def _finish(self, job: GenerationJob, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        # Caller holds the condition
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        self.counts[status] += 1
+        self._finished.append(job.id)
+        while len(self._finished) > self.history:
+            self._jobs.pop(self._finished.pop(0), None)
+        self._condition.notify_all()
+
+    def output_path(self, job: GenerationJob) -> Optional[str]:
+        """Where a job's deck is written; raises ValueError if a symlink would lead outside output_directory"""
+        if not job.output:
+            return None
+        root = os.path.realpath(self.output_directory)
+        path = os.path.join(self.output_directory, job.output)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"Output path escapes {self.output_directory}: {job.output}")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return path
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+
+            result, error = None, None
+            try:
+                output_path = self.output_path(job)
+                result = self.generator.generate_club_presentation(
+                    club_name=job.club,
+                    topic=job.topic,
+                    theme=job.theme,
+                    slides_count=job.slides,
+                    output_path=output_path,
+                    data_directory=self.data_directory,
+                    refresh=job.refresh,
+                    s3_bucket=job.s3_bucket,
+                    s3_object_name=job.s3_key
+                )
+            except Exception as e:
+                error = str(e)
+
+            with self._condition:
+                self._running -= 1
+                self._finish(job, FAILED if error is not None else SUCCEEDED, result, error)
+
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def worker(self) -> GenerationWorker:
+        return self.server.worker
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            self._send_json(401, {"error": "unauthorized"})
+            return False
+        return True
+
+    def _job_id(self) -> Optional[str]:
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        return parts[1] if len(parts) == 2 and parts[0] == "jobs" else None
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(min(length, MAX_BODY_BYTES + 1))
+        if not self._authorized():
+            return
+        if self.path.rstrip('/') != "/jobs":
+            self._send_json(404, {"error": "not found"})
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "job document too large"})
+            return
+        try:
+            job = GenerationJob.from_request(json.loads(body or b"{}"))
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        try:
+            queued = self.worker.submit(job)
+        except QueueFull as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        self._send_json(202 if queued is job else 200, self.worker.snapshot(job.id) or queued.to_dict())
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path == "/health":
+            self._send_json(200, self.worker.stats())
+            return
+        if path == "/metrics" and self.server.prometheus is not None:
+            data = self.server.prometheus.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if path == "/jobs":
+            # Batched polling: GET /jobs?ids=a,b,c
+            query = parse_qs(urlparse(self.path).query)
+            ids = [job_id for value in query.get("ids", []) for job_id in value.split(",") if job_id]
+            if not ids or len(ids) > MAX_POLL_IDS:
+                self._send_json(400, {"error": f"pass 1-{MAX_POLL_IDS} job ids as ?ids=a,b,c"})
+                return
+            jobs = {job_id: self.worker.snapshot(job_id) for job_id in ids}
+            self._send_json(200, {"jobs": [job for job in jobs.values() if job is not None],
+                                  "missing": [job_id for job_id, job in jobs.items() if job is None]})
+            return
+        job_id = self._job_id()
+        job = self.worker.snapshot(job_id) if job_id else None
+        if job is None:
+            self._send_json(404, {"error": "job not found"})
+            return
+        self._send_json(200, job)
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        job_id = self._job_id()
+        if job_id is None or self.worker.get(job_id) is None:
+            self._send_json(404, {"error": "job not found"})
+            return
+        if not self.worker.cancel(job_id):
+            self._send_json(409, {"error": "job already started"})
+            return
+        self._send_json(200, self.worker.snapshot(job_id))
+
+
+class WorkerServer:
+    """
+    HTTP front end for a GenerationWorker, usable as a context manager.
+
+    POST /jobs submits ({"club", "topic", "theme", "slides", "output" relative
+    to the worker's output directory, "priority", "refresh", "s3_bucket",
+    "s3_key", optional "id"}) and returns
+    202 with the job, or 200 with the existing job if that id was already
+    submitted; GET /jobs/<id> polls it, GET /jobs?ids=a,b,c polls many at once,
+    DELETE /jobs/<id> cancels a queued job, GET /health
+    returns queue and connection stats and GET /metrics Prometheus text (when
+    instrumented). With a token, every request needs "Authorization: Bearer <token>".
+    """
+
+    def __init__(self, worker: GenerationWorker, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 token: Optional[str] = None, prometheus: Optional[PrometheusExporter] = None):
+        self.worker = worker
+        self.httpd = ThreadingHTTPServer((host, port), _WorkerHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.worker = worker
+        self.httpd.token = token
+        self.httpd.prometheus = prometheus
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "WorkerServer":
+        self.worker.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.worker.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a long-lived presentation generation worker with a local HTTP job API')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--token', default=os.getenv('CLUBLY_WORKER_TOKEN'), help='Require this bearer token (default: $CLUBLY_WORKER_TOKEN)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help=f'Jobs run at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE, help=f'Waiting jobs before submissions get 503 (default: {DEFAULT_MAX_QUEUE})')
+    parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIRECTORY, help=f'Directory job outputs are written under (default: {DEFAULT_OUTPUT_DIRECTORY})')
+    parser.add_argument('--api-key', help='SlidesGPT API key (or set SLIDESGPT_API_KEY environment variable)')
+    parser.add_argument('--base-url', default='https://api.slidesgpt.com', help='SlidesGPT API base URL')
+    parser.add_argument('--no-cache', action='store_true', help='Always call SlidesGPT; do not read or write the result cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIRECTORY, help=f'Result cache directory (default: {DEFAULT_CACHE_DIRECTORY})')
+    parser.add_argument('--cache-ttl', type=float, default=168, help='Hours before a cached result expires (default: 168)')
+    parser.add_argument('--rate', type=float, help='Maximum SlidesGPT requests per second; backs off automatically on 429s')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help=f'Requests allowed in a burst above --rate (default: {DEFAULT_BURST})')
+    parser.add_argument('--circuit-breaker', type=int, metavar='N', help=f'Fail fast (or serve a cached deck) after N consecutive SlidesGPT failures, e.g. {DEFAULT_FAILURE_THRESHOLD} (default: off)')
+    parser.add_argument('--circuit-reset', type=float, default=DEFAULT_RESET_TIMEOUT, help=f'Seconds the circuit stays open before a trial call (default: {DEFAULT_RESET_TIMEOUT:.0f})')
+    parser.add_argument('--hedge-downloads', action='store_true', help='Send a second download request when the first is slower than the p95 of recent downloads')
+    parser.add_argument('--hedge-delay', type=float, help='Hedge after this many seconds instead of the recent p95 (implies --hedge-downloads)')
+    parser.add_argument('--no-watch', action='store_true', help='Re-check the club index on lookups instead of watching the data directory')
+
+    args = parser.parse_args()
+
+    if args.rate:
+        configure_shared_rate_limiter(rate=args.rate, burst=args.burst)
+    configure_shared_transport(max_connections_per_host=max(1, args.concurrency))
+
+    prometheus = PrometheusExporter()
+    try:
+        generator = ProductionSlidesGPTGenerator(
+            args.api_key,
+            base_url=args.base_url,
+            cache=None if args.no_cache else PresentationCache(args.cache_dir, ttl_seconds=args.cache_ttl * 3600),
+            instrumentation=Instrumentation([prometheus]),
+            watch_clubs=not args.no_watch,
+            circuit_breaker=CircuitBreaker(args.circuit_breaker, args.circuit_reset) if args.circuit_breaker else None,
+            hedge_policy=HedgePolicy(delay=args.hedge_delay) if args.hedge_downloads or args.hedge_delay else None
+        )
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    worker = GenerationWorker(generator, args.concurrency, args.data_dir, args.max_queue,
+                              output_directory=args.output_dir)
+    worker.warm_up()
+    server = WorkerServer(worker, args.host, args.port, args.token, prometheus).start()
+    print(f"Generation worker listening on {server.base_url} ({args.concurrency} concurrent jobs, Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Timing spans and counters for the presentation pipeline
+Instrumented code calls span()/count() on an Instrumentation; the default
+NULL_INSTRUMENTATION does nothing, so the hooks cost a method call when disabled.
+Exporters turn the events into JSON lines or Prometheus text.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed stage; attributes can be added while it runs with set()"""
+
+    def __init__(self, instrumentation: "Instrumentation", name: str, attributes: Dict):
+        self._instrumentation = instrumentation
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[str] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self._started = 0.0
+        self._token = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current_span.set(self)
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = type(exc).__name__
+            status_code = getattr(exc, "status_code", None)
+            if status_code is not None:
+                self.attributes.setdefault("status", status_code)
+        self._instrumentation._finish(self)
+        return False
+
+
+class _NullSpan:
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """Dispatches spans and counter increments to a list of exporters"""
+
+    enabled = True
+
+    def __init__(self, exporters: Optional[List] = None):
+        self.exporters = list(exporters or [])
+
+    def span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    def count(self, name: str, value: float = 1, **labels):
+        for exporter in self.exporters:
+            exporter.export_counter(name, value, labels)
+
+    def _finish(self, span: Span):
+        for exporter in self.exporters:
+            exporter.export_span(span)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class NullInstrumentation(Instrumentation):
+    enabled = False
+
+    def __init__(self):
+        super().__init__([])
+
+    def span(self, name: str, **attributes):
+        return _NULL_SPAN
+
+    def count(self, name: str, value: float = 1, **labels):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class JsonLinesExporter:
+    """Writes one JSON object per finished span and per counter increment"""
+
+    def __init__(self, path: Optional[str] = None, stream: Optional[TextIO] = None):
+        self._owns_stream = stream is None
+        self._stream = stream if stream is not None else open(path, 'a')
+        self._lock = threading.Lock()
+
+    def _write(self, record: Dict):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+    def export_span(self, span: Span):
+        self._write({
+            "type": "span",
+            "name": span.name,
+            "parent": span.parent,
+            "start": span.started_at,
+            "duration_ms": round(span.duration * 1000, 3),
+            "error": span.error,
+            "attributes": span.attributes
+        })
+
+    def export_counter(self, name: str, value: float, labels: Dict):
+        self._write({"type": "counter", "name": name, "value": value, "labels": labels, "time": time.time()})
+
+    def close(self):
+        if self._owns_stream:
+            self._stream.close()
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class PrometheusExporter:
+    """
+    Aggregates spans into a `<prefix>_stage_duration_seconds` histogram (labelled
+    by stage and outcome) and counters into `<prefix>_<name>_total`, rendered
+    in the Prometheus text format. write() replaces the file atomically, which
+    suits node_exporter's textfile collector.
+    """
+
+    def __init__(self, prefix: str = "slidesgpt", buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple, List] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+
+    def export_span(self, span: Span):
+        key = (("outcome", "error" if span.error else "ok"), ("stage", span.name))
+        with self._lock:
+            histogram = self._histograms.setdefault(key, [[0] * len(self.buckets), 0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += 1
+            histogram[2] += span.duration
+
+    def export_counter(self, name: str, value: float, labels: Dict):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            if self._histograms:
+                metric = f"{self.prefix}_stage_duration_seconds"
+                lines.append(f"# HELP {metric} Time spent in each pipeline stage")
+                lines.append(f"# TYPE {metric} histogram")
+                for key in sorted(self._histograms):
+                    counts, total_count, total = self._histograms[key]
+                    for bound, count in zip(self.buckets, counts):
+                        lines.append(f"{metric}_bucket{_label_text(key + (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{metric}_bucket{_label_text(key + (('le', '+Inf'),))} {total_count}")
+                    lines.append(f"{metric}_sum{_label_text(key)} {total:.6f}")
+                    lines.append(f"{metric}_count{_label_text(key)} {total_count}")
+            for name in sorted(self._counters):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key in sorted(self._counters[name]):
+                    lines.append(f"{metric}{_label_text(key)} {self._counters[name][key]:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        pass
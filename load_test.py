@@ -0,0 +1,235 @@
+"""
+Open-loop load generator for the SlidesGPT client stack
+Requests are started on a fixed schedule (target requests/second, with a linear
+ramp-up) regardless of how fast earlier ones finish, so a slow API shows up as
+latency and errors instead of silently lowering the offered load.
+"""
+
+import argparse
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with bounded relative error.
+
+    Values are stored in buckets whose width grows by `precision` (1% by
+    default), so memory stays small however many requests are recorded while
+    percentiles stay within that relative error. min, max and mean are exact.
+    """
+
+    def __init__(self, precision: float = 0.01, lowest: float = 1e-6):
+        self.precision = precision
+        self.lowest = lowest
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float):
+        value = max(value, self.lowest)
+        bucket = int(math.ceil(math.log(value / self.lowest) / self._log_base))
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * percent / 100)))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self.max, max(self.min, self.lowest * math.exp(bucket * self._log_base)))
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else 0.0
+        }
+
+
+@dataclass
+class LoadTestConfig:
+    rate: float = 1.0
+    duration: float = 60.0
+    ramp_up: float = 0.0
+    concurrency: int = 10
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate must be greater than 0 requests/second")
+        if self.duration < 0 or self.ramp_up < 0:
+            raise ValueError("duration and ramp_up must not be negative")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+    def schedule(self) -> List[float]:
+        """Offsets (seconds from start) at which each request is due"""
+        offsets = []
+        ramp_requests = self.rate * self.ramp_up / 2
+        n = 0
+        while True:
+            if n < ramp_requests:
+                # The rate rises linearly, so the n-th request is due at sqrt(2 n ramp / rate)
+                offset = math.sqrt(2 * n * self.ramp_up / self.rate)
+            else:
+                offset = self.ramp_up + (n - ramp_requests) / self.rate
+            if offset >= self.duration:
+                return offsets
+            offsets.append(offset)
+            n += 1
+
+
+def positive_float(value: str) -> float:
+    """argparse type for --rps and similar options that must be > 0"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def classify_outcome(status_code: Optional[int] = None, error: Optional[BaseException] = None) -> Optional[str]:
+    """None for a success, otherwise a short error label such as 'HTTP 429' or 'ReadTimeout'"""
+    if error is not None:
+        return type(error).__name__
+    if status_code is not None and 200 <= status_code < 300:
+        return None
+    return f"HTTP {status_code}"
+
+
+class LoadTestRunner:
+    """
+    Drives request_fn(request_number) -> status code on the config's schedule.
+
+    At most `concurrency` requests are in flight; requests that come due while
+    all workers are busy wait in a queue. Latency is measured from when a
+    request was due, not when a worker picked it up, so queueing caused by a
+    slow server is included (no coordinated omission). `service_latency`
+    holds the time spent in request_fn alone.
+    """
+
+    def __init__(self, request_fn: Callable[[int], int], config: LoadTestConfig, clock=time.monotonic, sleep=time.sleep):
+        self.request_fn = request_fn
+        self.config = config
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.service_latency = LatencyHistogram()
+        self.per_second: Dict[int, Dict] = {}
+        self.errors: Dict[str, int] = {}
+        self.sent = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    def _second(self, second: int) -> Dict:
+        if second not in self.per_second:
+            self.per_second[second] = {"second": second, "sent": 0, "completed": 0, "succeeded": 0, "errors": {}}
+        return self.per_second[second]
+
+    def _run_one(self, request_number: int, due: float, start: float):
+        began = self._clock()
+        status_code, error = None, None
+        try:
+            status_code = self.request_fn(request_number)
+        except Exception as e:
+            error = e
+        finished = self._clock()
+        outcome = classify_outcome(status_code, error)
+
+        with self._lock:
+            self.latency.record(finished - due)
+            self.service_latency.record(finished - began)
+            bucket = self._second(int(finished - start))
+            bucket["completed"] += 1
+            if outcome is None:
+                self.succeeded += 1
+                bucket["succeeded"] += 1
+            else:
+                self.failed += 1
+                self.errors[outcome] = self.errors.get(outcome, 0) + 1
+                bucket["errors"][outcome] = bucket["errors"].get(outcome, 0) + 1
+
+    def run(self) -> Dict:
+        start = self._clock()
+        with ThreadPoolExecutor(max_workers=self.config.concurrency) as pool:
+            for request_number, offset in enumerate(self.config.schedule(), 1):
+                delay = start + offset - self._clock()
+                if delay > 0:
+                    self._sleep(delay)
+                with self._lock:
+                    self.sent += 1
+                    self._second(int(offset))["sent"] += 1
+                pool.submit(self._run_one, request_number, start + offset, start)
+        self.elapsed = self._clock() - start
+        return self.report()
+
+    def report(self) -> Dict:
+        with self._lock:
+            completed = self.succeeded + self.failed
+            return {
+                "config": asdict(self.config),
+                "sent": self.sent,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "elapsed": self.elapsed,
+                "throughput": completed / self.elapsed if self.elapsed else 0.0,
+                "latency": self.latency.summary(),
+                "service_latency": self.service_latency.summary(),
+                "errors": dict(self.errors),
+                "per_second": [self.per_second[s] for s in sorted(self.per_second)]
+            }
+
+
+def print_load_report(report: Dict):
+    """Print a load test report"""
+    config = report["config"]
+    latency = report["latency"]
+    print("\n" + "=" * 60)
+    print("📊 LOAD TEST SUMMARY")
+    print("=" * 60)
+    print(f"🎯 Target: {config['rate']:.2f} req/s for {config['duration']:g}s "
+          f"(ramp-up {config['ramp_up']:g}s, concurrency {config['concurrency']})")
+    print(f"📨 Sent: {report['sent']}, ✅ succeeded: {report['succeeded']}, ❌ failed: {report['failed']}")
+    print(f"🚀 Throughput: {report['throughput']:.2f} req/s over {report['elapsed']:.1f}s")
+    print(f"⏱️  Latency p50 {latency['p50']:.3f}s | p90 {latency['p90']:.3f}s | "
+          f"p99 {latency['p99']:.3f}s | max {latency['max']:.3f}s")
+
+    if report["errors"]:
+        print(f"\n🔍 Error Analysis:")
+        for error_type, count in sorted(report["errors"].items(), key=lambda item: -item[1]):
+            print(f"   {error_type}: {count} occurrences")
+
+    print(f"\n📈 Per second:")
+    for row in report["per_second"]:
+        errors = ", ".join(f"{name}={count}" for name, count in sorted(row["errors"].items()))
+        print(f"   {row['second']:>4}s  sent {row['sent']:>4}  done {row['completed']:>4}  ok {row['succeeded']:>4}"
+              f"{'  ' + errors if errors else ''}")
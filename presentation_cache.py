@@ -0,0 +1,187 @@
+"""
+Content-addressed cache for generated presentations
+Results are keyed by a hash of the prompt, theme and slide count, so asking for
+the same deck twice only pays for one SlidesGPT generation.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIRECTORY = ".slidesgpt_cache"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class PresentationCache:
+    """
+    On-disk LRU cache of SlidesGPT results and, optionally, downloaded .pptx files.
+
+    Each entry is <key>.json (plus <key>.pptx when store_files is on) under a
+    two-character shard directory. Entries older than ttl_seconds are treated as
+    misses, but are kept so get(allow_stale=True) can still serve them while
+    SlidesGPT is unavailable; when max_entries or max_bytes is exceeded the least recently used
+    entries are evicted. Recency is the entry file's mtime, so it survives
+    restarts and is shared between processes using the same directory.
+    """
+
+    def __init__(self,
+                 cache_directory: str = DEFAULT_CACHE_DIRECTORY,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 store_files: bool = True):
+        self.cache_directory = Path(cache_directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store_files = store_files
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load()
+
+    @staticmethod
+    def make_key(prompt: str, theme: str, slides_count: int) -> str:
+        payload = json.dumps([prompt, theme, slides_count], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_directory / key[:2] / f"{key}.json"
+
+    def _file_path(self, key: str) -> Path:
+        return self.cache_directory / key[:2] / f"{key}.pptx"
+
+    def _load(self):
+        if not self.cache_directory.exists():
+            return
+        found = []
+        for entry_path in self.cache_directory.glob("*/*.json"):
+            key = entry_path.stem
+            try:
+                mtime = entry_path.stat().st_mtime
+            except OSError:
+                continue
+            found.append((mtime, key, self._size_on_disk(key)))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _size_on_disk(self, key: str) -> int:
+        size = 0
+        for path in (self._entry_path(key), self._file_path(key)):
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def _remove(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        for path in (self._entry_path(key), self._file_path(key)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _read_entry(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._remove(key)
+            return None
+
+    def _expired(self, entry: Dict) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry.get('created_at', 0) > self.ttl_seconds
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss; allow_stale also returns expired entries"""
+        with self._lock:
+            if key not in self._entries and self._entry_path(key).exists():
+                # Written by another process sharing this directory
+                size = self._size_on_disk(key)
+                self._entries[key] = size
+                self._total_bytes += size
+            entry = self._read_entry(key) if key in self._entries else None
+            expired = entry is not None and self._expired(entry)
+            if entry is None or (expired and not allow_stale):
+                self.misses += 1
+                return None
+
+            if expired:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            try:
+                os.utime(self._entry_path(key))
+            except OSError:
+                pass
+            return entry['result']
+
+    def copy_file_to(self, key: str, output_path: str) -> bool:
+        """Copy the cached .pptx for key to output_path; returns False if none is stored"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            tmp_path = f"{output_path}.{os.getpid()}.tmp"
+            try:
+                shutil.copyfile(self._file_path(key), tmp_path)
+            except FileNotFoundError:
+                return False
+            os.replace(tmp_path, output_path)
+            return True
+
+    def put(self, key: str, result: Dict, file_path: Optional[str] = None):
+        """Store a result (and the downloaded deck, if store_files is on) and evict as needed"""
+        with self._lock:
+            self._remove(key)
+            self._entry_path(key).parent.mkdir(parents=True, exist_ok=True)
+
+            if self.store_files and file_path:
+                tmp_file = self._file_path(key).with_name(f"{key}.pptx.{os.getpid()}.tmp")
+                shutil.copyfile(file_path, tmp_file)
+                os.replace(tmp_file, self._file_path(key))
+
+            tmp_entry = self._entry_path(key).with_name(f"{key}.json.{os.getpid()}.tmp")
+            with open(tmp_entry, 'w') as f:
+                json.dump({"created_at": time.time(), "result": result}, f)
+            os.replace(tmp_entry, self._entry_path(key))
+
+            size = self._size_on_disk(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes
+            }
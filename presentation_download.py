@@ -0,0 +1,521 @@
+"""
+Streaming download sinks for generated presentations
+The response body is read with readinto() into one preallocated buffer, hashed on
+the fly and handed to a sink: a local file, or an S3 multipart upload so large
+decks never touch local disk. Local files are written to <output>.part and renamed
+into place, so an interrupted download can resume with an HTTP Range request and a
+consumer never sees a half-written deck. With a HedgePolicy, a download request
+that is slower than usual to answer gets a second copy and the first to respond
+is used.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from rate_limiter import parse_retry_after
+from slidesgpt_transport import SlidesGPTAPIError
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_S3_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_HEDGE_PERCENTILE = 0.95
+
+
+@dataclass
+class DownloadResult:
+    location: str
+    bytes_written: int
+    sha256: str
+    # "primary" or "hedge" when a hedged request was sent, i.e. which one was used
+    hedged: Optional[str] = None
+
+
+class HedgePolicy:
+    """
+    Decides when a download request gets a second, hedged copy.
+
+    Keeps the time-to-response of the last `window` downloads. Once min_samples
+    are known, a request that hasn't answered within the `percentile` latency
+    (never less than min_delay) is sent again and whichever answers first wins.
+    A fixed `delay` skips the percentile and always hedges after that long.
+    """
+
+    def __init__(self,
+                 percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 min_delay: float = 0.05,
+                 delay: Optional[float] = None,
+                 window: int = 200,
+                 min_samples: int = 20):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.delay = delay
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there aren't enough samples"""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))])
+
+    def observe(self, seconds: float, hedged: bool = False, hedge_won: bool = False):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+
+    def stats(self) -> Dict:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_delay_ms": None if delay is None else round(delay * 1000, 3)
+            }
+
+
+def hedged_get(transport, url: str, policy: HedgePolicy, **kwargs):
+    """
+    transport.get(url, **kwargs), sending a duplicate if the first is slower than policy.hedge_delay().
+
+    The response that arrives first is returned with .hedge_winner set ("primary",
+    "hedge", or None if no hedge was sent); the other one is closed when it arrives.
+    An error is only raised if every request sent failed.
+    """
+    import queue
+
+    delay = policy.hedge_delay()
+    started = time.monotonic()
+    if delay is None:
+        response = transport.get(url, **kwargs)
+        policy.observe(time.monotonic() - started)
+        response.hedge_winner = None
+        return response
+
+    arrivals = queue.Queue()
+
+    def send(label: str):
+        sent_at = time.monotonic()
+        try:
+            arrivals.put((label, transport.get(url, **kwargs), time.monotonic() - sent_at, None))
+        except Exception as e:
+            arrivals.put((label, None, time.monotonic() - sent_at, e))
+
+    threading.Thread(target=send, args=("primary",), daemon=True).start()
+    try:
+        arrival = arrivals.get(timeout=delay)
+        outstanding = 0
+    except queue.Empty:
+        threading.Thread(target=send, args=("hedge",), daemon=True).start()
+        arrival = arrivals.get()
+        outstanding = 1
+
+    hedged = outstanding == 1
+    if arrival[3] is not None and outstanding:
+        # The first to answer failed; the other one may still succeed
+        arrival = arrivals.get()
+        outstanding = 0
+    label, response, elapsed, error = arrival
+    if outstanding:
+        def close_loser():
+            late = arrivals.get()
+            if late[1] is not None:
+                late[1].close()
+        threading.Thread(target=close_loser, daemon=True).start()
+    if error is not None:
+        raise error
+
+    policy.observe(elapsed, hedged=hedged, hedge_won=label == "hedge")
+    response.hedge_winner = label if hedged else None
+    return response
+
+
+class DownloadSink:
+    """Destination for a streamed download; sinks that can resume override offset/validator"""
+
+    offset = 0
+    validator: Optional[str] = None
+    total_size: Optional[int] = None
+
+    def initial_hasher(self):
+        return hashlib.sha256()
+
+    def can_resume(self, url: str) -> bool:
+        """True if the partial data at offset came from url and can be pinned with If-Range"""
+        return False
+
+    def remember_source(self, url: str, validator: Optional[str], total_size: Optional[int]):
+        pass
+
+    def restart(self):
+        pass
+
+
+class FileSink(DownloadSink):
+    """
+    Writes the stream to <output_path>.part and atomically renames it on commit.
+
+    With resumable=True an interrupted download keeps the partial file and a
+    small <output_path>.part.json holding the source URL, the server's
+    ETag/Last-Modified and the full size, and the next FileSink for the same
+    path starts at `offset`. Otherwise the partial file is removed on failure.
+    """
+
+    def __init__(self, output_path: str, resumable: bool = True):
+        self.output_path = output_path
+        self.part_path = output_path + ".part"
+        self.meta_path = self.part_path + ".json"
+        self.resumable = resumable
+        self._file = None
+        self.offset = 0
+        self.validator = None
+        self.source = None
+        self.total_size = None
+        if resumable and os.path.exists(self.part_path):
+            try:
+                with open(self.meta_path, 'r') as f:
+                    meta = json.load(f)
+                self.validator = meta.get('validator')
+                self.source = meta.get('url')
+                self.total_size = meta.get('total_size')
+                self.offset = os.path.getsize(self.part_path)
+            except (OSError, ValueError, AttributeError):
+                self.restart()
+
+    def initial_hasher(self):
+        hasher = hashlib.sha256()
+        if self.offset:
+            with open(self.part_path, 'rb') as f:
+                for block in iter(lambda: f.read(DEFAULT_BUFFER_SIZE), b''):
+                    hasher.update(block)
+        return hasher
+
+    def can_resume(self, url: str) -> bool:
+        return bool(self.offset and self.validator and self.source == url)
+
+    def remember_source(self, url: str, validator: Optional[str], total_size: Optional[int]):
+        self.source, self.validator, self.total_size = url, validator, total_size
+        if self.resumable:
+            with open(self.meta_path, 'w') as f:
+                json.dump({"url": url, "validator": validator, "total_size": total_size}, f)
+
+    def restart(self):
+        """Discard any partial data and start again from byte zero"""
+        self._close()
+        self.offset = 0
+        for path in (self.part_path, self.meta_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, chunk: memoryview):
+        if self._file is None:
+            self._file = open(self.part_path, 'ab' if self.offset else 'wb')
+        self._file.write(chunk)
+
+    def commit(self) -> str:
+        if self._file is None:
+            self._file = open(self.part_path, 'ab' if self.offset else 'wb')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._close()
+        os.replace(self.part_path, self.output_path)
+        try:
+            os.unlink(self.meta_path)
+        except OSError:
+            pass
+        return self.output_path
+
+    def abort(self):
+        self._close()
+        if not self.resumable:
+            self.restart()
+
+
+class S3MultipartSink(DownloadSink):
+    """
+    Streams into an S3 multipart upload, one part_size part at a time.
+
+    Memory use is a single part buffer regardless of deck size. The upload is
+    only started once the first part is full (or on commit), and a failed
+    download aborts it so no partial object is left behind.
+    """
+
+    def __init__(self, client, bucket: str, object_name: str, region: str = 'us-west-1',
+                 part_size: int = DEFAULT_S3_PART_SIZE, content_type: str = "application/vnd.openxmlformats-officedocument.presentationml.presentation"):
+        if part_size < S3_MIN_PART_SIZE:
+            raise ValueError(f"S3 multipart parts must be at least {S3_MIN_PART_SIZE} bytes")
+        self.client = client
+        self.bucket = bucket
+        self.object_name = object_name
+        self.region = region
+        self._buffer = bytearray(part_size)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+        self._parts = []
+        self._content_type = content_type
+        self._upload_id = None
+
+    def _flush_part(self):
+        if self._upload_id is None:
+            upload = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.object_name, ContentType=self._content_type)
+            self._upload_id = upload['UploadId']
+        part_number = len(self._parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.object_name,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._view[:self._filled])
+        )
+        self._parts.append({"ETag": response['ETag'], "PartNumber": part_number})
+        self._filled = 0
+
+    def write(self, chunk: memoryview):
+        offset = 0
+        while offset < len(chunk):
+            take = min(len(chunk) - offset, len(self._buffer) - self._filled)
+            self._view[self._filled:self._filled + take] = chunk[offset:offset + take]
+            self._filled += take
+            offset += take
+            if self._filled == len(self._buffer):
+                self._flush_part()
+
+    def commit(self) -> str:
+        if self._filled or not self._parts:
+            self._flush_part()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.object_name,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts}
+        )
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{self.object_name}"
+
+    def abort(self):
+        if self._upload_id is None:
+            return
+        upload_id, self._upload_id = self._upload_id, None
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.object_name, UploadId=upload_id)
+
+
+def _read_into(raw, buffer: bytearray) -> int:
+    # Map urllib3 errors the way requests' iter_content does, so callers only see RequestException
+    try:
+        return raw.readinto(buffer)
+    except Exception as e:
+        # raw is a live urllib3 response, so both packages are already loaded here
+        import requests
+        from urllib3.exceptions import ProtocolError, ReadTimeoutError
+        if isinstance(e, ProtocolError):
+            raise requests.exceptions.ChunkedEncodingError(e)
+        if isinstance(e, ReadTimeoutError):
+            raise requests.exceptions.ConnectionError(e)
+        raise
+
+
+def stream_response_to_sink(response, sink: DownloadSink, buffer_size: int = DEFAULT_BUFFER_SIZE) -> DownloadResult:
+    """Copy a streamed requests response into sink, hashing it as it goes"""
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    hasher = sink.initial_hasher()
+    total = sink.offset
+    raw = response.raw
+    raw.decode_content = True
+    try:
+        while True:
+            read = _read_into(raw, buffer)
+            if not read:
+                break
+            chunk = view[:read]
+            hasher.update(chunk)
+            sink.write(chunk)
+            total += read
+    except BaseException:
+        sink.abort()
+        raise
+    finally:
+        response.close()
+
+    return DownloadResult(location=sink.commit(), bytes_written=total, sha256=hasher.hexdigest())
+
+
+def response_validator(response) -> Optional[str]:
+    """ETag (or Last-Modified) suitable for an If-Range header"""
+    return response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+
+def download_to_sink(transport, url: str, headers: Dict, sink: DownloadSink,
+                     buffer_size: int = DEFAULT_BUFFER_SIZE, timeout: Tuple[float, float] = None,
+                     hedge: Optional[HedgePolicy] = None) -> DownloadResult:
+    """
+    GET url into sink, resuming from sink.offset with a Range request when possible.
+
+    Partial data is only resumed when it came from the same url and has a
+    validator for If-Range; otherwise it may belong to another deck and is
+    dropped. A 206 whose Content-Range starts at sink.offset with the expected
+    total size appends to the partial data; a 200 (range ignored or the
+    validator no longer matches), a 416 or a 206 for the wrong bytes discards
+    it and starts over. With a hedge policy the
+    GET may be sent twice (see hedged_get); only the winner's body is read.
+    """
+    request_headers = dict(headers)
+    if sink.offset and not sink.can_resume(url):
+        sink.restart()
+    if sink.offset:
+        request_headers['Range'] = f"bytes={sink.offset}-"
+        request_headers['If-Range'] = sink.validator
+
+    if hedge is not None:
+        response = hedged_get(transport, url, hedge, headers=request_headers, stream=True, timeout=timeout)
+    else:
+        response = transport.get(url, headers=request_headers, stream=True, timeout=timeout)
+    if sink.offset and (response.status_code == 416 or
+                        (response.status_code == 206 and (_range_start(response) != sink.offset or
+                                                          _range_total(response) != sink.total_size))):
+        response.close()
+        sink.restart()
+        return download_to_sink(transport, url, headers, sink, buffer_size, timeout, hedge)
+
+    if response.status_code == 200:
+        sink.restart()
+        length = response.headers.get('Content-Length')
+        sink.remember_source(url, response_validator(response), int(length) if length and length.isdigit() else None)
+    elif response.status_code != 206 or not sink.offset:
+        raise SlidesGPTAPIError(
+            f"Download failed: {response.status_code} - {response.text}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
+
+    result = stream_response_to_sink(response, sink, buffer_size)
+    result.hedged = getattr(response, 'hedge_winner', None)
+    return result
+
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+def _range_start(response) -> Optional[int]:
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _range_total(response) -> Optional[int]:
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    return int(match.group(3)) if match else None
+
+
+def download_ranges_in_parallel(transport, url: str, headers: Dict, output_path: str, parts: int,
+                                buffer_size: int = DEFAULT_BUFFER_SIZE,
+                                timeout: Tuple[float, float] = None) -> Optional[DownloadResult]:
+    """
+    Fetch one deck as `parts` concurrent byte ranges assembled in place.
+
+    A one-byte probe checks for range support; returns None when the server
+    doesn't advertise it so the caller can fall back to a single stream. All
+    ranges are pinned to the probe's ETag/Last-Modified with If-Range. Ranges
+    are assembled in <output>.ranges.part, apart from FileSink's resumable
+    <output>.part, and a finished download removes any leftover resume state.
+    """
+    probe = transport.get(url, headers={**headers, 'Range': 'bytes=0-0'}, stream=True, timeout=timeout)
+    match = _CONTENT_RANGE.match(probe.headers.get('Content-Range', ''))
+    probe.close()
+    if probe.status_code != 206 or not match:
+        return None
+
+    total = int(match.group(3))
+    validator = response_validator(probe)
+    part_path = output_path + ".ranges.part"
+    with open(part_path, 'wb') as f:
+        f.truncate(total)
+
+    part_size = -(-total // max(1, parts))
+    ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+
+    def fetch(byte_range: Tuple[int, int]):
+        start, end = byte_range
+        range_headers = {**headers, 'Range': f"bytes={start}-{end}"}
+        if validator:
+            range_headers['If-Range'] = validator
+        response = transport.get(url, headers=range_headers, stream=True, timeout=timeout)
+        try:
+            if response.status_code != 206 or _range_start(response) != start:
+                raise SlidesGPTAPIError(f"Download failed: {response.status_code} - range {start}-{end} not served",
+                                        status_code=response.status_code)
+            buffer = bytearray(min(buffer_size, end - start + 1))
+            raw = response.raw
+            raw.decode_content = True
+            with open(part_path, 'r+b') as f:
+                f.seek(start)
+                while True:
+                    read = _read_into(raw, buffer)
+                    if not read:
+                        break
+                    f.write(memoryview(buffer)[:read])
+                if f.tell() != end + 1:
+                    raise SlidesGPTAPIError(f"Download failed: range {start}-{end} ended early at {f.tell()}")
+        finally:
+            response.close()
+
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            list(pool.map(fetch, ranges))
+
+        hasher = hashlib.sha256()
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(buffer_size), b''):
+                hasher.update(block)
+            os.fsync(f.fileno())
+        os.replace(part_path, output_path)
+        # A resumable download of the same deck that was interrupted earlier is now moot
+        FileSink(output_path, resumable=False).restart()
+    except BaseException:
+        try:
+            os.unlink(part_path)
+        except OSError:
+            pass
+        raise
+
+    return DownloadResult(location=output_path, bytes_written=total, sha256=hasher.hexdigest())
+
+
+def create_s3_client(region: str = 'us-west-1', endpoint_url: Optional[str] = None):
+    """Build a boto3 S3 client from AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY"""
+    import boto3
+
+    aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
+    aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+    if not aws_access_key or not aws_secret_key:
+        raise EnvironmentError("AWS credentials not found in environment variables.")
+    return boto3.client('s3',
+                        aws_access_key_id=aws_access_key,
+                        aws_secret_access_key=aws_secret_key,
+                        region_name=region,
+                        endpoint_url=endpoint_url)
@@ -4,70 +4,138 @@ Production SlidesGPT Generator for Clubly
 This script loads club data from JSON files and generates presentations using SlidesGPT API.
 """
 
+import csv
 import json
 import os
+import shutil
 import sys
-import requests
-from typing import Dict, Optional, List
-from dataclasses import dataclass
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, List
+from dataclasses import dataclass, asdict
 from pathlib import Path
 import argparse
 
+from circuit_breaker import (DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT, CircuitBreaker, CircuitOpenError,
+                             is_upstream_failure)
+from club_data import ClubData, load_club_file
+from club_index import ClubIndex
+from instrumentation import NULL_INSTRUMENTATION, Instrumentation, JsonLinesExporter, PrometheusExporter
+from prompt_templates import DEFAULT_PROMPT_TEMPLATES, PromptTemplates
+from presentation_cache import DEFAULT_CACHE_DIRECTORY, PresentationCache
+from presentation_download import (DEFAULT_BUFFER_SIZE, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT,
+                                   DownloadResult, DownloadSink, FileSink, HedgePolicy, S3MultipartSink, create_s3_client,
+                                   download_ranges_in_parallel, download_to_sink)
+from rate_limiter import DEFAULT_BURST, configure_shared_rate_limiter, parse_retry_after
+from single_flight import SingleFlight
+from slidesgpt_transport import SlidesGPTAPIError, SlidesGPTTransport, configure_shared_transport, get_shared_transport
+
+if TYPE_CHECKING:
+    from club_store import ClubStore
+
 @dataclass
-class ClubData:
-    clubId: str
-    userId: str
-    userName: str
-    userRole: str
-    clubName: str
-    description: str
-    mission: str
-    goals: str
-    createdAt: str
-    updatedAt: str
+class BatchJob:
+    club: str
+    topic: str
+    theme: str = "modern"
+    slides: int = 10
+    output: Optional[str] = None
+
+class _SharedDeck:
+    """The downloaded copy of a coalesced generation that followers copy from"""
+
+    def __init__(self, path: Optional[str], sha256: Optional[str]):
+        self.lock = threading.Lock()
+        self.path = path
+        self.sha256 = sha256
+
 
 class ProductionSlidesGPTGenerator:
-    def __init__(self, api_key: str = None):
+    def __init__(self,
+                 api_key: str = None,
+                 use_club_index: bool = True,
+                 transport: Optional[SlidesGPTTransport] = None,
+                 base_url: str = "https://api.slidesgpt.com",
+                 cache: Optional[PresentationCache] = None,
+                 download_buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 download_parts: int = 1,
+                 instrumentation: Optional[Instrumentation] = None,
+                 club_store: Optional["ClubStore"] = None,
+                 watch_clubs: bool = False,
+                 prompt_templates: Optional[PromptTemplates] = None,
+                 prompt_template: str = "presentation",
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 hedge_policy: Optional[HedgePolicy] = None):
         self.api_key = api_key or os.getenv('SLIDESGPT_API_KEY')
         if not self.api_key:
             raise ValueError("SlidesGPT API key is required. Set SLIDESGPT_API_KEY environment variable or pass it to constructor.")
         
-        self.base_url = "https://api.slidesgpt.com"
+        self.base_url = base_url
+        self.transport = transport or get_shared_transport()
+        self.cache = cache
+        self.download_buffer_size = download_buffer_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.download_parts = download_parts
+        self.circuit_breaker = circuit_breaker
+        self.hedge_policy = hedge_policy
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.use_club_index = use_club_index
+        self.club_store = club_store
+        self.watch_clubs = watch_clubs
+        self.prompt_templates = prompt_templates or DEFAULT_PROMPT_TEMPLATES
+        self.prompt_template = prompt_template
+        self.prompt_templates.get(prompt_template)
+        self._club_indexes: Dict[str, object] = {}
+        self._club_index_lock = threading.Lock()
+        self.single_flight = SingleFlight()
     
     def load_club_data_from_file(self, json_file_path: str) -> ClubData:
-        """Load club data from a JSON file"""
+        """Load club data from a JSON file (or a club store locator from find_club_file)"""
+        if self.club_store is not None and self.club_store.owns(json_file_path):
+            return self.club_store.load(json_file_path)
         try:
-            with open(json_file_path, 'r') as file:
-                data = json.load(file)
-            
-            return ClubData(
-                clubId=data.get('clubId', ''),
-                userId=data.get('userId', ''),
-                userName=data.get('userName', ''),
-                userRole=data.get('userRole', ''),
-                clubName=data.get('clubName', ''),
-                description=data.get('description', ''),
-                mission=data.get('mission', ''),
-                goals=data.get('goals', ''),
-                createdAt=data.get('createdAt', ''),
-                updatedAt=data.get('updatedAt', '')
-            )
+            return load_club_file(json_file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Club data file not found: {json_file_path}")
-        except json.JSONDecodeError:
+        except ValueError:
             raise ValueError(f"Invalid JSON format in file: {json_file_path}")
     
     def find_club_file(self, club_name: str, data_directory: str = "data/clubs") -> str:
-        """Find a club JSON file by club name"""
+        """Find a club JSON file by club name; with a club store, returns a store locator instead"""
+        if self.club_store is not None:
+            locator = self.club_store.find_club(club_name)
+            if locator is None:
+                raise FileNotFoundError(f"Club '{club_name}' not found in {self.club_store.path}")
+            return locator
+        
         data_path = Path(data_directory)
         
         if not data_path.exists():
             raise FileNotFoundError(f"Data directory not found: {data_directory}")
         
+        if self.use_club_index:
+            with self._club_index_lock:
+                index = self._club_indexes.get(data_directory)
+                if index is None:
+                    if self.watch_clubs:
+                        # The watcher pulls in ctypes; only load it when asked for
+                        from club_watcher import ClubWatcher
+                        index = ClubWatcher(data_directory).start()
+                    else:
+                        index = ClubIndex.open(data_directory)
+                    self._club_indexes[data_directory] = index
+                club_file = index.find_club(club_name)
+            if club_file is None:
+                raise FileNotFoundError(f"Club '{club_name}' not found in {data_directory}")
+            return club_file
+        
         # Search through all user directories
         for user_dir in data_path.iterdir():
             if user_dir.is_dir():
@@ -83,40 +151,12 @@ class ProductionSlidesGPTGenerator:
         raise FileNotFoundError(f"Club '{club_name}' not found in {data_directory}")
     
     def create_presentation_prompt(self, club_data: ClubData, topic: str) -> str:
-        """Create a comprehensive prompt for SlidesGPT API"""
-        
-        prompt = f"""
-Create a professional presentation for {club_data.clubName} about: {topic}
-
-Club Information:
-- Club Name: {club_data.clubName}
-- Description: {club_data.description}
-- Mission Statement: {club_data.mission}
-- Goals & Objectives: {club_data.goals}
-- User Role: {club_data.userRole}
-- User Name: {club_data.userName}
-
-Presentation Requirements:
-- Topic: {topic}
-- Target Audience: Club members and stakeholders
-- Tone: Professional yet engaging
-- Structure: Include introduction, main content sections, and conclusion
-- Visual Style: Modern and clean design
-
-Please create a presentation that:
-1. Aligns with the club's mission and goals
-2. Is appropriate for the user's role in the club
-3. Provides valuable information about the topic
-4. Engages the audience effectively
-5. Includes relevant examples and practical applications
-
-Make sure the content is tailored specifically for {club_data.clubName} and its members.
-        """.strip()
-        
-        return prompt
+        """Create a comprehensive prompt for SlidesGPT API (club section cached per clubId/updatedAt)"""
+        return self.prompt_templates.render(self.prompt_template, club_data, topic=topic)
     
     def generate_presentation(self, prompt: str, theme: str = "modern", slides_count: int = 10) -> Dict:
         """Generate a presentation using SlidesGPT API"""
+        import requests
         
         payload = {
             "prompt": prompt,
@@ -124,41 +164,122 @@ Make sure the content is tailored specifically for {club_data.clubName} and its
             "slides_count": slides_count
         }
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/generate",
-                headers=self.headers,
-                json=payload,
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"SlidesGPT API error: {response.status_code} - {response.text}")
+        with self.instrumentation.span("generate", theme=theme, slides_count=slides_count) as span:
+            if self.circuit_breaker:
+                try:
+                    self.circuit_breaker.before_call()
+                except CircuitOpenError:
+                    span.set(circuit="open")
+                    self.instrumentation.count("circuit_breaker", event="rejected")
+                    raise
+            # Recorded in finally so an unexpected error can't hold a half-open trial slot forever;
+            # no status means the outcome is unknown, which counts as a failure
+            status_code = None
+            try:
+                try:
+                    response = self.transport.post(
+                        f"{self.base_url}/generate",
+                        headers=self.headers,
+                        json=payload,
+                        timeout=60
+                    )
+                except requests.exceptions.RequestException as e:
+                    self.instrumentation.count("requests", endpoint="generate", status="error")
+                    raise Exception(f"Network error: {str(e)}")
                 
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error: {str(e)}")
+                status_code = response.status_code
+                retries = getattr(response, 'retries', 0)
+                span.set(status=response.status_code, retries=retries)
+                self.instrumentation.count("requests", endpoint="generate", status=response.status_code)
+                if retries:
+                    self.instrumentation.count("retries", retries, endpoint="generate")
+                
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except requests.exceptions.RequestException as e:
+                        raise Exception(f"Network error: {str(e)}")
+                else:
+                    raise SlidesGPTAPIError(
+                        f"SlidesGPT API error: {response.status_code} - {response.text}",
+                        status_code=response.status_code,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                    )
+            finally:
+                self._record_upstream_result(status_code)
+    
+    def _record_upstream_result(self, status_code: Optional[int]):
+        if not self.circuit_breaker:
+            return
+        if not is_upstream_failure(status_code):
+            self.circuit_breaker.record_success()
+        elif self.circuit_breaker.record_failure():
+            print("SlidesGPT circuit opened after repeated failures", file=sys.stderr)
+            self.instrumentation.count("circuit_breaker", event="opened")
     
-    def download_presentation(self, presentation_id: str, output_path: str) -> bool:
-        """Download the generated presentation"""
+    def stream_presentation(self, presentation_id: str, sink: DownloadSink) -> DownloadResult:
+        """Stream the generated presentation into a sink (local file or S3 multipart upload)"""
+        import requests
         try:
-            response = requests.get(
+            result = download_to_sink(
+                self.transport,
                 f"{self.base_url}/download/{presentation_id}",
-                headers=self.headers,
-                stream=True
+                self.headers,
+                sink,
+                self.download_buffer_size,
+                timeout=(self.connect_timeout, self.read_timeout),
+                hedge=self.hedge_policy
             )
-            
-            if response.status_code == 200:
-                with open(output_path, 'wb') as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-                return True
-            else:
-                raise Exception(f"Download failed: {response.status_code} - {response.text}")
-                
         except requests.exceptions.RequestException as e:
             raise Exception(f"Download error: {str(e)}")
+        if result.hedged:
+            self.instrumentation.count("hedged_downloads", winner=result.hedged)
+        return result
+    
+    def download_presentation(self, presentation_id: str, output_path: str, parts: Optional[int] = None) -> DownloadResult:
+        """
+        Download the generated presentation
+        
+        The file appears at output_path only once complete; an interrupted download
+        resumes from where it stopped. With parts > 1 and a server that supports
+        ranges, the deck is fetched as that many parallel byte ranges.
+        """
+        import requests
+        parts = parts or self.download_parts
+        with self.instrumentation.span("download", parts=parts) as span:
+            result = None
+            if parts > 1:
+                try:
+                    result = download_ranges_in_parallel(
+                        self.transport,
+                        f"{self.base_url}/download/{presentation_id}",
+                        self.headers,
+                        output_path,
+                        parts,
+                        self.download_buffer_size,
+                        timeout=(self.connect_timeout, self.read_timeout)
+                    )
+                except requests.exceptions.RequestException as e:
+                    raise Exception(f"Download error: {str(e)}")
+            if result is None:
+                result = self.stream_presentation(presentation_id, FileSink(output_path))
+            span.set(bytes=result.bytes_written)
+            self.instrumentation.count("download_bytes", result.bytes_written, destination="file")
+            return result
+    
+    def upload_presentation_to_s3(self,
+                                  presentation_id: str,
+                                  bucket: str,
+                                  object_name: str,
+                                  region: str = 'us-west-1',
+                                  s3_client=None) -> DownloadResult:
+        """Stream the generated presentation straight into S3 without touching local disk"""
+        client = s3_client or create_s3_client(region)
+        with self.instrumentation.span("s3_upload", bucket=bucket) as span:
+            result = self.stream_presentation(presentation_id, S3MultipartSink(client, bucket, object_name, region))
+            span.set(bytes=result.bytes_written)
+            self.instrumentation.count("download_bytes", result.bytes_written, destination="s3")
+            return result
     
     def generate_club_presentation(self, 
                                  club_name: str, 
@@ -166,50 +287,323 @@ Make sure the content is tailored specifically for {club_data.clubName} and its
                                  theme: str = "modern",
                                  slides_count: int = 10,
                                  output_path: Optional[str] = None,
-                                 data_directory: str = "data/clubs") -> Dict:
+                                 data_directory: str = "data/clubs",
+                                 refresh: bool = False,
+                                 s3_bucket: Optional[str] = None,
+                                 s3_object_name: Optional[str] = None,
+                                 s3_region: str = 'us-west-1') -> Dict:
         """
         Complete workflow: Find club file, load data, create prompt, generate and download presentation
-        """
-        
-        # Find and load club data
-        club_file_path = self.find_club_file(club_name, data_directory)
-        club_data = self.load_club_data_from_file(club_file_path)
-        
-        print(f"Loaded club data for: {club_data.clubName}")
-        print(f"User: {club_data.userName} ({club_data.userRole})")
         
-        # Create prompt
-        prompt = self.create_presentation_prompt(club_data, topic)
-        print(f"Created prompt for topic: {topic}")
+        With a cache configured, an identical prompt/theme/slides_count is served from
+        the cache; refresh=True skips the lookup but still stores the new result.
+        While the circuit breaker is open, an expired cached deck is served (marked
+        "stale") rather than failing.
+        With s3_bucket/s3_object_name the deck is streamed straight into S3.
+        """
         
-        # Generate presentation
+        obs = self.instrumentation
+        with obs.span("generate_club_presentation", club=club_name, topic=topic) as pipeline:
+            # Find and load club data
+            with obs.span("find_club_file", indexed=self.use_club_index or self.club_store is not None):
+                club_file_path = self.find_club_file(club_name, data_directory)
+            with obs.span("load_club_data"):
+                club_data = self.load_club_data_from_file(club_file_path)
+            
+            print(f"Loaded club data for: {club_data.clubName}")
+            print(f"User: {club_data.userName} ({club_data.userRole})")
+            
+            # Create prompt
+            with obs.span("build_prompt") as span:
+                prompt = self.create_presentation_prompt(club_data, topic)
+                span.set(prompt_chars=len(prompt))
+            print(f"Created prompt for topic: {topic}")
+            
+            cache_key = PresentationCache.make_key(prompt, theme, slides_count) if self.cache else None
+            if cache_key and not refresh:
+                with obs.span("cache_lookup") as span:
+                    cached = self.cache.get(cache_key)
+                    span.set(hit=cached is not None)
+                obs.count("cache_lookups", result="hit" if cached is not None else "miss")
+                pipeline.set(cache_hit=cached is not None)
+                if cached is not None:
+                    print("Presentation loaded from cache!")
+                    result = self._serve_cached(cached, cache_key, output_path)
+                    self._upload_to_s3_if_requested(result, s3_bucket, s3_object_name, s3_region)
+                    return result
+            
+            # Generate presentation; identical concurrent requests wait on one upstream call
+            flight_key = (club_data.clubId or club_file_path, prompt, theme, slides_count)
+            try:
+                (result, deck), shared = self.single_flight.do(
+                    flight_key, lambda: self._generate_for_flight(prompt, theme, slides_count, output_path, cache_key))
+            except CircuitOpenError:
+                stale = self.cache.get(cache_key, allow_stale=True) if cache_key else None
+                if stale is None:
+                    raise
+                print("SlidesGPT is unavailable; serving the cached presentation")
+                obs.count("circuit_breaker", event="served_cached")
+                pipeline.set(cache_hit=True, stale=True)
+                result = self._serve_cached(stale, cache_key, output_path, stale=True)
+                self._upload_to_s3_if_requested(result, s3_bucket, s3_object_name, s3_region)
+                return result
+            result = dict(result)
+            pipeline.set(coalesced=shared)
+            if shared:
+                obs.count("coalesced_requests")
+                print("Joined an identical generation already in progress")
+                self._share_download(result, output_path, deck)
+            
+            self._upload_to_s3_if_requested(result, s3_bucket, s3_object_name, s3_region)
+            return result
+    
+    def _serve_cached(self, cached: Dict, cache_key: str, output_path: Optional[str], stale: bool = False) -> Dict:
+        result = dict(cached)
+        if output_path and result.get('presentation_id'):
+            with self.instrumentation.span("cache_copy"):
+                copied = self.cache.copy_file_to(cache_key, output_path)
+            if not copied:
+                download = self.download_presentation(result['presentation_id'], output_path)
+                result['sha256'] = download.sha256
+                if not stale:
+                    # A stale entry keeps its age so it is regenerated once SlidesGPT recovers
+                    self.cache.put(cache_key, dict(result), output_path)
+            result['downloaded_to'] = output_path
+            print(f"Presentation downloaded to: {output_path}")
+        if stale:
+            result['stale'] = True
+        return result
+    
+    def _generate_and_download(self, prompt: str, theme: str, slides_count: int,
+                               output_path: Optional[str], cache_key: Optional[str]) -> Dict:
         result = self.generate_presentation(prompt, theme, slides_count)
         print("Presentation generated successfully!")
+        if cache_key:
+            self.cache.put(cache_key, dict(result))
         
         # Download if output path is provided
         if output_path and result.get('presentation_id'):
-            self.download_presentation(result['presentation_id'], output_path)
+            download = self.download_presentation(result['presentation_id'], output_path)
+            result['sha256'] = download.sha256
+            if cache_key:
+                self.cache.put(cache_key, dict(result), output_path)
             result['downloaded_to'] = output_path
             print(f"Presentation downloaded to: {output_path}")
-        
         return result
+    
+    def _generate_for_flight(self, prompt: str, theme: str, slides_count: int,
+                             output_path: Optional[str], cache_key: Optional[str]):
+        result = self._generate_and_download(prompt, theme, slides_count, output_path, cache_key)
+        return result, _SharedDeck(result.get('downloaded_to'), result.get('sha256'))
+    
+    def _share_download(self, result: Dict, output_path: Optional[str], deck: "_SharedDeck"):
+        """Give a coalesced caller its own copy of the deck, downloading it once if the leader didn't"""
+        result.pop('downloaded_to', None)
+        if not output_path or not result.get('presentation_id'):
+            return
+        with deck.lock:
+            copied = deck.path == output_path
+            if deck.path and not copied:
+                tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    shutil.copyfile(deck.path, tmp_path)
+                    os.replace(tmp_path, output_path)
+                    copied = True
+                except FileNotFoundError:
+                    # The file was moved away before we got to it
+                    pass
+            if not copied:
+                # The first caller that needs a file downloads it; the rest copy that one
+                deck.sha256 = self.download_presentation(result['presentation_id'], output_path).sha256
+                deck.path = output_path
+            if deck.sha256:
+                result['sha256'] = deck.sha256
+        result['downloaded_to'] = output_path
+        print(f"Presentation downloaded to: {output_path}")
+    
+    def _upload_to_s3_if_requested(self, result: Dict, bucket: Optional[str], object_name: Optional[str], region: str):
+        if not bucket or not result.get('presentation_id'):
+            return
+        upload = self.upload_presentation_to_s3(result['presentation_id'], bucket,
+                                                object_name or f"{result['presentation_id']}.pptx", region)
+        result['uploaded_to'] = upload.location
+        result['sha256'] = upload.sha256
+        print(f"Presentation uploaded to: {upload.location}")
+
+def load_batch_manifest(manifest_path: str, default_theme: str = "modern", default_slides: int = 10) -> List[BatchJob]:
+    """Load batch jobs from a JSONL or CSV manifest with club/topic/theme/slides/output columns"""
+    rows = []
+    try:
+        with open(manifest_path, 'r', newline='') as file:
+            if manifest_path.lower().endswith('.csv'):
+                rows = list(csv.DictReader(file))
+            else:
+                for line_number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        raise ValueError(f"Invalid JSON on line {line_number} of manifest: {manifest_path}")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Batch manifest not found: {manifest_path}")
+    
+    jobs = []
+    for row_number, row in enumerate(rows, 1):
+        if not row.get('club') or not row.get('topic'):
+            raise ValueError(f"Manifest entry {row_number} is missing 'club' or 'topic'")
+        jobs.append(BatchJob(
+            club=row['club'],
+            topic=row['topic'],
+            theme=row.get('theme') or default_theme,
+            slides=int(row.get('slides') or default_slides),
+            output=row.get('output') or None
+        ))
+    return jobs
+
+def run_batch(generator: ProductionSlidesGPTGenerator,
+              jobs: List[BatchJob],
+              results_path: str,
+              workers: int = 4,
+              data_directory: str = "data/clubs",
+              refresh: bool = False) -> Dict:
+    """
+    Run every job in one process on a bounded worker pool, appending one result line per job to results_path
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    def run_job(job: BatchJob) -> Dict:
+        started = time.monotonic()
+        try:
+            result = generator.generate_club_presentation(
+                club_name=job.club,
+                topic=job.topic,
+                theme=job.theme,
+                slides_count=job.slides,
+                output_path=job.output,
+                data_directory=data_directory,
+                refresh=refresh
+            )
+            return {"success": True, "result": result, "duration_seconds": time.monotonic() - started}
+        except Exception as e:
+            return {"success": False, "error": str(e), "duration_seconds": time.monotonic() - started}
+    
+    succeeded = 0
+    started = time.monotonic()
+    with open(results_path, 'w') as results_file, ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run_job, job): (job_number, job) for job_number, job in enumerate(jobs, 1)}
+        for future in as_completed(futures):
+            job_number, job = futures[future]
+            record = {"job": job_number, **asdict(job), **future.result()}
+            if record['success']:
+                succeeded += 1
+            results_file.write(json.dumps(record) + "\n")
+            results_file.flush()
+    
+    return {
+        "total_jobs": len(jobs),
+        "succeeded": succeeded,
+        "failed": len(jobs) - succeeded,
+        "duration_seconds": time.monotonic() - started,
+        "results_path": results_path,
+        "connections": generator.transport.connection_stats(),
+        "cache": generator.cache.stats() if generator.cache else None,
+        "coalescing": generator.single_flight.stats(),
+        "circuit_breaker": generator.circuit_breaker.stats() if generator.circuit_breaker else None,
+        "hedging": generator.hedge_policy.stats() if generator.hedge_policy else None
+    }
 
 def main():
     """Command-line interface for the SlidesGPT generator"""
     parser = argparse.ArgumentParser(description='Generate presentations using SlidesGPT API with club data')
-    parser.add_argument('--club', required=True, help='Name of the club')
-    parser.add_argument('--topic', required=True, help='Presentation topic')
+    parser.add_argument('--club', help='Name of the club')
+    parser.add_argument('--topic', help='Presentation topic')
     parser.add_argument('--theme', default='modern', help='Presentation theme (default: modern)')
     parser.add_argument('--slides', type=int, default=10, help='Number of slides (default: 10)')
     parser.add_argument('--output', help='Output file path for downloaded presentation')
     parser.add_argument('--data-dir', default='data/clubs', help='Directory containing club data (default: data/clubs)')
     parser.add_argument('--api-key', help='SlidesGPT API key (or set SLIDESGPT_API_KEY environment variable)')
+    parser.add_argument('--store', help='Read clubs from a club store (.db = SQLite, otherwise packed) instead of --data-dir; see club_store.py')
+    parser.add_argument('--no-index', action='store_true', help='Scan the data directory instead of using the club index')
+    parser.add_argument('--watch-clubs', action='store_true', help='Keep the club index current with a filesystem watcher instead of re-checking it on each lookup (long batches)')
+    parser.add_argument('--prompt-template', default='presentation', help='Named prompt template to use (default: presentation)')
+    parser.add_argument('--templates-dir', help='Directory of extra <name>.txt prompt templates')
+    parser.add_argument('--batch', help='JSONL or CSV manifest of club/topic/theme/slides/output jobs to run in one process')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent jobs in batch mode (default: 4)')
+    parser.add_argument('--results', help='Per-job result JSONL for batch mode (default: <manifest>.results.jsonl)')
+    parser.add_argument('--no-cache', action='store_true', help='Always call SlidesGPT; do not read or write the result cache')
+    parser.add_argument('--refresh', action='store_true', help='Regenerate even if a cached result exists, then update the cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIRECTORY, help=f'Result cache directory (default: {DEFAULT_CACHE_DIRECTORY})')
+    parser.add_argument('--cache-ttl', type=float, default=168, help='Hours before a cached result expires (default: 168)')
+    parser.add_argument('--s3-bucket', help='Stream the downloaded deck straight into this S3 bucket')
+    parser.add_argument('--s3-key', help='S3 object name (default: <presentation id>.pptx)')
+    parser.add_argument('--s3-region', default='us-west-1', help='S3 region (default: us-west-1)')
+    parser.add_argument('--download-buffer', type=int, default=DEFAULT_BUFFER_SIZE, help=f'Download read buffer in bytes (default: {DEFAULT_BUFFER_SIZE})')
+    parser.add_argument('--download-parts', type=int, default=1, help='Fetch the deck as this many parallel byte ranges when supported (default: 1)')
+    parser.add_argument('--read-timeout', type=float, default=DEFAULT_READ_TIMEOUT, help=f'Seconds to wait for download data (default: {DEFAULT_READ_TIMEOUT})')
+    parser.add_argument('--rate', type=float, help='Maximum SlidesGPT requests per second; backs off automatically on 429s')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help=f'Requests allowed in a burst above --rate (default: {DEFAULT_BURST})')
+    parser.add_argument('--circuit-breaker', type=int, metavar='N', help=f'Fail fast (or serve a cached deck) after N consecutive SlidesGPT failures, e.g. {DEFAULT_FAILURE_THRESHOLD} (default: off)')
+    parser.add_argument('--circuit-reset', type=float, default=DEFAULT_RESET_TIMEOUT, help=f'Seconds the circuit stays open before a trial call (default: {DEFAULT_RESET_TIMEOUT:.0f})')
+    parser.add_argument('--hedge-downloads', action='store_true', help='Send a second download request when the first is slower than the p95 of recent downloads')
+    parser.add_argument('--hedge-delay', type=float, help='Hedge after this many seconds instead of the recent p95 (implies --hedge-downloads)')
+    parser.add_argument('--max-connections', type=int, help='Pooled keep-alive connections per host (default: --workers in batch mode)')
+    parser.add_argument('--metrics-jsonl', help='Append per-stage timing spans and counters to this JSON-lines file')
+    parser.add_argument('--metrics-prom', help='Write stage timings and counters in Prometheus text format to this file on exit')
     
     args = parser.parse_args()
+    if not args.batch and (not args.club or not args.topic):
+        parser.error('--club and --topic are required unless --batch is given')
     
+    instrumentation = None
+    prometheus = None
+    club_store = None
     try:
+        if args.rate:
+            configure_shared_rate_limiter(rate=args.rate, burst=args.burst)
+        if args.max_connections or args.batch:
+            configure_shared_transport(max_connections_per_host=args.max_connections or max(1, args.workers))
+        
+        exporters = []
+        if args.metrics_jsonl:
+            exporters.append(JsonLinesExporter(args.metrics_jsonl))
+        if args.metrics_prom:
+            prometheus = PrometheusExporter()
+            exporters.append(prometheus)
+        instrumentation = Instrumentation(exporters) if exporters else None
+        
         # Initialize generator
-        generator = ProductionSlidesGPTGenerator(args.api_key)
+        if args.store:
+            from club_store import open_club_store
+            club_store = open_club_store(args.store)
+        if args.templates_dir:
+            DEFAULT_PROMPT_TEMPLATES.load_directory(args.templates_dir)
+        cache = None if args.no_cache else PresentationCache(args.cache_dir, ttl_seconds=args.cache_ttl * 3600)
+        generator = ProductionSlidesGPTGenerator(
+            args.api_key,
+            use_club_index=not args.no_index,
+            cache=cache,
+            download_buffer_size=args.download_buffer,
+            read_timeout=args.read_timeout,
+            download_parts=args.download_parts,
+            instrumentation=instrumentation,
+            club_store=club_store,
+            watch_clubs=args.watch_clubs,
+            prompt_template=args.prompt_template,
+            circuit_breaker=CircuitBreaker(args.circuit_breaker, args.circuit_reset) if args.circuit_breaker else None,
+            hedge_policy=HedgePolicy(delay=args.hedge_delay) if args.hedge_downloads or args.hedge_delay else None
+        )
+        
+        if args.batch:
+            jobs = load_batch_manifest(args.batch, args.theme, args.slides)
+            results_path = args.results or f"{os.path.splitext(args.batch)[0]}.results.jsonl"
+            summary = run_batch(generator, jobs, results_path, args.workers, args.data_dir, refresh=args.refresh)
+            
+            print("\n=== Batch Result ===")
+            print(json.dumps(summary, indent=2))
+            if summary['failed']:
+                sys.exit(1)
+            return
         
         # Generate presentation
         result = generator.generate_club_presentation(
@@ -218,15 +612,28 @@ def main():
             theme=args.theme,
             slides_count=args.slides,
             output_path=args.output,
-            data_directory=args.data_dir
+            data_directory=args.data_dir,
+            refresh=args.refresh,
+            s3_bucket=args.s3_bucket,
+            s3_object_name=args.s3_key,
+            s3_region=args.s3_region
         )
         
         print("\n=== Generation Result ===")
         print(json.dumps(result, indent=2))
+        if cache:
+            print(f"Cache: {json.dumps(cache.stats())}")
         
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if club_store:
+            club_store.close()
+        if prometheus:
+            prometheus.write(args.metrics_prom)
+        if instrumentation:
+            instrumentation.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
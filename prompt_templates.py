@@ -0,0 +1,247 @@
+"""
+Compiled prompt templates for SlidesGPT
+Templates use str.format-style {field} placeholders and are parsed once. Fields
+that name a ClubData attribute are rendered once per club and cached, keyed by
+clubId and updatedAt, so a batch of topics for the same club only fills in the
+request fields (topic, presentation_type, ...) each time.
+"""
+
+import os
+import threading
+from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+from club_data import CLUB_FIELDS, ClubData
+
+DEFAULT_CACHE_SIZE = 4096
+
+PRESENTATION_TEMPLATE = """
+Create a professional presentation for {clubName} about: {topic}
+
+Club Information:
+- Club Name: {clubName}
+- Description: {description}
+- Mission Statement: {mission}
+- Goals & Objectives: {goals}
+- User Role: {userRole}
+- User Name: {userName}
+
+Presentation Requirements:
+- Topic: {topic}
+- Target Audience: Club members and stakeholders
+- Tone: Professional yet engaging
+- Structure: Include introduction, main content sections, and conclusion
+- Visual Style: Modern and clean design
+
+Please create a presentation that:
+1. Aligns with the club's mission and goals
+2. Is appropriate for the user's role in the club
+3. Provides valuable information about the topic
+4. Engages the audience effectively
+5. Includes relevant examples and practical applications
+
+Make sure the content is tailored specifically for {clubName} and its members.
+"""
+
+CLUB_PRESENTATION_TEMPLATE = """
+Create a professional presentation for {clubName} about: {topic}
+
+Club Information:
+- Club Name: {clubName}
+- Description: {description}
+- Mission Statement: {mission}
+- Goals & Objectives: {goals}
+- User Role: {userRole}
+- User Name: {userName}
+
+Presentation Requirements:
+- Topic: {topic}
+- Type: {presentation_type} presentation
+- Target Audience: Club members and stakeholders
+- Tone: Professional yet engaging
+- Structure: Include introduction, main content sections, and conclusion
+- Visual Style: Modern and clean design
+
+Please create a presentation that:
+1. Aligns with the club's mission and goals
+2. Is appropriate for the user's role in the club
+3. Provides valuable information about the topic
+4. Engages the audience effectively
+5. Includes relevant examples and practical applications
+
+Make sure the content is tailored specifically for {clubName} and its members.
+"""
+
+
+class PromptTemplate:
+    """
+    One parsed template. The source is stripped, like the original f-string
+    prompts, and split into literal text, club fields and request fields.
+    Format specs and conversions ({x!r}, {x:>10}) are not supported.
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source.strip()
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        try:
+            parsed = list(Formatter().parse(self.source))
+        except ValueError as e:
+            raise ValueError(f"Invalid prompt template '{name}': {e}")
+        for literal, field, spec, conversion in parsed:
+            if spec or conversion:
+                raise ValueError(f"Prompt template '{name}' uses a format spec or conversion in {{{field}}}")
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"Prompt template '{name}' has an invalid field {{{field}}}")
+            self._segments.append((literal, field))
+        fields = [field for _, field in self._segments if field is not None]
+        self.club_fields = tuple(dict.fromkeys(f for f in fields if f in CLUB_FIELDS))
+        self.request_fields = tuple(dict.fromkeys(f for f in fields if f not in CLUB_FIELDS))
+
+    def bind(self, club: ClubData) -> "BoundPrompt":
+        """Render every club field now; the result only needs the request fields filled in"""
+        parts: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        pending = []
+        for literal, field in self._segments:
+            pending.append(literal)
+            if field is None:
+                continue
+            if field in CLUB_FIELDS:
+                pending.append(getattr(club, field))
+            else:
+                parts.append("".join(pending))
+                pending = []
+                slots.append((len(parts), field))
+                parts.append("")
+        parts.append("".join(pending))
+        return BoundPrompt(self, parts, slots)
+
+    def render(self, club: ClubData, **request) -> str:
+        return self.bind(club).render(**request)
+
+
+class BoundPrompt:
+    """A template with one club's section already rendered"""
+
+    __slots__ = ("template", "_parts", "_slots", "_single_field", "_chunks")
+
+    def __init__(self, template: PromptTemplate, parts: List[str], slots: List[Tuple[int, str]]):
+        self.template = template
+        self._parts = parts
+        self._slots = slots
+        # Common case: one request field (possibly repeated), rendered as field_value.join(chunks)
+        fields = {field for _, field in slots}
+        self._single_field = fields.pop() if len(fields) == 1 else None
+        self._chunks = parts[::2] if self._single_field else None
+
+    def render(self, **request) -> str:
+        if self._single_field is not None:
+            try:
+                return str(request[self._single_field]).join(self._chunks)
+            except KeyError:
+                raise ValueError(f"Prompt template '{self.template.name}' needs a value for {self._single_field}")
+        parts = list(self._parts)
+        try:
+            for index, field in self._slots:
+                parts[index] = str(request[field])
+        except KeyError as e:
+            raise ValueError(f"Prompt template '{self.template.name}' needs a value for {e.args[0]}")
+        return "".join(parts)
+
+
+def club_cache_key(club: ClubData) -> Tuple:
+    """(clubId, updatedAt) when both are set; otherwise every field, so unsaved clubs never collide"""
+    if club.clubId and club.updatedAt:
+        return club.clubId, club.updatedAt
+    return tuple(getattr(club, name) for name in CLUB_FIELDS)
+
+
+class PromptTemplates:
+    """
+    Registry of named templates plus a bounded cache of club sections.
+
+    The cache assumes a club's content only changes together with its updatedAt,
+    which is how the frontend saves clubs. Hits take no lock (a dict read is
+    atomic), and when full the oldest entry is evicted. Safe to share between threads.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._bound: Dict[Tuple, BoundPrompt] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, source: str) -> PromptTemplate:
+        template = PromptTemplate(name, source)
+        with self._lock:
+            self._templates[name] = template
+            # Drop sections bound to a replaced template
+            for key in [key for key in self._bound if key[0] == name]:
+                del self._bound[key]
+        return template
+
+    def load_directory(self, directory: str) -> List[str]:
+        """Register every <name>.txt template in a directory; returns the names"""
+        names = []
+        for path in sorted(Path(directory).glob("*.txt")):
+            self.register(path.stem, path.read_text(encoding='utf-8'))
+            names.append(path.stem)
+        return names
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._templates)
+
+    def get(self, name: str) -> PromptTemplate:
+        with self._lock:
+            template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Unknown prompt template: {name}")
+        return template
+
+    def bound(self, name: str, club: ClubData) -> BoundPrompt:
+        if club.clubId and club.updatedAt:
+            key = (name, club.clubId, club.updatedAt)
+        else:
+            key = (name,) + club_cache_key(club)
+        bound = self._bound.get(key)
+        if bound is not None:
+            self.hits += 1
+            return bound
+        bound = self.get(name).bind(club)
+        with self._lock:
+            self.misses += 1
+            self._bound[key] = bound
+            if len(self._bound) > self.cache_size:
+                del self._bound[next(iter(self._bound))]
+        return bound
+
+    def render(self, name: str, club: ClubData, **request) -> str:
+        return self.bound(name, club).render(**request)
+
+    def clear_cache(self):
+        with self._lock:
+            self._bound.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"templates": len(self._templates), "cached_clubs": len(self._bound),
+                    "hits": self.hits, "misses": self.misses}
+
+
+def default_templates() -> PromptTemplates:
+    """A registry with the built-in templates, plus any in $CLUBLY_PROMPT_TEMPLATES_DIR"""
+    templates = PromptTemplates()
+    templates.register("presentation", PRESENTATION_TEMPLATE)
+    templates.register("club_presentation", CLUB_PRESENTATION_TEMPLATE)
+    directory = os.getenv("CLUBLY_PROMPT_TEMPLATES_DIR")
+    if directory:
+        templates.load_directory(directory)
+    return templates
+
+
+DEFAULT_PROMPT_TEMPLATES = default_templates()
@@ -0,0 +1,154 @@
+"""
+Client-side rate limiting for SlidesGPT calls
+A token bucket whose rate adapts to the API: it backs off multiplicatively on
+429/5xx responses, honours Retry-After, and creeps back up while calls succeed.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 5
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    reserve() hands out slots in order: callers beyond the bucket are given a
+    wait time rather than being rejected. on_throttle() cuts the rate by
+    decrease_factor and pauses everyone until Retry-After has passed;
+    on_success() adds increase_step back, up to max_rate.
+    """
+
+    def __init__(self,
+                 rate: float = DEFAULT_RATE,
+                 burst: int = DEFAULT_BURST,
+                 min_rate: float = 0.05,
+                 max_rate: Optional[float] = None,
+                 increase_step: Optional[float] = None,
+                 decrease_factor: float = 0.5,
+                 clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase_step = increase_step if increase_step is not None else max(self.max_rate / 20, 0.01)
+        self.decrease_factor = decrease_factor
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self.throttled_count = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a slot and return how many seconds to wait before using it"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        import asyncio
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(self._clock())
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.throttled_count += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "throttled": self.throttled_count
+            }
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for 429/5xx responses and connection errors"""
+
+    def __init__(self,
+                 max_retries: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0,
+                 retry_statuses=RETRYABLE_STATUS_CODES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = tuple(retry_statuses)
+
+    def should_retry(self, attempt: int, status_code: Optional[int] = None) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+_shared_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the process-wide limiter used by every SlidesGPT client"""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = AdaptiveRateLimiter()
+        return _shared_rate_limiter
+
+
+def configure_shared_rate_limiter(**kwargs) -> AdaptiveRateLimiter:
+    """Replace the process-wide limiter with one built from the given settings"""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        _shared_rate_limiter = AdaptiveRateLimiter(**kwargs)
+        return _shared_rate_limiter
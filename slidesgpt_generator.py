@@ -1,22 +1,25 @@
 import json
-import requests
 import os
 from typing import Dict, List, Optional
-from dataclasses import dataclass
 
-@dataclass
-class ClubData:
-    name: str
-    description: str
-    mission: str
-    goals: str
-    user_role: str
-    user_name: str
+from club_data import ClubData, load_club_file
+from prompt_templates import DEFAULT_PROMPT_TEMPLATES, PromptTemplates
+from presentation_download import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, DownloadResult, FileSink, download_to_sink
+from rate_limiter import parse_retry_after
+from slidesgpt_transport import SlidesGPTAPIError, SlidesGPTTransport, get_shared_transport
 
 class SlidesGPTGenerator:
-    def __init__(self, api_key: str):
+    def __init__(self,
+                 api_key: str,
+                 transport: Optional[SlidesGPTTransport] = None,
+                 base_url: str = "https://api.slidesgpt.com",
+                 prompt_templates: Optional[PromptTemplates] = None,
+                 prompt_template: str = "club_presentation"):
         self.api_key = api_key
-        self.base_url = "https://api.slidesgpt.com"
+        self.base_url = base_url
+        self.transport = transport or get_shared_transport()
+        self.prompt_templates = prompt_templates or DEFAULT_PROMPT_TEMPLATES
+        self.prompt_template = prompt_template
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
@@ -25,58 +28,19 @@ class SlidesGPTGenerator:
     def load_club_data_from_json(self, json_file_path: str) -> ClubData:
         """Load club data from a JSON file created by the onboarding process"""
         try:
-            with open(json_file_path, 'r') as file:
-                data = json.load(file)
-            
-            return ClubData(
-                name=data.get('clubName', ''),
-                description=data.get('description', ''),
-                mission=data.get('mission', ''),
-                goals=data.get('goals', ''),
-                user_role=data.get('userRole', ''),
-                user_name=data.get('userName', '')
-            )
+            return load_club_file(json_file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Club data file not found: {json_file_path}")
-        except json.JSONDecodeError:
+        except ValueError:
             raise ValueError(f"Invalid JSON format in file: {json_file_path}")
     
     def create_club_prompt(self, club_data: ClubData, topic: str, presentation_type: str = "general") -> str:
         """Create a comprehensive prompt for SlidesGPT API using club data"""
-        
-        prompt = f"""
-Create a professional presentation for {club_data.name} about: {topic}
-
-Club Information:
-- Club Name: {club_data.name}
-- Description: {club_data.description}
-- Mission Statement: {club_data.mission}
-- Goals & Objectives: {club_data.goals}
-- User Role: {club_data.user_role}
-- User Name: {club_data.user_name}
-
-Presentation Requirements:
-- Topic: {topic}
-- Type: {presentation_type} presentation
-- Target Audience: Club members and stakeholders
-- Tone: Professional yet engaging
-- Structure: Include introduction, main content sections, and conclusion
-- Visual Style: Modern and clean design
-
-Please create a presentation that:
-1. Aligns with the club's mission and goals
-2. Is appropriate for the user's role in the club
-3. Provides valuable information about the topic
-4. Engages the audience effectively
-5. Includes relevant examples and practical applications
-
-Make sure the content is tailored specifically for {club_data.name} and its members.
-        """.strip()
-        
-        return prompt
+        return self.prompt_templates.render(self.prompt_template, club_data, topic=topic, presentation_type=presentation_type)
     
     def generate_presentation(self, prompt: str, theme: str = "modern", slides_count: int = 10) -> Dict:
         """Generate a presentation using SlidesGPT API"""
+        import requests
         
         payload = {
             "prompt": prompt,
@@ -85,7 +49,7 @@ Make sure the content is tailored specifically for {club_data.name} and its memb
         }
         
         try:
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.base_url}/generate",
                 headers=self.headers,
                 json=payload,
@@ -95,28 +59,26 @@ Make sure the content is tailored specifically for {club_data.name} and its memb
             if response.status_code == 200:
                 return response.json()
             else:
-                raise Exception(f"SlidesGPT API error: {response.status_code} - {response.text}")
+                raise SlidesGPTAPIError(
+                    f"SlidesGPT API error: {response.status_code} - {response.text}",
+                    status_code=response.status_code,
+                    retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                )
                 
         except requests.exceptions.RequestException as e:
             raise Exception(f"Network error: {str(e)}")
     
-    def download_presentation(self, presentation_id: str, output_path: str) -> bool:
-        """Download the generated presentation"""
+    def download_presentation(self, presentation_id: str, output_path: str) -> DownloadResult:
+        """Download the generated presentation, resuming a previous partial download if one exists"""
+        import requests
         try:
-            response = requests.get(
+            return download_to_sink(
+                self.transport,
                 f"{self.base_url}/download/{presentation_id}",
-                headers=self.headers,
-                stream=True
+                self.headers,
+                FileSink(output_path),
+                timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
             )
-            
-            if response.status_code == 200:
-                with open(output_path, 'wb') as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-                return True
-            else:
-                raise Exception(f"Download failed: {response.status_code} - {response.text}")
-                
         except requests.exceptions.RequestException as e:
             raise Exception(f"Download error: {str(e)}")
     
@@ -0,0 +1,252 @@
+"""
+Shared HTTP transport for SlidesGPT clients
+Keeps a pooled, keep-alive requests.Session so generate and download calls reuse
+TCP/TLS connections to api.slidesgpt.com instead of handshaking on every call.
+Every request passes through a shared rate limiter and is retried with backoff
+on 429/5xx responses. Non-idempotent requests (POST /generate creates a billed
+deck) are only retried when the server cannot have acted on them: a 429, or a
+connection that failed before the request was sent.
+
+requests is only imported when the first session is built, so scripts that
+never reach the network (--help, cache hits) don't pay for loading it.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy, get_shared_rate_limiter, parse_retry_after
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 32
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class SlidesGPTAPIError(Exception):
+    """Non-success response from the SlidesGPT API"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TransportStats:
+    """Thread-safe counters for connections opened versus requests sent"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self.retries = 0
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_request(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(0, self.requests_sent - self.connections_opened),
+                "requests_sent": self.requests_sent,
+                "retries": self.retries
+            }
+
+
+def _counting_pool(base_class, stats: TransportStats):
+    class CountingConnectionPool(base_class):
+        def _new_conn(self):
+            stats.record_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+def _counting_adapter(stats: TransportStats, **kwargs):
+    """An HTTPAdapter that counts requests sent and connections opened"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _counting_pool(HTTPConnectionPool, stats),
+                "https": _counting_pool(HTTPSConnectionPool, stats)
+            }
+
+        def send(self, request, **kwargs):
+            stats.record_request()
+            return super().send(request, **kwargs)
+
+    return CountingAdapter(**kwargs)
+
+
+class SlidesGPTTransport:
+    """
+    Pooled HTTP session shared by the SlidesGPT clients.
+
+    pool_connections is the number of per-host pools kept alive, and
+    max_connections_per_host caps the open sockets to any one host. With
+    block_when_full the caller waits for a free connection instead of opening
+    an extra, unpooled one.
+
+    Requests wait on rate_limiter before being sent. Responses with a status in
+    retry_policy.retry_statuses (and connection failures) are retried after a
+    jittered backoff that respects Retry-After; the last response is returned
+    if retries run out.
+    """
+
+    def __init__(self,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 block_when_full: bool = False,
+                 keep_alive: bool = True,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.stats = TransportStats()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.pool_connections = pool_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.block_when_full = block_when_full
+        self.keep_alive = keep_alive
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """The pooled session, built (and requests imported) on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session = requests.Session()
+                    adapter = _counting_adapter(
+                        self.stats,
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.max_connections_per_host,
+                        pool_block=self.block_when_full
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+                    self._session = session
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs) -> "requests.Response":
+        import requests
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                # A dropped connection ("Connection aborted") may come after the body was
+                # sent, so only failures to connect at all are safe to repeat for a POST
+                if not (idempotent or _never_sent(e)) or not self.retry_policy.should_retry(attempt):
+                    raise
+                self._wait_before_retry(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code not in self.retry_policy.retry_statuses:
+                self.rate_limiter.on_success()
+                response.retries = attempt
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.on_throttle(retry_after)
+            # A 5xx means the server received the request and may have acted on it
+            if (not (idempotent or response.status_code == 429)
+                    or not self.retry_policy.should_retry(attempt, response.status_code)):
+                response.retries = attempt
+                return response
+
+            response.close()
+            self._wait_before_retry(attempt, retry_after)
+            attempt += 1
+
+    def _wait_before_retry(self, attempt: int, retry_after: Optional[float] = None):
+        self.stats.record_retry()
+        time.sleep(self.retry_policy.backoff(attempt, retry_after))
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("POST", url, **kwargs)
+
+    def connection_stats(self) -> Dict:
+        """Counts of connections opened versus reused since the transport was created"""
+        return self.stats.snapshot()
+
+    def rate_limit_stats(self) -> Dict:
+        return self.rate_limiter.stats()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _never_sent(error: BaseException) -> bool:
+    """Whether a connection error happened before any of the request reached the server"""
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    pending, seen = [error], set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, NewConnectionError):
+            return True
+        # requests wraps urllib3's MaxRetryError, whose .reason is the underlying failure
+        pending.extend([getattr(current, 'reason', None), current.__cause__, current.__context__])
+        pending.extend(arg for arg in current.args if isinstance(arg, BaseException))
+    return False
+
+
+_shared_transport: Optional[SlidesGPTTransport] = None
+_shared_transport_lock = threading.Lock()
+
+
+def get_shared_transport() -> SlidesGPTTransport:
+    """Return the process-wide transport, creating it with default settings on first use"""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = SlidesGPTTransport()
+        return _shared_transport
+
+
+def configure_shared_transport(**kwargs) -> SlidesGPTTransport:
+    """Replace the process-wide transport with one built from the given settings"""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is not None:
+            _shared_transport.close()
+        _shared_transport = SlidesGPTTransport(**kwargs)
+        return _shared_transport
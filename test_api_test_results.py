@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming API test results
+"""
+
+import json
+import os
+import tempfile
+from api_test_results import ResultsAggregator, ResultsWriter, classify_error
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from slidesgpt_transport import SlidesGPTTransport
+from test_slidesgpt_api import SlidesGPTAPITester
+
+
+def test_writer_snapshots_and_aggregation():
+    """Results are on disk as they are written and the file aggregates to the same summary"""
+    print("Testing results writer...")
+
+    results = [
+        {"call_number": 1, "timestamp": "t1", "status_code": 200, "success": True, "response_text": "{}"},
+        {"call_number": 2, "timestamp": "t2", "status_code": 429, "success": False,
+         "response_text": '{"error": "rate limit exceeded"}'},
+        {"call_number": 3, "timestamp": "t3", "status_code": 401, "success": False, "response_text": "denied"},
+        {"call_number": 4, "timestamp": "t4", "status_code": None, "success": False, "error": "Read timeout"},
+        {"call_number": 5, "timestamp": "t5", "status_code": 500, "success": False, "response_text": "oops"},
+    ]
+    assert [classify_error(r) for r in results] == [None, "Rate Limit/Quota", "Unauthorized", "Timeout", "Unknown"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.jsonl")
+        writer = ResultsWriter(path, test_info={"planned_calls": 5}, snapshot_every=2, snapshot_interval=3600)
+        for result in results[:2]:
+            writer.write(result)
+        with open(path) as f:
+            assert [json.loads(line) for line in f] == results[:2]
+        with open(writer.snapshot_path) as f:
+            snapshot = json.load(f)
+        assert snapshot["summary"]["total_calls"] == 2 and snapshot["test_info"] == {"planned_calls": 5}
+
+        for result in results[2:]:
+            writer.write(result)
+        writer.close(duration_seconds=1.5)
+        with open(writer.snapshot_path) as f:
+            snapshot = json.load(f)
+        assert snapshot["test_info"]["duration_seconds"] == 1.5
+        assert snapshot["summary"] == writer.aggregator.summary()
+
+        # A crash mid-write leaves a torn last line, which the aggregator skips
+        with open(path, 'a') as f:
+            f.write('{"call_number": 6, "succ')
+        summary = ResultsAggregator.from_file(path).summary()
+        assert summary == snapshot["summary"]
+        assert summary["total_calls"] == 5 and summary["successful_calls"] == 1 and summary["success_rate"] == 20.0
+        assert summary["status_codes"] == {"200": 1, "429": 1, "401": 1, "None": 1, "500": 1}
+        assert summary["first_call"] == "t1" and summary["last_call"] == "t5"
+
+        # A new run won't append to an old file; resuming counts what is already there
+        try:
+            ResultsWriter(path)
+            raise AssertionError("Expected FileExistsError")
+        except FileExistsError:
+            pass
+        with ResultsWriter(path, resume=True) as resumed:
+            assert resumed.aggregator.summary()["total_calls"] == 5
+            resumed.write({"call_number": 7, "timestamp": "t7", "status_code": 200, "success": True})
+        with open(resumed.snapshot_path) as f:
+            assert json.load(f)["summary"] == ResultsAggregator.from_file(path).summary()
+        assert ResultsAggregator.from_file(path).summary()["total_calls"] == 6
+
+    print("✅ Results writer test passed!")
+
+
+def test_serial_run_streams_results():
+    """A serial run against the fake server keeps no results in memory and summarises from its file"""
+    print("Testing streamed serial run...")
+
+    config = FakeServerConfig(throttle_rate=0.3, error_rate=0.2, seed=7)
+    with FakeSlidesGPTServer(config) as fake, tempfile.TemporaryDirectory() as temp_dir:
+        transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+                                       retry_policy=RetryPolicy(max_retries=0))
+        tester = SlidesGPTAPITester("test-key", transport=transport, base_url=fake.base_url)
+        path = os.path.join(temp_dir, "serial.jsonl")
+        tester.run_test(total_calls=20, results_path=path, snapshot_every=5)
+        assert not hasattr(tester, "results")
+
+        with open(path) as f:
+            assert [json.loads(line)["call_number"] for line in f] == list(range(1, 21))
+        summary = tester.print_summary(1.0)
+        served = fake.stats()["/v1/presentations/generate"]
+        assert summary["total_calls"] == 20 and summary["status_codes"] == served
+        assert summary["successful_calls"] == tester.success_count == served.get("200", 0)
+        assert summary["error_patterns"].get("Rate Limit/Quota", 0) == served.get("429", 0)
+        assert summary["error_patterns"].get("Unknown", 0) == served.get("500", 0)
+        with open(tester.writer.snapshot_path) as f:
+            assert json.load(f)["summary"] == summary
+
+    print("✅ Streamed serial run test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running API test results tests...\n")
+
+    tests = [
+        test_writer_snapshots_and_aggregation,
+        test_serial_run_streams_results
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
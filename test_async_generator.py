@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the async SlidesGPT generator
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from async_slidesgpt_generator import AsyncProductionSlidesGPTGenerator, aiohttp
+from rate_limiter import AdaptiveRateLimiter
+
+
+class SlowSlidesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def _track(self, delta: int):
+        with SlowSlidesHandler.lock:
+            SlowSlidesHandler.in_flight += delta
+            SlowSlidesHandler.max_in_flight = max(SlowSlidesHandler.max_in_flight, SlowSlidesHandler.in_flight)
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self._track(1)
+        time.sleep(0.2)
+        self._track(-1)
+        self._send(json.dumps({"presentation_id": f"deck-{len(payload['prompt'])}"}).encode(), "application/json")
+
+    def do_GET(self):
+        self._send(b"PK" + b"\0" * 1000, "application/octet-stream")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TruncatedDownloadHandler(BaseHTTPRequestHandler):
+    """Promises a 100KB deck but hangs up after the first few bytes"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(100 * 1024))
+        self.end_headers()
+        self.wfile.write(b"PK" + b"\0" * 100)
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_concurrency_cap_and_pipeline():
+    """In-flight requests never exceed max_in_flight and the full pipeline downloads the deck"""
+    print("Testing async generator...")
+
+    if aiohttp is None:
+        print("⏭️  aiohttp not installed, skipping")
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowSlidesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run(data_dir: str, output_path: str):
+        async with AsyncProductionSlidesGPTGenerator(api_key="test-key", max_in_flight=3, base_url=base_url,
+                                                     rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)) as generator:
+            started = time.monotonic()
+            results = await asyncio.gather(*(generator.generate_presentation("x" * i) for i in range(9)))
+            elapsed = time.monotonic() - started
+            pipeline = await generator.generate_club_presentation("AI Club", "Neural Networks",
+                                                                  output_path=output_path, data_directory=data_dir)
+        return results, elapsed, pipeline
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            user_dir = Path(temp_dir) / "clubs" / "user-a"
+            user_dir.mkdir(parents=True)
+            with open(user_dir / "AI_Club_club-1.json", 'w') as f:
+                json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+            output_path = os.path.join(temp_dir, "deck.pptx")
+
+            results, elapsed, pipeline = asyncio.run(run(str(Path(temp_dir) / "clubs"), output_path))
+
+            assert [r["presentation_id"] for r in results] == [f"deck-{i}" for i in range(9)]
+            assert SlowSlidesHandler.max_in_flight == 3
+            assert elapsed >= 0.55
+            assert pipeline["downloaded_to"] == output_path
+            assert os.path.getsize(output_path) == 1002
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Async generator test passed!")
+
+
+def test_failed_download_leaves_no_partial_deck():
+    """A download cut off mid-stream leaves neither a truncated deck nor a .part file behind"""
+    print("Testing failed async download...")
+
+    if aiohttp is None:
+        print("⏭️  aiohttp not installed, skipping")
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TruncatedDownloadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run(output_path: str):
+        async with AsyncProductionSlidesGPTGenerator(api_key="test-key", base_url=base_url,
+                                                     rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)) as generator:
+            await generator.download_presentation("deck-1", output_path)
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "deck.pptx")
+            with open(output_path, 'wb') as f:
+                f.write(b"previous deck")
+            try:
+                asyncio.run(run(output_path))
+                raise AssertionError("Expected a download error")
+            except AssertionError:
+                raise
+            except Exception as e:
+                assert "Download error" in str(e)
+            with open(output_path, 'rb') as f:
+                assert f.read() == b"previous deck"
+            assert os.listdir(temp_dir) == ["deck.pptx"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Failed async download test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running async generator tests...\n")
+
+    tests = [
+        test_concurrency_cap_and_pipeline,
+        test_failed_download_leaves_no_partial_deck
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for batch presentation generation
+"""
+
+import json
+import tempfile
+import threading
+from pathlib import Path
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator, load_batch_manifest, run_batch
+
+
+class OfflineGenerator(ProductionSlidesGPTGenerator):
+    """Generator that answers locally instead of calling SlidesGPT"""
+
+    def __init__(self):
+        super().__init__(api_key="test-key")
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_presentation(self, prompt: str, theme: str = "modern", slides_count: int = 10):
+        with self.lock:
+            self.calls += 1
+        if "fail" in prompt:
+            raise Exception("SlidesGPT API error: 500 - boom")
+        return {"id": f"deck-{slides_count}", "theme": theme}
+
+
+def test_load_manifest_formats():
+    """JSONL and CSV manifests produce the same jobs, with CLI defaults filled in"""
+    print("Testing manifest loading...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jsonl_path = Path(temp_dir) / "jobs.jsonl"
+        jsonl_path.write_text(
+            json.dumps({"club": "AI Club", "topic": "Neural Networks", "slides": 12}) + "\n\n" +
+            json.dumps({"club": "Math Club", "topic": "Calculus", "theme": "dark", "output": "math.pptx"}) + "\n"
+        )
+        csv_path = Path(temp_dir) / "jobs.csv"
+        csv_path.write_text(
+            "club,topic,theme,slides,output\n"
+            "AI Club,Neural Networks,,12,\n"
+            "Math Club,Calculus,dark,,math.pptx\n"
+        )
+
+        jsonl_jobs = load_batch_manifest(str(jsonl_path), default_theme="nature", default_slides=8)
+        csv_jobs = load_batch_manifest(str(csv_path), default_theme="nature", default_slides=8)
+
+        assert jsonl_jobs == csv_jobs
+        assert jsonl_jobs[0].theme == "nature" and jsonl_jobs[0].slides == 12
+        assert jsonl_jobs[1].slides == 8 and jsonl_jobs[1].output == "math.pptx"
+
+    print("✅ Manifest loading test passed!")
+
+
+def test_run_batch_writes_results():
+    """Every job gets exactly one result line, and failures don't stop the batch"""
+    print("Testing batch run...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        user_dir = Path(temp_dir) / "clubs" / "user-a"
+        user_dir.mkdir(parents=True)
+        for club_id, club_name in [("club-1", "AI Club"), ("club-2", "Math Club")]:
+            with open(user_dir / f"{club_id}.json", 'w') as f:
+                json.dump({"clubId": club_id, "userId": "user-a", "clubName": club_name}, f)
+
+        manifest = Path(temp_dir) / "jobs.jsonl"
+        manifest.write_text("\n".join(json.dumps(job) for job in [
+            {"club": "AI Club", "topic": "Neural Networks"},
+            {"club": "Math Club", "topic": "Calculus"},
+            {"club": "Math Club", "topic": "How to fail"},
+            {"club": "Chess Club", "topic": "Openings"}
+        ]))
+        results_path = Path(temp_dir) / "results.jsonl"
+
+        generator = OfflineGenerator()
+        jobs = load_batch_manifest(str(manifest))
+        summary = run_batch(generator, jobs, str(results_path), workers=3,
+                            data_directory=str(Path(temp_dir) / "clubs"))
+
+        records = sorted((json.loads(line) for line in results_path.read_text().splitlines()),
+                         key=lambda r: r['job'])
+        assert summary['total_jobs'] == 4
+        assert summary['succeeded'] == 2 and summary['failed'] == 2
+        assert [r['success'] for r in records] == [True, True, False, False]
+        assert records[0]['result']['id'] == "deck-10"
+        assert "not found" in records[3]['error']
+        assert generator.calls == 3
+
+    print("✅ Batch run test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running batch generation tests...\n")
+
+    tests = [
+        test_load_manifest_formats,
+        test_run_batch_writes_results
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark suite
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from benchmark_suite import SCHEMA_VERSION, check_startup_budget, compare_results, parse_importtime, run_suite
+
+
+def results_with(metrics):
+    return {"schema_version": SCHEMA_VERSION, "metrics": metrics}
+
+
+def test_compare_flags_regressions():
+    """A metric regresses when it moves the wrong way by more than the threshold"""
+    print("Testing regression comparison...")
+
+    baseline = results_with({
+        "e2e_generate.p50_ms": {"value": 100.0, "unit": "ms", "better": "lower"},
+        "download.mb_per_s": {"value": 200.0, "unit": "MB/s", "better": "higher"},
+        "json_load.files_per_s": {"value": 1000.0, "unit": "files/s", "better": "higher"},
+        "startup.cache_hit_heavy_modules": {"value": 0.0, "unit": "modules", "better": "lower"},
+        "lookup.misses": {"value": 0.0, "unit": "count", "better": "lower"}
+    })
+    current = results_with({
+        "e2e_generate.p50_ms": {"value": 105.0, "unit": "ms", "better": "lower"},
+        "download.mb_per_s": {"value": 150.0, "unit": "MB/s", "better": "higher"},
+        "upload.mb_per_s": {"value": 50.0, "unit": "MB/s", "better": "higher"},
+        "startup.cache_hit_heavy_modules": {"value": 1.0, "unit": "modules", "better": "lower"},
+        "lookup.misses": {"value": 0.0, "unit": "count", "better": "lower"}
+    })
+    rows = {row["name"]: row for row in compare_results(baseline, current, threshold=0.1)}
+
+    assert abs(rows["e2e_generate.p50_ms"]["change"] + 0.05) < 1e-9 and not rows["e2e_generate.p50_ms"]["regressed"]
+    assert abs(rows["download.mb_per_s"]["change"] + 0.25) < 1e-9 and rows["download.mb_per_s"]["regressed"]
+    # A benchmark that vanished from the current run fails the comparison; a new one doesn't
+    assert rows["json_load.files_per_s"]["current"] is None
+    assert rows["json_load.files_per_s"]["missing"] and rows["json_load.files_per_s"]["regressed"]
+    assert rows["upload.mb_per_s"]["baseline"] is None and not rows["upload.mb_per_s"]["regressed"]
+    # A zero baseline has no relative change but still catches a move the wrong way
+    assert rows["startup.cache_hit_heavy_modules"]["change"] is None and rows["startup.cache_hit_heavy_modules"]["regressed"]
+    assert not rows["lookup.misses"]["regressed"]
+
+    try:
+        compare_results({"schema_version": 0, "metrics": {}}, current)
+        raise AssertionError("Should reject an unknown schema version")
+    except ValueError:
+        pass
+
+    print("✅ Regression comparison test passed!")
+
+
+def test_startup_budget():
+    """Top-level import times are read from -X importtime output and checked against the budget"""
+    print("Testing startup budget check...")
+
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        500 |   _io",
+        "import time:      1000 |      30000 | club_data",
+        "import time:      2000 |      90000 | requests",
+        "something else on stderr"
+    ])
+    assert parse_importtime(stderr) == {"club_data": 30000, "requests": 90000}
+
+    metrics = {
+        "startup.help_import_ms": {"value": 40.0, "unit": "ms", "better": "lower"},
+        "startup.cache_hit_import_ms": {"value": 120.0, "unit": "ms", "better": "lower"},
+        "startup.cache_hit_heavy_modules": {"value": 1, "unit": "modules", "better": "lower"}
+    }
+    problems = check_startup_budget(metrics, budget_ms=60)
+    assert len(problems) == 2 and "cache_hit_heavy_modules" in problems[0] and "cache_hit_import_ms" in problems[1]
+    assert check_startup_budget(metrics, budget_ms=200) == [problems[0]]
+
+    print("✅ Startup budget test passed!")
+
+
+def test_quick_run_and_compare_cli():
+    """A quick run covers every hot path and the compare command exits non-zero on a regression"""
+    print("Testing quick benchmark run...")
+
+    results = run_suite(sizes=(200,), quick=True, deck_mb=1)
+    assert results["schema_version"] == SCHEMA_VERSION
+    for name in ("club_lookup.200.index_build_s", "club_lookup.200.indexed_lookup_us", "club_lookup.200.scan_lookup_ms",
+                 "json_load.files_per_s", "prompt_build.ops_per_s", "prompt_build.batch_cached_ops_per_s", "e2e_generate.p50_ms",
+                 "club_bulk_load.snapshot_files_per_s", "download.mb_per_s", "download_parallel.mb_per_s",
+                 "startup.help_import_ms", "startup.cache_hit_wall_ms"):
+        assert results["metrics"][name]["value"] > 0, name
+    # Neither --help nor a cache hit may import requests, urllib3, boto3 or dotenv
+    assert results["metrics"]["startup.help_heavy_modules"]["value"] == 0
+    assert results["metrics"]["startup.cache_hit_heavy_modules"]["value"] == 0
+
+    slower = json.loads(json.dumps(results))
+    slower["metrics"]["prompt_build.ops_per_s"]["value"] /= 2
+    crashed = json.loads(json.dumps(results))
+    del crashed["metrics"]["download.mb_per_s"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for name, document in (("base.json", results), ("new.json", slower), ("crashed.json", crashed)):
+            paths.append(os.path.join(temp_dir, name))
+            with open(paths[-1], 'w') as f:
+                json.dump(document, f)
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_suite.py")
+        same = subprocess.run([sys.executable, script, "compare", paths[0], paths[0]], capture_output=True, text=True)
+        worse = subprocess.run([sys.executable, script, "compare", paths[0], paths[1]], capture_output=True, text=True)
+        lost = subprocess.run([sys.executable, script, "compare", paths[0], paths[2]], capture_output=True, text=True)
+    assert same.returncode == 0, same.stdout + same.stderr
+    assert worse.returncode == 1 and "prompt_build.ops_per_s" in worse.stdout
+    assert lost.returncode == 1 and "1 baseline metric(s) missing" in lost.stdout
+
+    print("✅ Quick benchmark run test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running benchmark suite tests...\n")
+
+    tests = [
+        test_compare_flags_regressions,
+        test_startup_budget,
+        test_quick_run_and_compare_cli
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
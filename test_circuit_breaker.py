@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tests for the SlidesGPT circuit breaker and hedged downloads
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from presentation_cache import PresentationCache
+from presentation_download import HedgePolicy
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from slidesgpt_transport import SlidesGPTTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_state_machine():
+    """Consecutive failures open the breaker, and one trial call decides whether it closes again"""
+    print("Testing circuit breaker states...")
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    breaker.before_call()
+    assert not breaker.record_failure() and not breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure() and not breaker.record_failure() and breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 4
+    try:
+        breaker.before_call()
+        raise AssertionError("Expected CircuitOpenError")
+    except CircuitOpenError as e:
+        assert e.retry_after == 6
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    try:
+        breaker.before_call()
+        raise AssertionError("Only one trial call is allowed while half open")
+    except CircuitOpenError:
+        pass
+    assert breaker.record_failure() and breaker.state == OPEN
+
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats() == {"state": CLOSED, "consecutive_failures": 0, "times_opened": 2, "rejected": 2}
+
+    print("✅ Circuit breaker state test passed!")
+
+
+def test_open_circuit_fails_fast_and_serves_stale_cache():
+    """After repeated 500s generation stops calling SlidesGPT and an expired cached deck is served instead"""
+    print("Testing fail-fast generation...")
+
+    with FakeSlidesGPTServer(FakeServerConfig(error_rate=1.0)) as fake, tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        (data_dir / "user-a").mkdir(parents=True)
+        with open(data_dir / "user-a" / "AI_Club_club-breaker.json", 'w') as f:
+            json.dump({"clubId": "club-breaker", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        cache = PresentationCache(os.path.join(temp_dir, "cache"), ttl_seconds=3600)
+        transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+                                       retry_policy=RetryPolicy(max_retries=0))
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=transport, base_url=fake.base_url,
+                                                 cache=cache, circuit_breaker=CircuitBreaker(2, reset_timeout=60))
+
+        for _ in range(2):
+            try:
+                generator.generate_club_presentation("AI Club", "Uncached", data_directory=str(data_dir))
+                raise AssertionError("Expected an upstream error")
+            except CircuitOpenError:
+                raise AssertionError("The breaker opened too early")
+            except Exception as e:
+                assert "500" in str(e)
+        assert fake.stats()["/generate"] == {"500": 2}
+
+        started = time.monotonic()
+        try:
+            generator.generate_club_presentation("AI Club", "Uncached", data_directory=str(data_dir))
+            raise AssertionError("Expected CircuitOpenError")
+        except CircuitOpenError as e:
+            assert e.retry_after > 0
+        assert time.monotonic() - started < 1 and fake.stats()["/generate"] == {"500": 2}
+
+        # An expired entry is a miss normally, but is served while the circuit is open
+        club = generator.load_club_data_from_file(generator.find_club_file("AI Club", str(data_dir)))
+        key = PresentationCache.make_key(generator.create_presentation_prompt(club, "Cached"), "modern", 10)
+        deck = os.path.join(temp_dir, "old.pptx")
+        with open(deck, 'wb') as f:
+            f.write(b"old deck")
+        cache.put(key, {"presentation_id": "old-deck"}, deck)
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+
+        output = os.path.join(temp_dir, "served.pptx")
+        result = generator.generate_club_presentation("AI Club", "Cached", output_path=output, data_directory=str(data_dir))
+        assert result["presentation_id"] == "old-deck" and result["stale"] and result["downloaded_to"] == output
+        with open(output, 'rb') as f:
+            assert f.read() == b"old deck"
+        assert cache.stats()["stale_hits"] == 1 and fake.stats()["/generate"] == {"500": 2}
+        assert generator.circuit_breaker.stats()["rejected"] == 2
+
+    print("✅ Fail-fast generation test passed!")
+
+
+class BrokenOnceTransport(SlidesGPTTransport):
+    """The first generate call fails with an error the generator doesn't expect"""
+
+    def __init__(self):
+        super().__init__(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000))
+        self.failed = False
+
+    def post(self, url, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("payload could not be encoded")
+        return super().post(url, **kwargs)
+
+
+def test_unexpected_error_releases_trial_call():
+    """An unexpected exception during the half-open trial counts as a failure instead of holding the slot"""
+    print("Testing half-open trial on unexpected errors...")
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    with FakeSlidesGPTServer(FakeServerConfig()) as fake:
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=BrokenOnceTransport(),
+                                                 base_url=fake.base_url, circuit_breaker=breaker)
+        try:
+            generator.generate_presentation("Trial")
+            raise AssertionError("Expected RuntimeError")
+        except RuntimeError:
+            pass
+        assert breaker.state == OPEN and breaker.stats()["times_opened"] == 2
+
+        clock.now = 20
+        assert generator.generate_presentation("Trial")["presentation_id"]
+        assert breaker.state == CLOSED
+
+    print("✅ Half-open trial release test passed!")
+
+
+class SlowFirstDownload(SlidesGPTTransport):
+    """The first download request stalls, as if it hit a slow upstream instance"""
+
+    def __init__(self):
+        super().__init__(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000))
+        self.downloads = 0
+
+    def get(self, url, **kwargs):
+        self.downloads += 1
+        if self.downloads == 1:
+            time.sleep(1)
+        return super().get(url, **kwargs)
+
+
+def test_hedged_download():
+    """A download slower than the hedge delay is sent again and the faster copy is used"""
+    print("Testing hedged downloads...")
+
+    policy = HedgePolicy(min_samples=4, min_delay=0.01)
+    assert policy.hedge_delay() is None
+    for seconds in (0.02, 0.03, 0.5, 0.04):
+        policy.observe(seconds)
+    assert policy.hedge_delay() == 0.5
+    assert HedgePolicy(delay=0.2).hedge_delay() == 0.2
+
+    with FakeSlidesGPTServer(FakeServerConfig(deck_size=64 * 1024)) as fake, tempfile.TemporaryDirectory() as temp_dir:
+        transport = SlowFirstDownload()
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=transport, base_url=fake.base_url,
+                                                 hedge_policy=HedgePolicy(delay=0.1))
+        output = os.path.join(temp_dir, "deck.pptx")
+        started = time.monotonic()
+        result = generator.download_presentation("deck-1", output)
+        assert time.monotonic() - started < 0.9
+        assert result.hedged == "hedge" and os.path.getsize(output) == 64 * 1024
+
+        result = generator.download_presentation("deck-1", output)
+        assert result.hedged is None
+        assert generator.hedge_policy.stats()["hedged"] == 1 and generator.hedge_policy.stats()["hedge_wins"] == 1
+
+    print("✅ Hedged download test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running circuit breaker tests...\n")
+
+    tests = [
+        test_breaker_state_machine,
+        test_open_circuit_fails_fast_and_serves_stale_cache,
+        test_unexpected_error_releases_trial_call,
+        test_hedged_download
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
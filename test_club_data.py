@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared ClubData model and its decoders
+"""
+
+import json
+import os
+import tempfile
+from benchmark_suite import bench_club_model, build_synthetic_store
+from club_data import DECODERS, ClubData, decode_club, load_club_files
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from slidesgpt_generator import SlidesGPTGenerator
+
+CLUB = {
+    "clubId": "club-1",
+    "userId": "user-1",
+    "userName": "Ada",
+    "userRole": "President",
+    "clubName": "AI Club",
+    "description": "Neural nets and snacks",
+    "mission": "Learn",
+    "goals": "Build",
+    "createdAt": "2024-01-15T10:30:00Z",
+    "updatedAt": "2024-01-15T10:30:00Z",
+    "extraField": {"ignored": True}
+}
+
+
+def test_decoders_agree_and_validate():
+    """Every available backend decodes to the same slotted ClubData and rejects malformed documents"""
+    print(f"Testing decoders ({', '.join(DECODERS)})...")
+
+    raw = json.dumps(CLUB).encode()
+    lenient = json.dumps({"clubName": "Chess", "clubId": 7, "goals": None}).encode()
+    for backend in DECODERS:
+        club = decode_club(raw, backend)
+        assert club == ClubData(**{k: v for k, v in CLUB.items() if k != "extraField"})
+        assert (club.name, club.user_role, club.user_name) == ("AI Club", "President", "Ada")
+        assert decode_club(lenient, backend) == ClubData(clubName="Chess", clubId="7")
+        for bad in (b'{"clubName": ', b'[1, 2]', b'{"mission": ["a"]}', b'\xff'):
+            try:
+                decode_club(bad, backend)
+                raise AssertionError(f"{backend} accepted {bad!r}")
+            except ValueError:
+                pass
+
+    assert not hasattr(club, "__dict__")
+
+    # The original slidesgpt_generator keywords still construct a club
+    legacy = ClubData(name="AI Club", description="Robots", mission="Learn", goals="Build",
+                      user_role="President", user_name="Ada")
+    assert legacy == ClubData(clubName="AI Club", description="Robots", mission="Learn", goals="Build",
+                              userRole="President", userName="Ada")
+    assert (legacy.name, legacy.user_role, legacy.user_name) == ("AI Club", "President", "Ada")
+
+    print("✅ Decoder test passed!")
+
+
+def test_generators_share_the_model():
+    """Both generators load the shared ClubData; bulk loading can skip malformed files"""
+    print("Testing shared model in generators...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        good = os.path.join(temp_dir, "club.json")
+        bad = os.path.join(temp_dir, "broken.json")
+        with open(good, 'w') as f:
+            json.dump(CLUB, f)
+        with open(bad, 'w') as f:
+            f.write("{not json")
+
+        production = ProductionSlidesGPTGenerator(api_key="test-key").load_club_data_from_file(good)
+        legacy = SlidesGPTGenerator("test-key").load_club_data_from_json(good)
+        assert type(production) is type(legacy) is ClubData and production == legacy
+
+        prompt = SlidesGPTGenerator("test-key").create_club_prompt(legacy, "Transformers")
+        assert prompt.startswith("Create a professional presentation for AI Club about: Transformers")
+        assert "- User Role: President\n- User Name: Ada" in prompt
+
+        try:
+            ProductionSlidesGPTGenerator(api_key="test-key").load_club_data_from_file(bad)
+            raise AssertionError("Should have rejected malformed JSON")
+        except ValueError as e:
+            assert "Invalid JSON format" in str(e)
+
+        assert load_club_files([good, bad, good], skip_invalid=True) == [production, production]
+
+    print("✅ Shared model test passed!")
+
+
+def test_slotted_model_is_smaller():
+    """The club_model benchmark shows the slotted model using less memory per instance"""
+    print("Testing club model benchmark...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        build_synthetic_store(temp_dir, 300)
+        results = bench_club_model(temp_dir, files=300)
+
+    assert results["club_model.slotted_bytes_per_instance"]["value"] < results["club_model.dict_bytes_per_instance"]["value"]
+    for backend in DECODERS:
+        assert results[f"club_decode.{backend}_files_per_s"]["value"] > 0
+
+    print("✅ Club model benchmark test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running club data tests...\n")
+
+    tests = [
+        test_decoders_agree_and_validate,
+        test_generators_share_the_model,
+        test_slotted_model_is_smaller
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
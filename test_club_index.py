@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent club index
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from club_index import ClubIndex
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write_club(user_dir: Path, club_name: str, club_id: str, user_id: str = "test-user-456") -> Path:
+    user_dir.mkdir(parents=True, exist_ok=True)
+    club_file = user_dir / f"{club_name.replace(' ', '_')}_{club_id}.json"
+    with open(club_file, 'w') as f:
+        json.dump({"clubId": club_id, "userId": user_id, "clubName": club_name}, f)
+    return club_file
+
+
+def bump_mtime(path: Path):
+    """Move mtime forward so changes are visible on coarse-grained filesystems"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def test_index_lookup_and_persistence():
+    """Lookups by name, id and user work and survive a reload"""
+    print("Testing index lookup and persistence...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        ai_file = write_club(data_dir / "user-a", "AI Club", "club-1", "user-a")
+        write_club(data_dir / "user-b", "Math Club", "club-2", "user-b")
+        (data_dir / "user-b" / "broken.json").write_text("not json")
+
+        index = ClubIndex.open(str(data_dir))
+        assert index.find_club("AI Club") == str(ai_file)
+        assert index.find_club_by_id("club-2").endswith("Math_Club_club-2.json")
+        assert index.clubs_for_user("user-a") == [str(ai_file)]
+        assert index.find_club("Chess Club") is None
+        assert index.stats()["invalid_files"] == 1
+
+        reloaded = ClubIndex(str(data_dir))
+        assert reloaded.load()
+        assert reloaded.find_club("AI Club") == str(ai_file)
+
+    print("✅ Index lookup and persistence test passed!")
+
+
+def test_index_detects_stale_entries():
+    """Renamed, deleted and rewritten files are never served from the index"""
+    print("Testing stale entry detection...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        ai_file = write_club(data_dir / "user-a", "AI Club", "club-1")
+        math_file = write_club(data_dir / "user-a", "Math Club", "club-2")
+
+        clock = FakeClock()
+        index = ClubIndex(str(data_dir), miss_refresh_interval=10, clock=clock)
+        index.rebuild()
+        assert index.find_club("AI Club") == str(ai_file)
+
+        # Rename
+        renamed = ai_file.with_name("AI_Club_renamed.json")
+        os.rename(ai_file, renamed)
+        bump_mtime(renamed.parent)
+        assert index.find_club("AI Club") == str(renamed)
+
+        # Delete
+        os.unlink(renamed)
+        bump_mtime(renamed.parent)
+        assert index.find_club("AI Club") is None
+
+        # In-place rewrite that changes the club name
+        with open(math_file, 'w') as f:
+            json.dump({"clubId": "club-2", "userId": "test-user-456", "clubName": "Calculus Club"}, f)
+        bump_mtime(math_file)
+        # The miss above already re-stat'ed every file, so the next sweep waits for the interval
+        assert index.find_club("Calculus Club") is None
+        clock.now = 10
+        assert index.find_club("Calculus Club") == str(math_file)
+        assert index.find_club("Math Club") is None
+
+    print("✅ Stale entry detection test passed!")
+
+
+def test_misses_rate_limit_deep_refresh():
+    """Repeated lookups of unknown clubs don't re-stat every file each time"""
+    print("Testing miss refresh rate limit...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        for i in range(5):
+            write_club(data_dir / f"user-{i}", f"Club {i}", f"club-{i}")
+
+        clock = FakeClock()
+        index = ClubIndex(str(data_dir), miss_refresh_interval=10, clock=clock)
+        index.rebuild()
+        deep_refreshes = []
+        refresh = index.refresh
+        index.refresh = lambda deep=False: deep_refreshes.append(deep) or refresh(deep=deep)
+
+        for _ in range(20):
+            assert index.find_club("Chess Club") is None
+        assert deep_refreshes.count(True) == 1
+        clock.now = 10
+        assert index.find_club("Chess Club") is None
+        assert deep_refreshes.count(True) == 2
+
+        # A stale hit still re-stats straight away
+        club_file = data_dir / "user-0" / "Club_0_club-0.json"
+        with open(club_file, 'w') as f:
+            json.dump({"clubId": "club-0", "userId": "test-user-456", "clubName": "Club 0", "x": 1}, f)
+        bump_mtime(club_file)
+        assert index.find_club("Club 0") == str(club_file)
+        assert deep_refreshes.count(True) == 3
+
+    print("✅ Miss refresh rate limit test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running club index tests...\n")
+
+    tests = [
+        test_index_lookup_and_persistence,
+        test_index_detects_stale_entries,
+        test_misses_rate_limit_deep_refresh
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk club loader
+"""
+
+import json
+import os
+import tempfile
+from benchmark_suite import build_synthetic_store
+from club_data import ClubData
+from club_loader import ClubBulkLoader, snapshot_ranges, write_snapshot
+from club_store import PackedClubStore
+
+
+def add_malformed_files(store):
+    user_dir = os.path.join(store, sorted(os.listdir(store))[0])
+    for name, content in (("broken.json", b'{"clubName": '), ("list.json", b"[1, 2]"), ("empty.json", b"")):
+        with open(os.path.join(user_dir, name), 'wb') as f:
+            f.write(content)
+
+
+def test_tree_loading_skips_malformed_files():
+    """In-process and process-pool loading yield the same clubs in the same order, skipping bad files"""
+    print("Testing bulk loading from the club tree...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = os.path.join(temp_dir, "clubs")
+        build_synthetic_store(store, 300)
+        add_malformed_files(store)
+
+        serial = ClubBulkLoader(store, workers=1, chunk_files=32)
+        serial_clubs = list(serial)
+        assert (serial.loaded, serial.skipped) == (300, 3)
+        assert all(isinstance(club, ClubData) and club.clubName for club in serial_clubs)
+
+        pooled = ClubBulkLoader(store, workers=2, chunk_files=32, max_pending=2)
+        assert list(pooled) == serial_clubs
+        assert (pooled.loaded, pooled.skipped) == (300, 3)
+
+        try:
+            list(ClubBulkLoader(os.path.join(temp_dir, "missing"), workers=1))
+            raise AssertionError("Expected FileNotFoundError")
+        except FileNotFoundError:
+            pass
+
+    print("✅ Tree loading test passed!")
+
+
+def test_snapshot_loading():
+    """NDJSON snapshots split on line boundaries and packed stores load their live clubs"""
+    print("Testing bulk loading from snapshots...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = os.path.join(temp_dir, "clubs")
+        build_synthetic_store(store, 200)
+        add_malformed_files(store)
+        expected = list(ClubBulkLoader(store, workers=1))
+
+        snapshot = os.path.join(temp_dir, "clubs.ndjson")
+        assert write_snapshot(store, snapshot) == 200
+        with open(snapshot, 'ab') as f:
+            f.write(b'{"clubName": \n')
+
+        ranges = list(snapshot_ranges(snapshot, chunk_bytes=1000))
+        assert len(ranges) > 10 and ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(snapshot)
+        assert all(previous[1] == current[0] for previous, current in zip(ranges, ranges[1:]))
+
+        for workers in (1, 2):
+            loader = ClubBulkLoader(snapshot, workers=workers, chunk_bytes=1000)
+            assert list(loader) == expected
+            assert loader.skipped == 1
+
+        # A compacted packed store has one line per live club, so it loads like a snapshot
+        pack = os.path.join(temp_dir, "clubs.pack")
+        with PackedClubStore(pack) as packed:
+            for club in expected:
+                packed.put(club)
+            packed.put(expected[1])
+            packed.delete(expected[0].clubId)
+            packed.compact()
+        assert list(ClubBulkLoader(pack, workers=1)) == expected[2:] + [expected[1]]
+
+        # An uncompacted pack keeps old versions and tombstones; only the last record per club counts
+        live_pack = os.path.join(temp_dir, "live.pack")
+        renamed = ClubData(**{**expected[3].to_dict(), "clubName": "Renamed Club"})
+        with PackedClubStore(live_pack) as packed:
+            for club in expected[:10]:
+                packed.put(club)
+            packed.delete(expected[0].clubId)
+            packed.delete(expected[2].clubId)
+            packed.put(renamed)
+            packed.put(expected[2])
+        for workers in (1, 2):
+            loader = ClubBulkLoader(live_pack, workers=workers, chunk_bytes=300)
+            clubs = list(loader)
+            assert clubs == [expected[1]] + expected[4:10] + [renamed, expected[2]]
+            assert (loader.loaded, loader.skipped) == (9, 0)
+
+    print("✅ Snapshot loading test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running bulk loader tests...\n")
+
+    tests = [
+        test_tree_loading_skips_malformed_files,
+        test_snapshot_loading
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite and packed club stores
+"""
+
+import json
+import os
+import tempfile
+import club_store
+from club_data import ClubData, decode_club
+from club_store import ClubStore, PackedClubStore, SQLiteClubStore, export_tree, import_tree, open_club_store
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+
+
+def write_club_tree(data_dir):
+    """Three clubs for two users, plus a malformed file"""
+    clubs = [
+        {"clubId": "c1", "userId": "u1", "userName": "Ada", "userRole": "President", "clubName": "AI Club",
+         "description": "Neural nets", "mission": "Learn", "goals": "Build", "extra": {"kept": True}},
+        {"clubId": "c2", "userId": "u1", "userName": "Ada", "userRole": "President", "clubName": "Chess Club"},
+        {"clubId": "c3", "userId": "u2", "userName": "Bo", "userRole": "Member", "clubName": "AI Club"}
+    ]
+    for club in clubs:
+        user_dir = os.path.join(data_dir, club["userId"])
+        os.makedirs(user_dir, exist_ok=True)
+        with open(os.path.join(user_dir, f"{club['clubName'].replace(' ', '_')}_{club['clubId']}.json"), 'w') as f:
+            json.dump(club, f, indent=2)
+    with open(os.path.join(data_dir, "u2", "broken.json"), 'w') as f:
+        f.write('{"clubName": ')
+    return clubs
+
+
+def test_backends_find_and_load():
+    """Both backends import the tree, answer indexed lookups and export it back unchanged"""
+    print("Testing SQLite and packed stores...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = os.path.join(temp_dir, "clubs")
+        clubs = write_club_tree(data_dir)
+
+        for store_name, backend in (("clubs.db", SQLiteClubStore), ("clubs.pack", PackedClubStore)):
+            store_path = os.path.join(temp_dir, store_name)
+            with open_club_store(store_path, create=True) as store:
+                assert isinstance(store, backend)
+                assert import_tree(store, data_dir) == {"imported": 3, "skipped": 1}
+                assert store.count() == 3
+
+                assert store.load(store.find_club("AI Club")).clubId == "c1"
+                assert store.load(store.find_club("AI Club", user_id="u2")).userName == "Bo"
+                assert store.find_club("Drama Club") is None
+                assert store.load(store.find_club_by_id("c2")).clubName == "Chess Club"
+                assert [store.club_id_from(loc) for loc in store.clubs_for_user("u1")] == ["c1", "c2"]
+                assert sorted(club.clubId for club in store.load_all()) == ["c1", "c2", "c3"]
+                # SQLite reads the table in batches; a batch smaller than the table gives the same clubs
+                club_store.ITER_BATCH_SIZE, batch_size = 2, club_store.ITER_BATCH_SIZE
+                try:
+                    assert sorted(decode_club(raw).clubId for raw in store.iter_raw()) == ["c1", "c2", "c3"]
+                finally:
+                    club_store.ITER_BATCH_SIZE = batch_size
+
+                # Upsert and delete go through the same indexes
+                store.put(ClubData(clubId="c2", userId="u1", clubName="Go Club"))
+                assert store.find_club("Chess Club") is None
+                assert store.load(store.find_club("Go Club")).clubId == "c2"
+                assert store.delete("c3") and not store.delete("c3")
+                assert store.find_club("AI Club", user_id="u2") is None
+                assert store.count() == 2
+
+                export_dir = os.path.join(temp_dir, f"export-{store.scheme}")
+                assert export_tree(store, export_dir) == 2
+                with open(os.path.join(export_dir, "u1", "AI_Club_c1.json")) as f:
+                    assert json.load(f) == clubs[0]
+
+            # Reopening reads the saved index (packed) or table (SQLite)
+            with open_club_store(store_path) as store:
+                assert store.count() == 2
+                assert store.load(store.find_club("Go Club")).clubName == "Go Club"
+
+    print("✅ Store backends test passed!")
+
+
+def test_packed_store_recovers_and_compacts():
+    """A stale index is rebuilt from the pack and compaction drops dead records"""
+    print("Testing packed store recovery and compaction...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pack_path = os.path.join(temp_dir, "clubs.pack")
+        with PackedClubStore(pack_path) as store:
+            for i in range(5):
+                store.put(ClubData(clubId=f"c{i}", userId="u1", clubName=f"Club {i}"))
+            store.put(ClubData(clubId="c0", userId="u1", clubName="Renamed"))
+            store.delete("c1")
+
+        # Another writer appends after the index was saved (including lines that aren't valid clubs),
+        # then a torn line from a crash
+        with open(pack_path, 'ab') as f:
+            f.write(b'{"clubId": "c7", "clubName": \n')
+            f.write(json.dumps({"clubId": "c8", "userId": "u2", "clubName": {"nested": True}}).encode() + b"\n")
+            f.write(json.dumps({"clubId": "c9", "userId": "u2", "clubName": "Late"}).encode() + b"\n")
+            f.write(b'{"clubId": "c10", "clubNa')
+
+        with PackedClubStore(pack_path) as store:
+            assert store.count() == 5 and store.find_club_by_id("c8") is None
+            assert store.load(store.find_club("Late")).userId == "u2"
+            assert store.find_club("Club 0") is None and store.find_club("Club 1") is None
+            store.put(ClubData(clubId="c10", userId="u2", clubName="After Crash"))
+            assert store.load(store.find_club("After Crash")).clubId == "c10"
+            store.delete("c10")
+
+            size_before = os.path.getsize(pack_path)
+            assert store.compact() > 0
+            assert os.path.getsize(pack_path) < size_before
+            assert sorted(club.clubId for club in store.load_all()) == ["c0", "c2", "c3", "c4", "c9"]
+            assert store.load(store.find_club("Renamed")).clubId == "c0"
+
+    print("✅ Packed store recovery test passed!")
+
+
+def test_generator_reads_from_store():
+    """The generator resolves clubs through the store without touching a data directory"""
+    print("Testing generator with a club store...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = os.path.join(temp_dir, "clubs")
+        write_club_tree(data_dir)
+        with open_club_store(os.path.join(temp_dir, "clubs.db"), create=True) as store:
+            import_tree(store, data_dir)
+            generator = ProductionSlidesGPTGenerator("test-key", club_store=store)
+
+            locator = generator.find_club_file("Chess Club", data_directory=os.path.join(temp_dir, "missing"))
+            club = generator.load_club_data_from_file(locator)
+            assert (club.clubName, club.userName) == ("Chess Club", "Ada")
+            assert "Chess Club" in generator.create_presentation_prompt(club, "Openings")
+
+            try:
+                generator.find_club_file("Drama Club")
+                raise AssertionError("Expected FileNotFoundError")
+            except FileNotFoundError:
+                pass
+
+    print("✅ Generator store test passed!")
+
+
+def test_missing_store_is_not_created():
+    """Opening a missing store for reading raises instead of creating an empty one"""
+    print("Testing missing store paths...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for store_name in ("typo.db", "typo.pack"):
+            store_path = os.path.join(temp_dir, store_name)
+            try:
+                open_club_store(store_path)
+                raise AssertionError("Expected FileNotFoundError")
+            except FileNotFoundError:
+                pass
+            assert not os.path.exists(store_path)
+
+    try:
+        ClubStore("unused")
+        raise AssertionError("Expected TypeError")
+    except TypeError:
+        pass
+
+    print("✅ Missing store test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running club store tests...\n")
+
+    tests = [
+        test_backends_find_and_load,
+        test_packed_store_recovers_and_compacts,
+        test_generator_reads_from_store,
+        test_missing_store_is_not_created
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the watcher-driven club index
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stderr
+from pathlib import Path
+from club_watcher import IN_Q_OVERFLOW, ClubWatcher, Inotify, InotifyUnavailable
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from test_club_index import write_club
+
+
+def inotify_available() -> bool:
+    try:
+        Inotify().close()
+        return True
+    except InotifyUnavailable:
+        return False
+
+
+def exercise_watcher(backend: str):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        write_club(data_dir / "user-a", "AI Club", "club-1", "user-a")
+
+        with ClubWatcher(str(data_dir), backend=backend, poll_interval=0.05) as watcher:
+            assert watcher.backend == backend
+            refreshes = []
+            original_refresh = watcher.index.refresh
+            watcher.index.refresh = lambda deep=False: refreshes.append(deep) or original_refresh(deep)
+
+            # New file, then an atomic rename-into-place rewrite that changes the name
+            chess = write_club(data_dir / "user-a", "Chess Club", "club-2", "user-a")
+            assert watcher.find_club("Chess Club") == str(chess)
+            tmp_file = data_dir / "user-a" / "chess.tmp"
+            tmp_file.write_text(json.dumps({"clubId": "club-2", "userId": "user-a", "clubName": "Go Club"}))
+            os.replace(tmp_file, chess)
+            assert watcher.find_club("Chess Club") is None
+            assert watcher.find_club("Go Club") == str(chess)
+
+            # In-place rewrite, delete, and a brand new user directory
+            ai_file = data_dir / "user-a" / "AI_Club_club-1.json"
+            ai_file.write_text(json.dumps({"clubId": "club-1", "userId": "user-a", "clubName": "ML Club"}))
+            if backend == "poll":
+                # Only a deep refresh sees an in-place rename, and misses rate-limit those
+                watcher.sync()
+            assert watcher.find_club("ML Club") == str(ai_file)
+            os.unlink(chess)
+            assert watcher.find_club_by_id("club-2") is None
+            drama = write_club(data_dir / "user-b", "Drama Club", "club-3", "user-b")
+            assert watcher.find_club("Drama Club", user_id="user-b") == str(drama)
+            assert watcher.clubs_for_user("user-b") == [str(drama)]
+            shutil.rmtree(data_dir / "user-b")
+            assert watcher.find_club("Drama Club") is None
+
+            if backend == "inotify":
+                # Every change arrived as an event; lookups never fell back to rescanning
+                assert refreshes == [] and watcher.events_applied >= 6
+                # A user directory created while the queue overflowed gets its watch on recovery
+                with watcher._lock:
+                    late = write_club(data_dir / "user-c", "Late Club", "club-4", "user-c")
+                    watcher._inotify.read_events()
+                    watcher._apply(0, IN_Q_OVERFLOW, "")
+                assert refreshes == [True] and watcher.overflows == 1
+                assert "user-c" in watcher._watches.values()
+                assert watcher.find_club("Late Club") == str(late)
+                later = write_club(data_dir / "user-c", "Later Club", "club-5", "user-c")
+                assert watcher.find_club("Later Club") == str(later)
+                shutil.rmtree(data_dir / "user-c")
+                assert watcher.find_club("Late Club") is None
+                assert refreshes == [True]
+
+        # stop() persists the index for the next process
+        reopened = ClubWatcher(str(data_dir), backend="poll")
+        assert reopened.index.find_club("ML Club") == str(ai_file)
+        assert reopened.index.stats()["clubs"] == 1
+
+
+def test_inotify_watcher():
+    """inotify events keep the index current without rescans"""
+    print("Testing inotify watcher...")
+
+    if not inotify_available():
+        print("⏭️  inotify not available, skipping")
+        return
+    exercise_watcher("inotify")
+
+    print("✅ inotify watcher test passed!")
+
+
+def test_inotify_errors_do_not_leave_a_stale_index():
+    """A failed event falls back to a deep refresh, and a dead watcher thread falls back to polling"""
+    print("Testing inotify error handling...")
+
+    if not inotify_available():
+        print("⏭️  inotify not available, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        write_club(data_dir / "user-a", "AI Club", "club-1", "user-a")
+
+        with ClubWatcher(str(data_dir), backend="inotify", poll_interval=0.05) as watcher:
+            # The event's own update fails (as if the file were unreadable for a moment)
+            original_update = watcher.index.update_file
+            failures = []
+
+            def failing_update(rel_path):
+                if not failures:
+                    failures.append(rel_path)
+                    raise PermissionError(13, "Permission denied", rel_path)
+                return original_update(rel_path)
+
+            watcher.index.update_file = failing_update
+            with watcher._lock:
+                chess = write_club(data_dir / "user-a", "Chess Club", "club-2", "user-a")
+                drama = write_club(data_dir / "user-a", "Drama Club", "club-3", "user-a")
+            assert watcher.find_club("Chess Club") == str(chess)
+            assert watcher.find_club("Drama Club") == str(drama)
+            assert failures and watcher.stats()["errors"] >= 1 and watcher.backend == "inotify"
+            watcher.index.update_file = original_update
+
+            # Anything else kills the event loop; the watcher then polls and the index stops trusting itself
+            def broken_apply(*event):
+                raise RuntimeError("unexpected event")
+
+            watcher._apply = broken_apply
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                write_club(data_dir / "user-a", "Go Club", "club-4", "user-a")
+                deadline = time.monotonic() + 5
+                while watcher.backend != "poll" and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            assert watcher.backend == "poll" and not watcher.index.live
+            assert "falling back to polling" in stderr.getvalue()
+            late = write_club(data_dir / "user-b", "Late Club", "club-5", "user-b")
+            assert watcher.find_club("Late Club") == str(late)
+
+    print("✅ inotify error handling test passed!")
+
+
+def test_polling_watcher_and_generator():
+    """The polling fallback serves the same answers, and the generator can use a watcher"""
+    print("Testing polling watcher...")
+
+    exercise_watcher("poll")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        write_club(data_dir / "user-a", "AI Club", "club-1", "user-a")
+        generator = ProductionSlidesGPTGenerator("test-key", watch_clubs=True)
+        assert generator.load_club_data_from_file(generator.find_club_file("AI Club", str(data_dir))).clubId == "club-1"
+        chess = write_club(data_dir / "user-a", "Chess Club", "club-2", "user-a")
+        assert generator.find_club_file("Chess Club", str(data_dir)) == str(chess)
+        watcher = generator._club_indexes[str(data_dir)]
+        assert isinstance(watcher, ClubWatcher)
+        watcher.stop()
+
+    print("✅ Polling watcher test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running club watcher tests...\n")
+
+    tests = [
+        test_inotify_watcher,
+        test_inotify_errors_do_not_leave_a_stale_index,
+        test_polling_watcher_and_generator
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
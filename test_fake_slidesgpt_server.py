@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fake SlidesGPT server
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import socket
+import struct
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer, parse_latency, parse_size
+from load_test import LoadTestConfig
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from slidesgpt_transport import SlidesGPTTransport
+from test_slidesgpt_api import SlidesGPTAPITester
+
+
+def fast_transport(max_retries=5):
+    return SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+                              retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0.001))
+
+
+def test_latency_specs():
+    """Latency specs parse into samplers and sizes accept units"""
+    print("Testing latency and size specs...")
+
+    rng = random.Random(1)
+    assert parse_latency("0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
+    assert parse_latency("lognormal:0.5,0.3")(rng) > 0
+    assert parse_size("512KB") == 512 * 1024 and parse_size("2MB") == 2 * 1024 * 1024
+    for bad in ("gamma:1", "uniform:1", "fast"):
+        try:
+            parse_latency(bad)
+            raise AssertionError(f"{bad} should not parse")
+        except ValueError:
+            pass
+
+    print("✅ Latency and size spec test passed!")
+
+
+def test_generate_and_download_end_to_end():
+    """The production generator generates and downloads a real zip from the fake server, in parallel ranges too"""
+    print("Testing end-to-end generation against the fake server...")
+
+    with FakeSlidesGPTServer(FakeServerConfig(deck_size=parse_size("3MB"))) as server, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        user_dir = Path(temp_dir) / "clubs" / "user-a"
+        user_dir.mkdir(parents=True)
+        with open(user_dir / "AI_Club_club-1.json", 'w') as f:
+            json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=fast_transport(), base_url=server.base_url)
+        output_path = os.path.join(temp_dir, "deck.pptx")
+        result = generator.generate_club_presentation("AI Club", "Neural Networks", output_path=output_path,
+                                                      data_directory=str(Path(temp_dir) / "clubs"))
+
+        assert result["presentation_id"] == "fake-1"
+        assert abs(os.path.getsize(output_path) - parse_size("3MB")) < 1024
+        assert zipfile.ZipFile(output_path).namelist() == ["[Content_Types].xml", "ppt/media/padding.bin"]
+
+        ranged_path = os.path.join(temp_dir, "ranged.pptx")
+        download = generator.download_presentation("fake-1", ranged_path, parts=3)
+        assert download.sha256 == result["sha256"]
+        assert server.stats()["/download"] == {"200": 1, "206": 4}
+
+    print("✅ End-to-end test passed!")
+
+
+def test_injected_throttling_is_retried():
+    """Injected 429s carry Retry-After and are retried by the transport; the load test sees them without retries"""
+    print("Testing injected throttling...")
+
+    config = FakeServerConfig(throttle_rate=0.5, retry_after=0, seed=7)
+    with FakeSlidesGPTServer(config) as server:
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=fast_transport(max_retries=50),
+                                                 base_url=server.base_url)
+        for _ in range(5):
+            assert generator.generate_presentation("prompt")["presentation_id"].startswith("fake-")
+        stats = server.stats()["/generate"]
+        assert stats["200"] == 5 and stats["429"] > 0
+
+        tester = SlidesGPTAPITester("test-key-12345", transport=fast_transport(max_retries=0), base_url=server.base_url)
+        report = tester.run_load_test(LoadTestConfig(rate=100, duration=0.4, concurrency=4), save=False)
+        assert report["sent"] == 40
+        assert report["succeeded"] + report["errors"]["HTTP 429"] == 40
+        assert report["succeeded"] == server.stats()["/v1/presentations/generate"]["200"]
+
+    print("✅ Injected throttling test passed!")
+
+
+def test_bad_ranges_and_client_resets():
+    """Backwards ranges get a 416, and clients hanging up mid-download don't print tracebacks"""
+    print("Testing bad ranges and client resets...")
+
+    config = FakeServerConfig(deck_size=parse_size("256KB"), bandwidth=parse_size("512KB"))
+    stderr = io.StringIO()
+    with FakeSlidesGPTServer(config) as server, contextlib.redirect_stderr(stderr):
+        transport = fast_transport(max_retries=0)
+        for range_header, status in (("bytes=5-2", 416), ("bytes=2-5", 206), ("bytes=999999-", 416)):
+            response = transport.get(f"{server.base_url}/download/fake-1", headers={"Range": range_header})
+            assert response.status_code == status, (range_header, response.status_code)
+        assert len(transport.get(f"{server.base_url}/download/fake-1", headers={"Range": "bytes=2-5"}).content) == 4
+
+        host, port = server.httpd.server_address[:2]
+        with socket.create_connection((host, port)) as sock:
+            sock.sendall(b"GET /download/fake-1 HTTP/1.1\r\nHost: fake\r\n\r\n")
+            sock.recv(1024)
+            # Close with a TCP reset while the paced body is still being written
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        time.sleep(0.3)
+    assert "Traceback" not in stderr.getvalue(), stderr.getvalue()
+
+    print("✅ Bad range and client reset test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running fake server tests...\n")
+
+    tests = [
+        test_latency_specs,
+        test_generate_and_download_end_to_end,
+        test_injected_throttling_is_retried,
+        test_bad_ranges_and_client_resets
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the submit/poll generation client
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from generation_client import GenerationClient, GenerationClientError, JobJournal
+from generation_worker import GenerationWorker, WorkerServer
+from test_generation_worker import RecordingGenerator
+
+
+class FakeClock:
+    def __init__(self, on_sleep=None):
+        self.now = 0.0
+        self.sleeps = []
+        self.on_sleep = on_sleep
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        if self.on_sleep:
+            self.on_sleep(self)
+
+
+def test_multiplexed_exponential_polling():
+    """Many jobs are polled from one loop with batched requests and growing intervals"""
+    print("Testing multiplexed polling...")
+
+    generator = RecordingGenerator()
+    with WorkerServer(GenerationWorker(generator, concurrency=4), port=0) as server:
+        def release_after_a_while(clock):
+            if len(clock.sleeps) == 4:
+                generator.release.set()
+                # Let the worker threads finish before the next poll
+                for job_id in job_ids:
+                    server.worker.wait(job_id, timeout=5)
+
+        clock = FakeClock(release_after_a_while)
+        client = GenerationClient(server.base_url, initial_interval=0.5, max_interval=4, clock=clock, sleep=clock.sleep)
+        job_ids = [client.submit("AI Club", "block") for _ in range(10)]
+        assert all(server.worker.get(job_id) is not None for job_id in job_ids)
+
+        results = client.wait_all(job_ids)
+        assert sorted(results) == sorted(job_ids)
+        assert all(job["status"] == "succeeded" for job in results.values())
+        # 0.5, 1, 2, 4 between polls, then capped; one batched request per poll for all 10 jobs
+        assert clock.sleeps[:4] == [0.5, 1.0, 2.0, 4.0]
+        assert client.polls == len(clock.sleeps) + 1 == 5
+
+        try:
+            client.submit("AI Club", "")
+            raise AssertionError("Expected GenerationClientError")
+        except GenerationClientError as e:
+            assert e.status_code == 400
+
+        generator.release.clear()
+        slow = client.submit("AI Club", "block")
+        try:
+            client.wait(slow, timeout=3)
+            raise AssertionError("Expected TimeoutError")
+        except TimeoutError:
+            pass
+        generator.release.set()
+
+    print("✅ Multiplexed polling test passed!")
+
+
+def test_journal_recovers_after_restart():
+    """Pending jobs in the journal are resubmitted to a restarted worker and their results kept"""
+    print("Testing journal recovery...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_path = os.path.join(temp_dir, "jobs.jsonl")
+
+        generator = RecordingGenerator()
+        generator.release.set()
+        with WorkerServer(GenerationWorker(generator), port=0) as server:
+            client = GenerationClient(server.base_url, journal=JobJournal(journal_path), initial_interval=0.01)
+            done = client.submit("AI Club", "first")
+            assert client.wait(done)["status"] == "succeeded"
+
+            generator.release.clear()
+            pending = [client.submit("AI Club", "block"), client.submit("AI Club", "second", priority=1)]
+            port = server.httpd.server_address[1]
+        generator.release.set()
+
+        # The client crashed mid-write and the worker restarted, forgetting every job
+        with open(journal_path, 'a') as f:
+            f.write('{"event": "finished", "id": "torn')
+        restarted = RecordingGenerator()
+        restarted.release.set()
+        with WorkerServer(GenerationWorker(restarted), port=port) as server:
+            journal = JobJournal(journal_path)
+            assert sorted(journal.pending) == sorted(pending) and list(journal.finished) == [done]
+
+            results = GenerationClient(server.base_url, journal=journal, initial_interval=0.01).recover(timeout=10)
+            assert sorted(results) == sorted([done] + pending)
+            assert all(job["status"] == "succeeded" for job in results.values())
+            assert sorted(restarted.ran) == ["block", "second"]
+
+        reloaded = JobJournal(journal_path)
+        assert not reloaded.pending and len(reloaded.finished) == 3
+        for job_id in list(reloaded.finished):
+            reloaded.forget(job_id)
+        reloaded.compact()
+        assert os.path.getsize(journal_path) == 0 and not JobJournal(journal_path).finished
+
+    print("✅ Journal recovery test passed!")
+
+
+def test_client_import_stays_light():
+    """Importing the client doesn't pull in the worker and generator stack"""
+    print("Testing client imports...")
+
+    check = ("import sys, generation_client; "
+             "print(','.join(m for m in ('generation_worker', 'production_slidesgpt_generator', 'presentation_cache') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", result.stdout
+
+    print("✅ Client import test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running generation client tests...\n")
+
+    tests = [
+        test_multiplexed_exponential_polling,
+        test_journal_recovers_after_restart,
+        test_client_import_stays_light
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the generation worker daemon
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import requests
+from pathlib import Path
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from generation_worker import GenerationJob, GenerationWorker, QueueFull, WorkerServer
+from instrumentation import Instrumentation, PrometheusExporter
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter
+from slidesgpt_transport import SlidesGPTTransport
+
+
+class RecordingGenerator(ProductionSlidesGPTGenerator):
+    """Records the order jobs run in; topic 'block' waits until released"""
+
+    def __init__(self):
+        super().__init__(api_key="test-key",
+                         transport=SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)))
+        self.ran = []
+        self.release = threading.Event()
+
+    def generate_club_presentation(self, club_name, topic, **kwargs):
+        if topic == "block":
+            self.release.wait(5)
+        if topic == "fail":
+            raise FileNotFoundError(f"Club '{club_name}' not found")
+        self.ran.append(topic)
+        return {"presentation_id": f"deck-{topic}"}
+
+
+def test_priority_queue_and_cancel():
+    """Higher priorities run first, queued jobs can be cancelled, and a full queue rejects jobs"""
+    print("Testing priority queue...")
+
+    generator = RecordingGenerator()
+    worker = GenerationWorker(generator, concurrency=1, max_queue=4).start()
+    blocker = worker.submit(GenerationJob("AI Club", "block"))
+    while worker.get(blocker.id).status != "running":
+        time.sleep(0.001)
+
+    low = worker.submit(GenerationJob("AI Club", "low", priority=0))
+    high = worker.submit(GenerationJob("AI Club", "high", priority=10))
+    doomed = worker.submit(GenerationJob("AI Club", "doomed", priority=5))
+    failing = worker.submit(GenerationJob("AI Club", "fail", priority=1))
+    assert worker.snapshot(high.id)["queue_position"] == 0
+    assert worker.snapshot(low.id)["queue_position"] == 3
+    try:
+        worker.submit(GenerationJob("AI Club", "overflow"))
+        raise AssertionError("Expected QueueFull")
+    except QueueFull:
+        pass
+
+    assert worker.cancel(doomed.id) and not worker.cancel(doomed.id) and not worker.cancel(blocker.id)
+    generator.release.set()
+    assert worker.wait(low.id, timeout=5).status == "succeeded"
+    assert generator.ran == ["block", "high", "low"]
+    assert worker.get(high.id).result == {"presentation_id": "deck-high"}
+    assert worker.get(failing.id).status == "failed" and "not found" in worker.get(failing.id).error
+
+    stats = worker.stats()
+    assert (stats["succeeded"], stats["failed"], stats["cancelled"], stats["queued"]) == (3, 1, 1, 0)
+    worker.stop()
+
+    print("✅ Priority queue test passed!")
+
+
+def test_http_api_end_to_end():
+    """Jobs submitted over HTTP run against the warm generator and can be polled to completion"""
+    print("Testing worker HTTP API...")
+
+    prometheus = PrometheusExporter()
+    with FakeSlidesGPTServer(FakeServerConfig(deck_size=32 * 1024)) as fake, tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        (data_dir / "user-a").mkdir(parents=True)
+        with open(data_dir / "user-a" / "AI_Club_club-1.json", 'w') as f:
+            json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000))
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=transport, base_url=fake.base_url,
+                                                 instrumentation=Instrumentation([prometheus]))
+        output_dir = os.path.join(temp_dir, "decks")
+        worker = GenerationWorker(generator, concurrency=2, data_directory=str(data_dir), output_directory=output_dir)
+        worker.warm_up()
+        assert transport.connection_stats()["connections_opened"] == 1
+
+        with WorkerServer(worker, port=0, token="secret", prometheus=prometheus) as server:
+            headers = {"Authorization": "Bearer secret"}
+            assert requests.get(f"{server.base_url}/health").status_code == 401
+
+            output = os.path.join(output_dir, "ai", "deck.pptx")
+            submitted = requests.post(f"{server.base_url}/jobs", headers=headers,
+                                      json={"club": "AI Club", "topic": "Neural Networks", "output": "ai/deck.pptx", "priority": 3})
+            assert submitted.status_code == 202
+            job_id = submitted.json()["id"]
+            missing = requests.post(f"{server.base_url}/jobs", headers=headers, json={"club": "Drama Club", "topic": "Plays"})
+
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                job = requests.get(f"{server.base_url}/jobs/{job_id}", headers=headers).json()
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                time.sleep(0.01)
+            assert job["status"] == "succeeded", job
+            assert job["result"]["downloaded_to"] == output and os.path.getsize(output) == 32 * 1024
+            assert worker.wait(missing.json()["id"], timeout=10).status == "failed"
+
+            assert requests.post(f"{server.base_url}/jobs", headers=headers, json={"club": "AI Club"}).status_code == 400
+            assert requests.post(f"{server.base_url}/jobs", headers=headers, data=b"{").status_code == 400
+            # Outputs stay under the output directory and optional fields must be strings
+            for bad in ({"output": os.path.join(temp_dir, "x.pptx")}, {"output": "../x.pptx"}, {"output": "a/../../x.pptx"},
+                        {"theme": 5}, {"s3_bucket": ["b"]}, {"s3_key": {"k": 1}}):
+                rejected = requests.post(f"{server.base_url}/jobs", headers=headers,
+                                         json={"club": "AI Club", "topic": "Neural Networks", **bad})
+                assert rejected.status_code == 400, bad
+            os.symlink(temp_dir, os.path.join(output_dir, "link"))
+            escaped = requests.post(f"{server.base_url}/jobs", headers=headers,
+                                    json={"club": "AI Club", "topic": "Neural Networks", "output": "link/x.pptx"})
+            assert "escapes" in worker.wait(escaped.json()["id"], timeout=10).error
+            assert requests.get(f"{server.base_url}/jobs/nope", headers=headers).status_code == 404
+            assert requests.delete(f"{server.base_url}/jobs/{job_id}", headers=headers).status_code == 409
+
+            health = requests.get(f"{server.base_url}/health", headers=headers).json()
+            assert health["succeeded"] == 1 and health["failed"] == 2
+            # Every job reused the connection opened by warm_up
+            assert health["connections"]["connections_opened"] == 1
+            metrics = requests.get(f"{server.base_url}/metrics", headers=headers).text
+            assert 'stage="warm_up"' in metrics and 'stage="generate_club_presentation"' in metrics
+
+    print("✅ Worker HTTP API test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running generation worker tests...\n")
+
+    tests = [
+        test_priority_queue_and_cancel,
+        test_http_api_end_to_end
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for pipeline instrumentation
+"""
+
+import io
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from instrumentation import NULL_INSTRUMENTATION, Instrumentation, JsonLinesExporter, PrometheusExporter
+from presentation_cache import PresentationCache
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from slidesgpt_transport import SlidesGPTTransport
+
+
+def test_pipeline_emits_stage_spans():
+    """Every stage is timed, with status, retries, bytes and cache hits recorded"""
+    print("Testing pipeline spans...")
+
+    stream = io.StringIO()
+    prometheus = PrometheusExporter()
+    instrumentation = Instrumentation([JsonLinesExporter(stream=stream), prometheus])
+
+    config = FakeServerConfig(deck_size=64 * 1024, throttle_rate=0.5, retry_after=0, seed=3)
+    with FakeSlidesGPTServer(config) as server, tempfile.TemporaryDirectory() as temp_dir:
+        user_dir = Path(temp_dir) / "clubs" / "user-a"
+        user_dir.mkdir(parents=True)
+        with open(user_dir / "AI_Club_club-1.json", 'w') as f:
+            json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+                                       retry_policy=RetryPolicy(max_retries=50, base_delay=0.001))
+        generator = ProductionSlidesGPTGenerator(api_key="test-key", transport=transport, base_url=server.base_url,
+                                                 cache=PresentationCache(os.path.join(temp_dir, "cache")),
+                                                 instrumentation=instrumentation)
+        for name in ("a.pptx", "b.pptx"):
+            generator.generate_club_presentation("AI Club", "Neural Networks", output_path=os.path.join(temp_dir, name),
+                                                 data_directory=str(Path(temp_dir) / "clubs"))
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    spans = [r for r in records if r["type"] == "span"]
+    names = [s["name"] for s in spans]
+    assert names[:7] == ["find_club_file", "load_club_data", "build_prompt", "cache_lookup",
+                         "generate", "download", "generate_club_presentation"]
+    assert names[7:] == ["find_club_file", "load_club_data", "build_prompt", "cache_lookup",
+                         "cache_copy", "generate_club_presentation"]
+    assert all(s["parent"] == "generate_club_presentation" for s in spans if s["name"] != "generate_club_presentation")
+
+    generate = spans[4]
+    assert generate["attributes"]["status"] == 200
+    assert generate["attributes"]["retries"] == server.stats()["/generate"]["429"]
+    assert spans[5]["attributes"]["bytes"] == 64 * 1024
+    assert spans[6]["attributes"]["cache_hit"] is False and spans[-1]["attributes"]["cache_hit"] is True
+
+    text = prometheus.render()
+    assert 'slidesgpt_stage_duration_seconds_count{outcome="ok",stage="generate"} 1' in text
+    assert 'slidesgpt_stage_duration_seconds_count{outcome="ok",stage="generate_club_presentation"} 2' in text
+    assert 'slidesgpt_cache_lookups_total{result="hit"} 1' in text
+    assert 'slidesgpt_download_bytes_total{destination="file"} 65536' in text
+    assert 'slidesgpt_requests_total{endpoint="generate",status="200"} 1' in text
+
+    print("✅ Pipeline spans test passed!")
+
+
+def test_errors_and_disabled_overhead():
+    """Failed stages are labelled as errors; the null instrumentation is close to free"""
+    print("Testing error spans and disabled overhead...")
+
+    prometheus = PrometheusExporter()
+    instrumentation = Instrumentation([prometheus])
+    try:
+        with instrumentation.span("generate"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert 'slidesgpt_stage_duration_seconds_count{outcome="error",stage="generate"} 1' in prometheus.render()
+
+    started = time.perf_counter()
+    for _ in range(100000):
+        with NULL_INSTRUMENTATION.span("generate", theme="modern") as span:
+            span.set(status=200)
+        NULL_INSTRUMENTATION.count("requests", status=200)
+    per_call = (time.perf_counter() - started) / 100000
+    assert per_call < 20e-6, f"{per_call * 1e6:.1f}µs per disabled span"
+
+    print("✅ Error spans and disabled overhead test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running instrumentation tests...\n")
+
+    tests = [
+        test_pipeline_emits_stage_spans,
+        test_errors_and_disabled_overhead
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
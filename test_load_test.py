@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the open-loop load test harness
+"""
+
+import argparse
+import threading
+import time
+from load_test import LatencyHistogram, LoadTestConfig, LoadTestRunner, positive_float
+
+
+def test_histogram_percentiles():
+    """Percentiles stay within the histogram's relative precision"""
+    print("Testing latency histogram...")
+
+    histogram = LatencyHistogram(precision=0.01)
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert abs(summary["p50"] - 0.5) <= 0.5 * 0.01
+    assert abs(summary["p90"] - 0.9) <= 0.9 * 0.01
+    assert abs(summary["p99"] - 0.99) <= 0.99 * 0.01
+    assert summary["max"] == 1.0
+
+    other = LatencyHistogram()
+    other.record(2.0)
+    histogram.merge(other)
+    assert histogram.count == 1001 and histogram.max == 2.0
+
+    print("✅ Latency histogram test passed!")
+
+
+def test_schedule_ramps_up():
+    """Requests come due faster during ramp-up, then at the target rate"""
+    print("Testing ramp-up schedule...")
+
+    offsets = LoadTestConfig(rate=10, duration=3, ramp_up=2).schedule()
+    assert len(offsets) == 20
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert gaps[0] > gaps[5] > 0.1
+    assert all(abs(gap - 0.1) < 1e-9 for gap in gaps[10:])
+
+    assert len(LoadTestConfig(rate=5, duration=2).schedule()) == 10
+    assert LoadTestConfig(rate=5, duration=2, ramp_up=2).schedule()[0] == 0.0
+
+    # A zero rate would never schedule anything; it is rejected up front
+    for bad in (dict(rate=0), dict(rate=-1), dict(ramp_up=-1), dict(concurrency=0)):
+        try:
+            LoadTestConfig(**bad)
+            raise AssertionError(f"Expected ValueError for {bad}")
+        except ValueError:
+            pass
+    assert positive_float("2.5") == 2.5
+    for bad in ("0", "-3", "nan", "fast"):
+        try:
+            positive_float(bad)
+            raise AssertionError(f"Expected an argparse error for {bad}")
+        except argparse.ArgumentTypeError:
+            pass
+
+    print("✅ Ramp-up schedule test passed!")
+
+
+def test_runner_reports_errors_per_second():
+    """The runner keeps offering load on schedule and breaks errors down by type"""
+    print("Testing load runner...")
+
+    in_flight = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def request_fn(request_number):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        if request_number % 5 == 0:
+            return 429
+        if request_number == 7:
+            raise TimeoutError("read timed out")
+        return 200
+
+    report = LoadTestRunner(request_fn, LoadTestConfig(rate=200, duration=0.5, concurrency=8)).run()
+
+    assert report["sent"] == 100
+    assert report["succeeded"] == 79 and report["failed"] == 21
+    assert report["errors"] == {"HTTP 429": 20, "TimeoutError": 1}
+    assert 1 < peak[0] <= 8
+    assert report["latency"]["p50"] >= 0.02
+    assert report["latency"]["max"] >= report["service_latency"]["max"]
+    assert sum(row["sent"] for row in report["per_second"]) == 100
+    assert sum(row["completed"] for row in report["per_second"]) == 100
+
+    print("✅ Load runner test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running load test harness tests...\n")
+
+    tests = [
+        test_histogram_percentiles,
+        test_schedule_ramps_up,
+        test_runner_reports_errors_per_second
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
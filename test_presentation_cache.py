@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the presentation result cache
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from presentation_cache import PresentationCache
+from presentation_download import DownloadResult
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+
+
+class CountingGenerator(ProductionSlidesGPTGenerator):
+    """Generator that answers locally and counts SlidesGPT calls"""
+
+    def __init__(self, cache: PresentationCache):
+        super().__init__(api_key="test-key", cache=cache)
+        self.generate_calls = 0
+        self.download_calls = 0
+
+    def generate_presentation(self, prompt: str, theme: str = "modern", slides_count: int = 10):
+        self.generate_calls += 1
+        return {"presentation_id": f"deck-{self.generate_calls}"}
+
+    def download_presentation(self, presentation_id: str, output_path: str) -> DownloadResult:
+        self.download_calls += 1
+        Path(output_path).write_bytes(b"PK" + presentation_id.encode())
+        return DownloadResult(location=output_path, bytes_written=2 + len(presentation_id), sha256="")
+
+
+def test_ttl_and_lru_eviction():
+    """Expired entries miss, and the least recently used entry is evicted first"""
+    print("Testing TTL and LRU eviction...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PresentationCache(temp_dir, ttl_seconds=3600, max_entries=2)
+        keys = [PresentationCache.make_key(f"prompt {i}", "modern", 10) for i in range(3)]
+        assert keys[0] != PresentationCache.make_key("prompt 0", "dark", 10)
+
+        cache.put(keys[0], {"id": 0})
+        cache.put(keys[1], {"id": 1})
+        assert cache.get(keys[0]) == {"id": 0}
+        cache.put(keys[2], {"id": 2})
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == {"id": 0}
+        assert cache.stats()["evictions"] == 1
+
+        # Entries persist across instances; TTL is applied on read
+        assert PresentationCache(temp_dir).get(keys[2]) == {"id": 2}
+        time.sleep(0.02)
+        assert PresentationCache(temp_dir, ttl_seconds=0.01).get(keys[2]) is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 1
+
+    print("✅ TTL and LRU eviction test passed!")
+
+
+def test_generator_uses_cache():
+    """A repeated request is served from the cache, including the downloaded deck; refresh bypasses it"""
+    print("Testing generator cache integration...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        user_dir = Path(temp_dir) / "clubs" / "user-a"
+        user_dir.mkdir(parents=True)
+        with open(user_dir / "AI_Club_club-1.json", 'w') as f:
+            json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+        data_dir = str(Path(temp_dir) / "clubs")
+
+        generator = CountingGenerator(PresentationCache(os.path.join(temp_dir, "cache")))
+        first = generator.generate_club_presentation("AI Club", "Neural Networks",
+                                                     output_path=os.path.join(temp_dir, "a.pptx"), data_directory=data_dir)
+        second = generator.generate_club_presentation("AI Club", "Neural Networks",
+                                                      output_path=os.path.join(temp_dir, "b.pptx"), data_directory=data_dir)
+
+        assert generator.generate_calls == 1 and generator.download_calls == 1
+        assert first["presentation_id"] == second["presentation_id"] == "deck-1"
+        assert Path(temp_dir, "b.pptx").read_bytes() == b"PKdeck-1"
+
+        generator.generate_club_presentation("AI Club", "Neural Networks", data_directory=data_dir, refresh=True)
+        assert generator.generate_calls == 2
+        generator.generate_club_presentation("AI Club", "Robotics", data_directory=data_dir)
+        assert generator.generate_calls == 3
+
+    print("✅ Generator cache integration test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running presentation cache tests...\n")
+
+    tests = [
+        test_ttl_and_lru_eviction,
+        test_generator_uses_cache
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming presentation downloads
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from presentation_download import S3_MIN_PART_SIZE
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter
+from slidesgpt_transport import SlidesGPTTransport
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    boto3 = None
+
+DECK = os.urandom(2 * S3_MIN_PART_SIZE + 12345)
+OTHER_DECK = os.urandom(300 * 1024)
+
+
+class DeckHandler(BaseHTTPRequestHandler):
+    """Serves DECK (and OTHER_DECK as deck-b) with Range support; the first `truncate_next`
+    responses stop halfway, the next `misalign_next` ranged responses start at byte 0
+    whatever was asked for, and with etag=None no validator is sent"""
+    protocol_version = "HTTP/1.1"
+    truncate_next = 0
+    misalign_next = 0
+    etag = '"v1"'
+    range_requests = []
+
+    def do_GET(self):
+        decks = {"/download/deck-1": DECK, "/download/deck-b": OTHER_DECK}
+        if self.path not in decks:
+            body = b'{"error": "not found"}'
+            self.send_response(404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        deck = decks[self.path]
+        start, end = 0, len(deck) - 1
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", DeckHandler.etag) == DeckHandler.etag:
+            DeckHandler.range_requests.append(range_header)
+            first, _, last = range_header[len("bytes="):].partition("-")
+            start, end = int(first), int(last) if last else len(deck) - 1
+            if DeckHandler.misalign_next:
+                DeckHandler.misalign_next -= 1
+                start = 0
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(deck)}")
+        else:
+            self.send_response(200)
+        if DeckHandler.etag:
+            self.send_header("ETag", DeckHandler.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        body = deck[start:end + 1]
+        if DeckHandler.truncate_next:
+            DeckHandler.truncate_next -= 1
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_generator():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DeckHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000))
+    generator = ProductionSlidesGPTGenerator(
+        api_key="test-key",
+        transport=transport,
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        download_buffer_size=64 * 1024
+    )
+    return server, generator
+
+
+def test_download_to_file_with_checksum():
+    """The deck is streamed to disk with its checksum; failed downloads leave no file behind"""
+    print("Testing file download...")
+
+    server, generator = start_generator()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "deck.pptx")
+            download = generator.download_presentation("deck-1", output_path)
+            assert download.bytes_written == len(DECK)
+            assert download.sha256 == hashlib.sha256(DECK).hexdigest()
+            with open(output_path, 'rb') as f:
+                assert f.read() == DECK
+
+            missing_path = os.path.join(temp_dir, "missing.pptx")
+            try:
+                generator.download_presentation("deck-2", missing_path)
+                raise AssertionError("Should have raised for a 404")
+            except Exception as e:
+                assert "Download failed: 404" in str(e)
+            assert not os.path.exists(missing_path)
+            assert not os.path.exists(missing_path + ".part")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ File download test passed!")
+
+
+def test_interrupted_download_resumes():
+    """A truncated download leaves only a .part file, and the retry fetches just the missing bytes"""
+    print("Testing resumable download...")
+
+    server, generator = start_generator()
+    DeckHandler.range_requests = []
+    DeckHandler.truncate_next = 1
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "deck.pptx")
+            try:
+                generator.download_presentation("deck-1", output_path)
+                raise AssertionError("Should have raised for a truncated body")
+            except Exception as e:
+                assert "Download error" in str(e)
+            assert not os.path.exists(output_path)
+            partial = os.path.getsize(output_path + ".part")
+            assert 0 < partial < len(DECK)
+
+            download = generator.download_presentation("deck-1", output_path)
+            assert DeckHandler.range_requests == [f"bytes={partial}-"]
+            assert download.sha256 == hashlib.sha256(DECK).hexdigest()
+            with open(output_path, 'rb') as f:
+                assert f.read() == DECK
+            assert os.listdir(temp_dir) == ["deck.pptx"]
+
+            # A 206 for the wrong bytes is not appended; the deck is fetched again in full
+            os.unlink(output_path)
+            DeckHandler.range_requests = []
+            DeckHandler.truncate_next = 1
+            try:
+                generator.download_presentation("deck-1", output_path)
+            except Exception:
+                pass
+            partial = os.path.getsize(output_path + ".part")
+            DeckHandler.misalign_next = 1
+            download = generator.download_presentation("deck-1", output_path)
+            assert DeckHandler.range_requests == [f"bytes={partial}-"]
+            assert download.bytes_written == len(DECK)
+            with open(output_path, 'rb') as f:
+                assert f.read() == DECK
+            assert os.listdir(temp_dir) == ["deck.pptx"]
+    finally:
+        DeckHandler.truncate_next = 0
+        DeckHandler.misalign_next = 0
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Resumable download test passed!")
+
+
+def test_partial_from_another_deck_is_not_resumed():
+    """Without a validator, or for a different deck, a leftover .part is dropped instead of spliced"""
+    print("Testing resume source checks...")
+
+    server, generator = start_generator()
+    DeckHandler.range_requests = []
+    DeckHandler.etag = None
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "deck.pptx")
+            DeckHandler.truncate_next = 1
+            try:
+                generator.download_presentation("deck-1", output_path)
+                raise AssertionError("Should have raised for a truncated body")
+            except Exception as e:
+                assert "Download error" in str(e)
+            assert os.path.getsize(output_path + ".part") > 0
+
+            download = generator.download_presentation("deck-b", output_path)
+            assert DeckHandler.range_requests == []
+            assert download.sha256 == hashlib.sha256(OTHER_DECK).hexdigest()
+            with open(output_path, 'rb') as f:
+                assert f.read() == OTHER_DECK
+
+            # With a validator, a partial from deck-1 still isn't resumed for deck-b
+            DeckHandler.etag = '"v1"'
+            DeckHandler.truncate_next = 1
+            try:
+                generator.download_presentation("deck-1", output_path)
+            except Exception:
+                pass
+            download = generator.download_presentation("deck-b", output_path)
+            assert DeckHandler.range_requests == []
+            with open(output_path, 'rb') as f:
+                assert f.read() == OTHER_DECK
+            assert os.listdir(temp_dir) == ["deck.pptx"]
+    finally:
+        DeckHandler.truncate_next = 0
+        DeckHandler.etag = '"v1"'
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Resume source check test passed!")
+
+
+def test_parallel_ranged_download():
+    """With parts > 1 the deck is fetched as concurrent byte ranges and assembled in place"""
+    print("Testing parallel ranged download...")
+
+    server, generator = start_generator()
+    DeckHandler.range_requests = []
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "deck.pptx")
+            # Resume state left by an earlier interrupted single-stream download
+            with open(output_path + ".part", 'wb') as f:
+                f.write(b"stale")
+            with open(output_path + ".part.json", 'w') as f:
+                f.write('{"validator": "\\"v0\\""}')
+
+            download = generator.download_presentation("deck-1", output_path, parts=4)
+            assert download.bytes_written == len(DECK)
+            assert download.sha256 == hashlib.sha256(DECK).hexdigest()
+            assert len(DeckHandler.range_requests) == 5
+            with open(output_path, 'rb') as f:
+                assert f.read() == DECK
+            assert os.listdir(temp_dir) == ["deck.pptx"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Parallel ranged download test passed!")
+
+
+def test_download_streams_into_s3():
+    """The deck goes straight into a multipart upload, one part buffer at a time"""
+    print("Testing S3 streaming...")
+
+    if boto3 is None:
+        print("⏭️  boto3/moto not installed, skipping")
+        return
+
+    server, generator = start_generator()
+    try:
+        with mock_aws():
+            client = boto3.client('s3', region_name='us-west-1')
+            client.create_bucket(Bucket='clubly-slides', CreateBucketConfiguration={'LocationConstraint': 'us-west-1'})
+
+            upload = generator.upload_presentation_to_s3("deck-1", "clubly-slides", "decks/deck-1.pptx", s3_client=client)
+            assert upload.location == "https://clubly-slides.s3.us-west-1.amazonaws.com/decks/deck-1.pptx"
+            assert upload.sha256 == hashlib.sha256(DECK).hexdigest()
+            stored = client.get_object(Bucket='clubly-slides', Key='decks/deck-1.pptx')['Body'].read()
+            assert stored == DECK
+            assert client.list_multipart_uploads(Bucket='clubly-slides').get('Uploads') is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ S3 streaming test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running download tests...\n")
+
+    tests = [
+        test_download_to_file_with_checksum,
+        test_interrupted_download_resumes,
+        test_partial_from_another_deck_is_not_resumed,
+        test_parallel_ranged_download,
+        test_download_streams_into_s3
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
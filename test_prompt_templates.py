@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled prompt templates
+"""
+
+import os
+import tempfile
+from dataclasses import replace
+from club_data import ClubData
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from prompt_templates import PromptTemplate, PromptTemplates, default_templates
+from slidesgpt_generator import SlidesGPTGenerator
+
+CLUB = ClubData(clubId="club-templates-1", userId="user-1", userName="Ada", userRole="President", clubName="AI {Club}",
+                description="Neural nets\nand snacks", mission="Learn", goals="Build", updatedAt="2024-01-15T10:30:00Z")
+
+
+def legacy_presentation_prompt(club_data: ClubData, topic: str) -> str:
+    """The f-string create_presentation_prompt used before templates"""
+    return f"""
+Create a professional presentation for {club_data.clubName} about: {topic}
+
+Club Information:
+- Club Name: {club_data.clubName}
+- Description: {club_data.description}
+- Mission Statement: {club_data.mission}
+- Goals & Objectives: {club_data.goals}
+- User Role: {club_data.userRole}
+- User Name: {club_data.userName}
+
+Presentation Requirements:
+- Topic: {topic}
+- Target Audience: Club members and stakeholders
+- Tone: Professional yet engaging
+- Structure: Include introduction, main content sections, and conclusion
+- Visual Style: Modern and clean design
+
+Please create a presentation that:
+1. Aligns with the club's mission and goals
+2. Is appropriate for the user's role in the club
+3. Provides valuable information about the topic
+4. Engages the audience effectively
+5. Includes relevant examples and practical applications
+
+Make sure the content is tailored specifically for {club_data.clubName} and its members.
+        """.strip()
+
+
+def test_prompts_match_legacy_output():
+    """Both generators produce exactly the prompts they built before"""
+    print("Testing template output against the legacy prompts...")
+
+    production = ProductionSlidesGPTGenerator("test-key")
+    simple = SlidesGPTGenerator("test-key")
+    for club in (CLUB, ClubData(clubName="Chess")):
+        for topic in ("Transformers", "", " {topic} "):
+            assert production.create_presentation_prompt(club, topic) == legacy_presentation_prompt(club, topic)
+            typed = simple.create_club_prompt(club, topic, "workshop")
+            assert typed == legacy_presentation_prompt(club, topic).replace(
+                f"- Topic: {topic}\n", f"- Topic: {topic}\n- Type: workshop presentation\n")
+
+    print("✅ Legacy output test passed!")
+
+
+def test_club_sections_are_cached():
+    """Club sections are bound once per (clubId, updatedAt) and a new updatedAt re-renders"""
+    print("Testing club section cache...")
+
+    templates = default_templates()
+    first = templates.render("presentation", CLUB, topic="One")
+    templates.render("presentation", CLUB, topic="Two")
+    assert templates.stats()["misses"] == 1 and templates.stats()["hits"] == 1
+
+    renamed = replace(CLUB, clubName="ML Club", updatedAt="2024-02-01T00:00:00Z")
+    assert "ML Club" in templates.render("presentation", renamed, topic="One")
+    assert templates.render("presentation", CLUB, topic="One") == first
+    assert templates.stats()["misses"] == 2
+
+    # Clubs without an id or updatedAt are keyed on their content instead
+    assert "Go" in templates.render("presentation", ClubData(clubName="Go"), topic="x")
+    assert "Chess" in templates.render("presentation", ClubData(clubName="Chess"), topic="x")
+
+    small = PromptTemplates(cache_size=2)
+    small.register("t", "{clubName}: {topic}")
+    for i in range(5):
+        assert small.render("t", replace(CLUB, clubId=f"c{i}"), topic="x") == "AI {Club}: x"
+    assert small.stats()["cached_clubs"] == 2
+
+    print("✅ Club section cache test passed!")
+
+
+def test_named_templates():
+    """Templates can be registered or loaded by name and are validated when parsed"""
+    print("Testing named templates...")
+
+    template = PromptTemplate("t", "  {{literal}} {clubName} / {topic} / {audience} / {topic}  ")
+    assert template.club_fields == ("clubName",) and template.request_fields == ("topic", "audience")
+    assert template.render(CLUB, topic="T", audience="A") == "{literal} AI {Club} / T / A / T"
+    for bad in ("{topic!r}", "{topic:>5}", "{0}", "{unclosed"):
+        try:
+            PromptTemplate("bad", bad)
+            raise AssertionError(f"Accepted {bad!r}")
+        except ValueError:
+            pass
+    try:
+        template.render(CLUB, topic="T")
+        raise AssertionError("Expected a missing field error")
+    except ValueError as e:
+        assert "audience" in str(e)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, "short.txt"), 'w') as f:
+            f.write("\n{topic} for {clubName}, led by {userName}\n")
+        templates = default_templates()
+        assert templates.load_directory(temp_dir) == ["short"]
+        assert templates.names() == ["club_presentation", "presentation", "short"]
+        generator = ProductionSlidesGPTGenerator("test-key", prompt_templates=templates, prompt_template="short")
+        assert generator.create_presentation_prompt(CLUB, "Robots") == "Robots for AI {Club}, led by Ada"
+        try:
+            ProductionSlidesGPTGenerator("test-key", prompt_templates=templates, prompt_template="missing")
+            raise AssertionError("Expected KeyError")
+        except KeyError:
+            pass
+
+    print("✅ Named templates test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running prompt template tests...\n")
+
+    tests = [
+        test_prompts_match_legacy_output,
+        test_club_sections_are_cached,
+        test_named_templates
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
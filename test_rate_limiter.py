@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the adaptive rate limiter and retry handling
+"""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from rate_limiter import DEFAULT_BURST, DEFAULT_RATE, AdaptiveRateLimiter, RetryPolicy, parse_retry_after
+from slidesgpt_transport import SlidesGPTTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers 429 with Retry-After for the first `throttle` requests, then 200"""
+    protocol_version = "HTTP/1.1"
+    throttle = 2
+    seen = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        ThrottlingHandler.seen += 1
+        if ThrottlingHandler.seen <= ThrottlingHandler.throttle:
+            body = b'{"error": "rate limit"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+        else:
+            body = json.dumps({"id": "deck-1"}).encode()
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FailingHandler(BaseHTTPRequestHandler):
+    """Answers every request with a 500, or for /drop reads the body and hangs up without answering"""
+    protocol_version = "HTTP/1.1"
+    seen = []
+
+    def _fail(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        FailingHandler.seen.append((self.command, self.path))
+        if self.path == "/drop":
+            self.close_connection = True
+            return
+        body = b'{"error": "internal server error"}'
+        self.send_response(500)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _fail
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_token_bucket_and_adaptation():
+    """Bursts are allowed, then calls are spaced out; 429s slow the rate and successes restore it"""
+    print("Testing token bucket...")
+
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2, increase_step=0.5, clock=clock)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.5
+    assert limiter.reserve() == 1.0
+
+    clock.now += 10
+    limiter.on_throttle(retry_after=3)
+    assert limiter.rate == 1.0
+    assert limiter.reserve() == 3.0
+
+    clock.now += 3
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 2.0
+
+    # A limiter built directly starts from the same settings as the shared one
+    default = AdaptiveRateLimiter()
+    assert (default.rate, default.burst) == (DEFAULT_RATE, DEFAULT_BURST)
+
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+    print("✅ Token bucket test passed!")
+
+
+def test_transport_retries_throttled_requests():
+    """A 429 is retried after backoff and the caller only sees the final response"""
+    print("Testing retry on 429...")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    limiter = AdaptiveRateLimiter(rate=1000, burst=1000)
+    try:
+        with SlidesGPTTransport(rate_limiter=limiter, retry_policy=RetryPolicy(base_delay=0.01)) as transport:
+            response = transport.post(f"http://127.0.0.1:{server.server_address[1]}/generate", json={})
+            assert response.status_code == 200
+            assert response.retries == 2
+            assert transport.connection_stats()["retries"] == 2
+            assert limiter.stats()["throttled"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Retry on 429 test passed!")
+
+
+def test_generate_is_not_retried_once_sent():
+    """POSTs are only retried when they never reached the server; GETs are retried on 5xx too"""
+    print("Testing non-idempotent retries...")
+
+    import requests
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FailingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+                                retry_policy=RetryPolicy(max_retries=2, base_delay=0.001)) as transport:
+            assert transport.post(f"{base_url}/generate", json={}).status_code == 500
+            assert FailingHandler.seen == [("POST", "/generate")]
+            assert transport.get(f"{base_url}/download/deck-1").status_code == 500
+            assert FailingHandler.seen[1:] == [("GET", "/download/deck-1")] * 3
+
+            # The body was sent before the connection dropped
+            del FailingHandler.seen[:]
+            try:
+                transport.post(f"{base_url}/drop", json={})
+                raise AssertionError("Expected a connection error")
+            except requests.exceptions.ConnectionError:
+                pass
+            assert FailingHandler.seen == [("POST", "/drop")]
+            retries = transport.connection_stats()["retries"]
+
+            # Nothing listens on this port, so the POST never left the client
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                closed_port = sock.getsockname()[1]
+            try:
+                transport.post(f"http://127.0.0.1:{closed_port}/generate", json={})
+                raise AssertionError("Expected a connection error")
+            except requests.exceptions.ConnectionError:
+                pass
+            assert transport.connection_stats()["retries"] == retries + 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Non-idempotent retry test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running rate limiter tests...\n")
+
+    tests = [
+        test_token_bucket_and_adaptation,
+        test_transport_retries_throttled_requests,
+        test_generate_is_not_retried_once_sent
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the reusable S3 uploader
+"""
+
+import os
+import sys
+import tempfile
+
+try:
+    import boto3
+    from moto import mock_aws
+    from upload_to_s3 import S3Uploader
+except ImportError:
+    boto3 = None
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+def test_upload_many_in_parallel():
+    """Several decks are uploaded through one client, large ones as multipart, with viewer URLs"""
+    print("Testing parallel uploads...")
+
+    if boto3 is None:
+        print("⏭️  boto3/moto not installed, skipping")
+        return
+
+    with mock_aws(), tempfile.TemporaryDirectory() as temp_dir:
+        client = boto3.client('s3', region_name='us-west-1')
+        client.create_bucket(Bucket='clubly-slides', CreateBucketConfiguration={'LocationConstraint': 'us-west-1'})
+
+        decks = {}
+        for i, size in enumerate([1024, PART_SIZE * 2 + 17, 10]):
+            path = os.path.join(temp_dir, f"deck-{i}.pptx")
+            decks[path] = os.urandom(size)
+            with open(path, 'wb') as f:
+                f.write(decks[path])
+        missing = os.path.join(temp_dir, "missing.pptx")
+
+        uploader = S3Uploader('clubly-slides', client=client, part_size=PART_SIZE, max_concurrency=4, max_workers=3)
+        results = uploader.upload_many(list(decks) + [missing], prefix="decks/")
+
+        assert [r.file_path for r in results] == list(decks) + [missing]
+        assert results[-1].error and results[-1].url is None
+        for result in results[:-1]:
+            assert result.error is None
+            assert result.url == f"https://clubly-slides.s3.us-west-1.amazonaws.com/{result.object_name}"
+            assert result.viewer_url.startswith("https://view.officeapps.live.com/op/view.aspx?src=https%3A%2F%2Fclubly-slides")
+            stored = client.get_object(Bucket='clubly-slides', Key=result.object_name)
+            assert stored['Body'].read() == decks[result.file_path]
+
+        # The large deck went up in several parts
+        head = client.head_object(Bucket='clubly-slides', Key="decks/deck-1.pptx", PartNumber=1)
+        assert head['PartsCount'] == 3
+
+    local = S3Uploader('clubly-slides', endpoint_url="http://localhost:9000/", client=object())
+    assert local.public_url("decks/a b.pptx") == "http://localhost:9000/clubly-slides/decks/a%20b.pptx"
+    aws = S3Uploader('clubly-slides', client=object())
+    assert aws.public_url("decks/a b.pptx") == "https://clubly-slides.s3.us-west-1.amazonaws.com/decks/a%20b.pptx"
+
+    print("✅ Parallel uploads test passed!")
+
+
+def test_dedupe_skips_existing_content():
+    """Identical decks are stored once under their content hash; repeats come from the manifest or a HEAD,
+    and explicit object names are written as server-side copies"""
+    print("Testing content-hash dedup...")
+
+    if boto3 is None:
+        print("⏭️  boto3/moto not installed, skipping")
+        return
+
+    with mock_aws(), tempfile.TemporaryDirectory() as temp_dir:
+        client = boto3.client('s3', region_name='us-west-1')
+        client.create_bucket(Bucket='clubly-slides', CreateBucketConfiguration={'LocationConstraint': 'us-west-1'})
+
+        deck = os.urandom(4096)
+        paths = []
+        for name in ("monday.pptx", "monday-regenerated.pptx"):
+            paths.append(os.path.join(temp_dir, name))
+            with open(paths[-1], 'wb') as f:
+                f.write(deck)
+        manifest_path = os.path.join(temp_dir, "manifest.json")
+
+        uploader = S3Uploader('clubly-slides', client=client, dedupe=True, manifest_path=manifest_path)
+        first = uploader.upload(paths[0])
+        assert first.object_name == first.content_key == f"by-hash/{first.sha256}.pptx"
+        # A known digest is not recomputed from disk, and the caller's key is an alias of the content object
+        s3_module = sys.modules[S3Uploader.__module__]
+        original_sha256, s3_module.file_sha256 = s3_module.file_sha256, None
+        try:
+            second = uploader.upload(paths[1], "decks/monday regenerated.pptx", sha256=first.sha256)
+        finally:
+            s3_module.file_sha256 = original_sha256
+        assert not first.skipped and second.skipped
+        assert second.object_name == "decks/monday regenerated.pptx" and second.content_key == first.object_name
+        assert second.url.endswith("/decks/monday%20regenerated.pptx")
+        assert client.get_object(Bucket='clubly-slides', Key=second.object_name)['Body'].read() == deck
+        assert uploader.stats() == {"uploaded": 1, "skipped": 1, "bytes_skipped": 4096}
+        assert client.list_objects_v2(Bucket='clubly-slides')['KeyCount'] == 2
+
+        # A fresh uploader without the manifest still finds the object with a HEAD
+        again = S3Uploader('clubly-slides', client=client, dedupe=True).upload(paths[1])
+        assert again.skipped and again.url == first.url
+
+        # Manifest entries are per bucket and are checked before being trusted
+        client.create_bucket(Bucket='clubly-archive', CreateBucketConfiguration={'LocationConstraint': 'us-west-1'})
+        archive = S3Uploader('clubly-archive', client=client, dedupe=True, manifest_path=manifest_path).upload(paths[0])
+        assert not archive.skipped
+        assert client.list_objects_v2(Bucket='clubly-archive')['KeyCount'] == 1
+
+        client.delete_object(Bucket='clubly-slides', Key=first.object_name)
+        reloaded = S3Uploader('clubly-slides', client=client, dedupe=True, manifest_path=manifest_path)
+        restored = reloaded.upload(paths[0])
+        assert not restored.skipped and restored.url == first.url
+        assert client.head_object(Bucket='clubly-slides', Key=first.object_name)['ContentLength'] == 4096
+
+    print("✅ Content-hash dedup test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running S3 uploader tests...\n")
+
+    tests = [
+        test_upload_many_in_parallel,
+        test_dedupe_skips_existing_content
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
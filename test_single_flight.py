@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of identical generation requests
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from fake_slidesgpt_server import FakeServerConfig, FakeSlidesGPTServer
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter
+from single_flight import SingleFlight
+from slidesgpt_transport import SlidesGPTTransport
+
+
+def test_single_flight_shares_results_and_errors():
+    """Callers arriving while a call runs get its result; errors are shared too and nothing sticks"""
+    print("Testing single flight...")
+
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(value):
+        def run():
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            if value == "boom":
+                raise RuntimeError("upstream failed")
+            return value
+        return run
+
+    for value in ("deck", "boom"):
+        started.clear()
+        release.clear()
+        outcomes = []
+
+        def call():
+            try:
+                outcomes.append(flight.do(value, slow(value)))
+            except RuntimeError as e:
+                outcomes.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=call) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()["coalesced"] < (3 if value == "deck" else 6):
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        if value == "deck":
+            assert sorted(outcomes, key=str) == [("deck", False)] + [("deck", True)] * 3
+        else:
+            assert outcomes == ["upstream failed"] * 4
+
+    assert calls == ["deck", "boom"]
+    # A finished flight is not cached
+    assert flight.do("deck", lambda: "again") == ("again", False)
+    assert flight.stats() == {"in_flight": 0, "executed": 3, "coalesced": 6}
+
+    print("✅ Single flight test passed!")
+
+
+def test_concurrent_identical_generations_coalesce():
+    """Concurrent identical requests make one generate and one download call and each get their own file"""
+    print("Testing coalesced generation...")
+
+    with FakeSlidesGPTServer(FakeServerConfig(latency="0.3", deck_size=16 * 1024)) as fake, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        (data_dir / "user-a").mkdir(parents=True)
+        with open(data_dir / "user-a" / "AI_Club_club-1.json", 'w') as f:
+            json.dump({"clubId": "club-1", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        generator = ProductionSlidesGPTGenerator(
+            api_key="test-key", base_url=fake.base_url,
+            transport=SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)))
+        outputs = [os.path.join(temp_dir, f"deck-{i}.pptx") for i in range(4)] + [None]
+        barrier = threading.Barrier(len(outputs))
+        results = {}
+
+        def generate(output):
+            barrier.wait(5)
+            results[output] = generator.generate_club_presentation(
+                "AI Club", "Neural Networks", output_path=output, data_directory=str(data_dir))
+
+        threads = [threading.Thread(target=generate, args=(output,)) for output in outputs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert fake.stats()["/generate"] == {"200": 1} and fake.stats()["/download"] == {"200": 1}
+        assert generator.single_flight.stats()["coalesced"] == 4
+        assert len({result["presentation_id"] for result in results.values()}) == 1
+        assert "downloaded_to" not in results[None]
+        decks = set()
+        for output in outputs[:-1]:
+            assert results[output]["downloaded_to"] == output
+            with open(output, 'rb') as f:
+                decks.add(f.read())
+        assert len(decks) == 1 and len(decks.pop()) == 16 * 1024
+
+        # A different topic is a different flight
+        generator.generate_club_presentation("AI Club", "Robotics", data_directory=str(data_dir))
+        assert fake.stats()["/generate"] == {"200": 2}
+
+    print("✅ Coalesced generation test passed!")
+
+
+def test_followers_download_once_when_leader_has_no_output():
+    """If the leading caller didn't want a file, the first follower that does downloads it for the rest"""
+    print("Testing coalesced download without a leader file...")
+
+    with FakeSlidesGPTServer(FakeServerConfig(latency="0.3", deck_size=16 * 1024)) as fake, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir) / "clubs"
+        (data_dir / "user-a").mkdir(parents=True)
+        with open(data_dir / "user-a" / "AI_Club_club-leaderless.json", 'w') as f:
+            json.dump({"clubId": "club-leaderless", "userId": "user-a", "clubName": "AI Club"}, f)
+
+        generator = ProductionSlidesGPTGenerator(
+            api_key="test-key", base_url=fake.base_url,
+            transport=SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)))
+        results = {}
+
+        def generate(output):
+            results[output] = generator.generate_club_presentation(
+                "AI Club", "Neural Networks", output_path=output, data_directory=str(data_dir))
+
+        leader = threading.Thread(target=generate, args=(None,))
+        leader.start()
+        while generator.single_flight.stats()["in_flight"] < 1:
+            time.sleep(0.001)
+        outputs = [os.path.join(temp_dir, f"deck-{i}.pptx") for i in range(3)]
+        followers = [threading.Thread(target=generate, args=(output,)) for output in outputs]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join(10)
+
+        assert generator.single_flight.stats()["coalesced"] == 3
+        assert fake.stats()["/generate"] == {"200": 1} and fake.stats()["/download"] == {"200": 1}
+        assert len({results[output]["sha256"] for output in outputs}) == 1
+        for output in outputs:
+            assert results[output]["downloaded_to"] == output and os.path.getsize(output) == 16 * 1024
+
+    print("✅ Coalesced download without a leader file test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running single flight tests...\n")
+
+    tests = [
+        test_single_flight_shares_results_and_errors,
+        test_concurrent_identical_generations_coalesce,
+        test_followers_download_once_when_leader_has_no_output
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
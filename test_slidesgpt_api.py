@@ -1,9 +1,13 @@
+import argparse
 import json
-import requests
 import os
-import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from api_test_results import ResultsAggregator, ResultsWriter, print_error_analysis
+from load_test import LoadTestConfig, LoadTestRunner, positive_float, print_load_report
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from slidesgpt_transport import SlidesGPTTransport, get_shared_transport
 
 # Load environment variables from .env file
 try:
@@ -22,32 +26,48 @@ except ImportError:
         pass
 
 class SlidesGPTAPITester:
-    def __init__(self, api_key: str):
+    def __init__(self,
+                 api_key: str,
+                 transport: Optional[SlidesGPTTransport] = None,
+                 base_url: str = "https://api.slidesgpt.com"):
         self.api_key = api_key
-        self.base_url = "https://api.slidesgpt.com"
+        self.base_url = base_url
+        self.transport = transport or get_shared_transport()
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
-        self.results = []
+        self.results_path: Optional[str] = None
+        self.writer: Optional[ResultsWriter] = None
         self.success_count = 0
         self.failure_count = 0
     
+    def build_payload(self, call_number: int) -> Dict:
+        # Simple test prompt similar to what would be used in production
+        test_prompt = f"Create a 3-slide presentation about 'API Test Call #{call_number}' for a high school club. Include an introduction, main content, and conclusion."
+        return {"prompt": test_prompt}
+
+    def send_generate_request(self, call_number: int) -> int:
+        """Send one generate call quietly and return its status code (used by the load test)"""
+        response = self.transport.post(
+            f"{self.base_url}/v1/presentations/generate",
+            headers=self.headers,
+            json=self.build_payload(call_number),
+            timeout=120
+        )
+        response.close()
+        return response.status_code
+
     def make_api_call(self, call_number: int) -> Dict:
         """Make a single API call using the exact same format as production code"""
         
-        # Simple test prompt similar to what would be used in production
-        test_prompt = f"Create a 3-slide presentation about 'API Test Call #{call_number}' for a high school club. Include an introduction, main content, and conclusion."
-        
-        payload = {
-            "prompt": test_prompt
-        }
+        payload = self.build_payload(call_number)
         
         try:
             print(f"[{datetime.now().strftime('%H:%M:%S')}] Making API call #{call_number}...")
             
             # Use the exact same endpoint and format as production code
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.base_url}/v1/presentations/generate",
                 headers=self.headers,
                 json=payload,
@@ -93,106 +113,124 @@ class SlidesGPTAPITester:
             print(f"❌ Call #{call_number} ERROR - {str(e)}")
             return error_result
     
-    def run_test(self, total_calls: int = 100, delay_seconds: int = 10):
-        """Run the API test with specified number of calls and delay"""
+    def run_test(self, total_calls: int = 100, results_path: Optional[str] = None, snapshot_every: int = 50,
+                 resume: bool = False):
+        """Run the API test with specified number of calls, paced by the transport's rate limiter
+        
+        Each result is appended to results_path (JSON lines) as soon as the call finishes,
+        with a summary snapshot rewritten every snapshot_every calls. results_path must not
+        exist yet unless resume is set, in which case the run is added to it.
+        """
         
+        rate = self.transport.rate_limiter.rate
+        self.results_path = results_path or f"slidesgpt_api_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
         print(f"🚀 Starting SlidesGPT API Test (Production Format)")
         print(f"📊 Total calls: {total_calls}")
-        print(f"⏱️  Delay between calls: {delay_seconds} seconds")
-        print(f"⏰ Estimated duration: {(total_calls * delay_seconds) / 60:.1f} minutes")
+        print(f"⏱️  Rate limit: {rate:.2f} calls/second (adapts to 429s and Retry-After)")
+        print(f"⏰ Estimated duration: {total_calls / rate / 60:.1f} minutes")
         print(f"🔑 API Key: {self.api_key[:10]}...{self.api_key[-4:]}")
         print(f"🌐 Endpoint: {self.base_url}/v1/presentations/generate")
+        print(f"💾 Streaming results to: {self.results_path}")
         print("=" * 60)
         
         start_time = datetime.now()
+        self.writer = ResultsWriter(self.results_path, test_info={
+            "planned_calls": total_calls,
+            "api_key_preview": f"{self.api_key[:10]}...{self.api_key[-4:]}",
+            "endpoint": f"{self.base_url}/v1/presentations/generate",
+            "test_date": start_time.isoformat()
+        }, snapshot_every=snapshot_every, resume=resume)
+        try:
+            for i in range(1, total_calls + 1):
+                self.writer.write(self.make_api_call(i))
+        finally:
+            self.writer.close(connection_stats=self.transport.connection_stats(),
+                              duration_seconds=(datetime.now() - start_time).total_seconds())
         
-        for i in range(1, total_calls + 1):
-            result = self.make_api_call(i)
-            self.results.append(result)
-            
-            # Don't sleep after the last call
-            if i < total_calls:
-                print(f"⏳ Waiting {delay_seconds} seconds before next call...")
-                time.sleep(delay_seconds)
+        duration = (datetime.now() - start_time).total_seconds()
+        self.print_summary(duration)
+        print(f"\n💾 Results saved to: {self.results_path} (summary: {self.writer.snapshot_path})")
+    
+    def run_load_test(self, config: LoadTestConfig, save: bool = True) -> Dict:
+        """Drive the generate endpoint open-loop at config.rate and report latency percentiles"""
+        
+        print(f"🚀 Starting SlidesGPT load test")
+        print(f"🎯 Target: {config.rate:.2f} req/s for {config.duration:g}s, ramp-up {config.ramp_up:g}s, concurrency {config.concurrency}")
+        print(f"🔑 API Key: {self.api_key[:10]}...{self.api_key[-4:]}")
+        print(f"🌐 Endpoint: {self.base_url}/v1/presentations/generate")
+        print("=" * 60)
         
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        report = LoadTestRunner(self.send_generate_request, config).run()
+        report["connection_stats"] = self.transport.connection_stats()
+        report["rate_limit_stats"] = self.transport.rate_limit_stats()
+        print_load_report(report)
         
-        self.print_summary(duration)
-        self.save_results()
+        if save:
+            filename = f"slidesgpt_load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(filename, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n💾 Results saved to: {filename}")
+        return report
     
-    def print_summary(self, duration_seconds: float):
-        """Print a summary of the test results"""
+    def print_summary(self, duration_seconds: float) -> Dict:
+        """Print a summary of the test results, aggregated from the results file"""
         
+        summary = ResultsAggregator.from_file(self.results_path).summary()
         print("\n" + "=" * 60)
         print("📊 TEST SUMMARY")
         print("=" * 60)
-        print(f"✅ Successful calls: {self.success_count}")
-        print(f"❌ Failed calls: {self.failure_count}")
-        print(f"📈 Success rate: {(self.success_count / len(self.results)) * 100:.1f}%")
+        print(f"✅ Successful calls: {summary['successful_calls']}")
+        print(f"❌ Failed calls: {summary['failed_calls']}")
+        print(f"📈 Success rate: {summary['success_rate']:.1f}%")
         print(f"⏱️  Total duration: {duration_seconds / 60:.1f} minutes")
-        print(f"🔄 Average time per call: {duration_seconds / len(self.results):.1f} seconds")
+        if summary['total_calls']:
+            print(f"🔄 Average time per call: {duration_seconds / summary['total_calls']:.1f} seconds")
+        connection_stats = self.transport.connection_stats()
+        print(f"🔌 Connections opened: {connection_stats['connections_opened']}, reused: {connection_stats['connections_reused']}")
+        print(f"🔁 Retries: {connection_stats['retries']}, final rate: {self.transport.rate_limiter.rate:.2f} calls/second")
         
-        if self.success_count >= 100:
+        if summary['successful_calls'] >= 100:
             print("\n🎉 SUCCESS: API limit appears to be removed!")
             print("   You can now make more than 100 calls on the free tier.")
             print("   Benjamin's changes (removing credit card) are working!")
-        elif self.success_count > 0:
-            print(f"\n⚠️  PARTIAL SUCCESS: {self.success_count}/100 calls worked")
+        elif summary['successful_calls'] > 0:
+            print(f"\n⚠️  PARTIAL SUCCESS: {summary['successful_calls']}/100 calls worked")
             print("   The API limit might be partially removed or there are intermittent issues.")
         else:
             print("\n❌ FAILURE: No calls succeeded")
             print("   The API limit may still be in place or there are connectivity issues.")
         
-        # Check for specific error patterns
-        error_patterns = {}
-        for result in self.results:
-            if not result['success']:
-                error_type = "Unknown"
-                response_text = result.get('response_text', '').lower()
-                if "limit" in response_text or "quota" in response_text:
-                    error_type = "Rate Limit/Quota"
-                elif "unauthorized" in response_text or "401" in str(result.get('status_code')):
-                    error_type = "Unauthorized"
-                elif "timeout" in str(result.get('error', '')).lower():
-                    error_type = "Timeout"
-                elif "429" in str(result.get('status_code')):
-                    error_type = "Rate Limited (429)"
-                
-                error_patterns[error_type] = error_patterns.get(error_type, 0) + 1
-        
-        if error_patterns:
-            print(f"\n🔍 Error Analysis:")
-            for error_type, count in error_patterns.items():
-                print(f"   {error_type}: {count} occurrences")
-    
-    def save_results(self):
-        """Save test results to a JSON file"""
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"slidesgpt_api_test_results_{timestamp}.json"
-        
-        summary = {
-            "test_info": {
-                "total_calls": len(self.results),
-                "successful_calls": self.success_count,
-                "failed_calls": self.failure_count,
-                "success_rate": (self.success_count / len(self.results)) * 100,
-                "api_key_preview": f"{self.api_key[:10]}...{self.api_key[-4:]}",
-                "endpoint": f"{self.base_url}/v1/presentations/generate",
-                "test_date": datetime.now().isoformat()
-            },
-            "results": self.results
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(summary, f, indent=2)
-        
-        print(f"\n💾 Results saved to: {filename}")
+        print_error_analysis(summary)
+        return summary
 
 def main():
     """Main function to run the API test"""
     
+    parser = argparse.ArgumentParser(description='Load test the SlidesGPT API')
+    parser.add_argument('--rps', type=positive_float, default=1.0, help='Target requests per second (default: 1)')
+    parser.add_argument('--duration', type=float, default=100, help='Test duration in seconds, including ramp-up (default: 100)')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Seconds to ramp linearly up to --rps (default: 0)')
+    parser.add_argument('--concurrency', type=int, default=10, help='Maximum requests in flight (default: 10)')
+    parser.add_argument('--retries', type=int, default=0, help='Retries per request on 429/5xx (default: 0, so throttling is visible)')
+    parser.add_argument('--no-limit', action='store_true', help="Don't pace requests with the client-side rate limiter")
+    parser.add_argument('--serial', type=int, metavar='CALLS', help='Run the old one-at-a-time test with this many calls')
+    parser.add_argument('--results-file', help='New JSON-lines file --serial streams results to (default: timestamped)')
+    parser.add_argument('--resume', action='store_true', help='Append to an existing --results-file, counting its results in the summary')
+    parser.add_argument('--base-url', default='https://api.slidesgpt.com', help='API base URL, e.g. a local fake server')
+    
+    args = parser.parse_args()
+    if args.resume and not args.results_file:
+        parser.error('--resume needs --results-file')
+    if args.results_file and os.path.exists(args.results_file) and not args.resume:
+        parser.error(f'{args.results_file} already exists; pass --resume to add to it')
+    config = None
+    if not args.serial:
+        try:
+            config = LoadTestConfig(rate=args.rps, duration=args.duration,
+                                    ramp_up=args.ramp_up, concurrency=args.concurrency)
+        except ValueError as e:
+            parser.error(str(e))
+    
     # Get API key from environment variable
     API_KEY = os.getenv('SLIDESGPT_API_KEY')
     if not API_KEY:
@@ -201,16 +239,30 @@ def main():
         print("export SLIDESGPT_API_KEY='your_api_key_here'")
         return
     
-    # Initialize tester
-    tester = SlidesGPTAPITester(API_KEY)
+    if args.serial:
+        # The limiter starts at one call per second and backs off on 429s
+        transport = SlidesGPTTransport(rate_limiter=AdaptiveRateLimiter(rate=1.0, burst=1, max_rate=2.0))
+    else:
+        limit = 1e6 if args.no_limit else args.rps
+        transport = SlidesGPTTransport(
+            max_connections_per_host=args.concurrency,
+            rate_limiter=AdaptiveRateLimiter(rate=limit, burst=args.concurrency, max_rate=limit),
+            retry_policy=RetryPolicy(max_retries=args.retries)
+        )
+    tester = SlidesGPTAPITester(API_KEY, transport=transport, base_url=args.base_url)
     
     # Run the test
     try:
-        tester.run_test(total_calls=100, delay_seconds=10)
+        if args.serial:
+            tester.run_test(total_calls=args.serial, results_path=args.results_file, resume=args.resume)
+        else:
+            tester.run_load_test(config)
     except KeyboardInterrupt:
         print("\n⚠️  Test interrupted by user")
-        tester.print_summary(0)
-        tester.save_results()
+        if args.serial and tester.writer:
+            # Everything finished before the interrupt is already on disk
+            tester.print_summary(0)
+            print(f"\n💾 Results saved to: {tester.results_path}")
     except Exception as e:
         print(f"\n❌ Test failed with error: {str(e)}")
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared SlidesGPT HTTP transport
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from production_slidesgpt_generator import ProductionSlidesGPTGenerator
+from rate_limiter import AdaptiveRateLimiter
+from slidesgpt_transport import SlidesGPTTransport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({"id": "deck-1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connections_are_reused():
+    """Sequential calls through one transport share a single keep-alive connection"""
+    print("Testing connection reuse...")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with SlidesGPTTransport(max_connections_per_host=2,
+                                rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)) as transport:
+            generator = ProductionSlidesGPTGenerator(
+                api_key="test-key",
+                transport=transport,
+                base_url=f"http://127.0.0.1:{server.server_address[1]}"
+            )
+            for _ in range(5):
+                assert generator.generate_presentation("prompt")["id"] == "deck-1"
+
+            stats = transport.connection_stats()
+            assert stats["requests_sent"] == 5
+            assert stats["connections_opened"] == 1
+            assert stats["connections_reused"] == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Connection reuse test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Running transport tests...\n")
+
+    tests = [
+        test_connections_are_reused
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
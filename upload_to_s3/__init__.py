@@ -0,0 +1,3 @@
+from .s3 import S3Uploader, UploadResult, upload_to_s3
+
+__all__ = ["S3Uploader", "UploadResult", "upload_to_s3"]
@@ -1,32 +1,313 @@
-import boto3
+import argparse
+import hashlib
+import json
+import sys
+import threading
 import urllib.parse
 import os
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# boto3 and dotenv are imported on first use, so importing this module stays cheap
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_CONTENT_PREFIX = "by-hash/"
+HASH_BUFFER_SIZE = 1024 * 1024
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+_clients: Dict[Tuple[str, Optional[str]], object] = {}
+_clients_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def get_s3_client(region='us-west-1', endpoint_url=None):
+    """Return a cached boto3 S3 client for (region, endpoint_url); boto3 clients are thread-safe"""
+    global _dotenv_loaded
+    key = (region, endpoint_url)
+    with _clients_lock:
+        if key not in _clients:
+            import boto3
+            if not _dotenv_loaded:
+                from dotenv import load_dotenv
+                load_dotenv()
+                _dotenv_loaded = True
+            aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
+            aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+            if not aws_access_key or not aws_secret_key:
+                raise EnvironmentError("AWS credentials not found in environment variables.")
+            _clients[key] = boto3.client('s3',
+                                         aws_access_key_id=aws_access_key,
+                                         aws_secret_access_key=aws_secret_key,
+                                         region_name=region,
+                                         endpoint_url=endpoint_url)
+        return _clients[key]
+
+
+def file_sha256(file_path):
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BUFFER_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def office_viewer_url(public_url):
+    return f"https://view.officeapps.live.com/op/view.aspx?src={urllib.parse.quote(public_url, safe='')}"
+
+
+@dataclass
+class UploadResult:
+    file_path: str
+    object_name: str
+    url: Optional[str] = None
+    viewer_url: Optional[str] = None
+    error: Optional[str] = None
+    sha256: Optional[str] = None
+    skipped: bool = False
+    content_key: Optional[str] = None
+
+
+class S3Uploader:
+    """
+    Uploads decks to one bucket through a single cached client.
+
+    part_size and max_concurrency tune boto3's managed multipart transfer for
+    each file; upload_many additionally runs up to max_workers files at once.
+    Pass endpoint_url (or a ready client) to target a local S3 stand-in such as
+    moto or minio.
+
+    With dedupe on, each file's bytes are stored once under a content-addressed
+    key (<content_prefix><sha256><ext>). If the object already exists in the
+    bucket (checked with a HEAD) it is not uploaded again. An explicit
+    object_name is then written as a server-side copy of that object, so the
+    caller's key still exists without sending the bytes twice; without one the
+    content key's URL is returned. The local manifest remembers where each hash
+    was stored per endpoint and bucket; an entry is only trusted once a HEAD
+    confirms the object is still there, so a deleted object is uploaded again.
+    """
+
+    def __init__(self,
+                 bucket,
+                 region='us-west-1',
+                 endpoint_url=None,
+                 client=None,
+                 part_size=DEFAULT_PART_SIZE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_workers=DEFAULT_MAX_WORKERS,
+                 dedupe=False,
+                 content_prefix=DEFAULT_CONTENT_PREFIX,
+                 manifest_path=None):
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.max_workers = max_workers
+        self._client = client
+        from boto3.s3.transfer import TransferConfig
+        self.transfer_config = TransferConfig(multipart_threshold=part_size,
+                                              multipart_chunksize=part_size,
+                                              max_concurrency=max_concurrency,
+                                              use_threads=max_concurrency > 1)
+        self.dedupe = dedupe
+        self.content_prefix = content_prefix
+        self.manifest_path = manifest_path
+        self.uploaded = 0
+        self.skipped = 0
+        self.bytes_skipped = 0
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, str] = {}
+        if manifest_path and os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    self._manifest = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._manifest = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_s3_client(self.region, self.endpoint_url)
+        return self._client
+
+    def public_url(self, object_name):
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket}/{urllib.parse.quote(object_name)}"
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{urllib.parse.quote(object_name)}"
+
+    def content_key(self, sha256, extension=".pptx"):
+        return f"{self.content_prefix}{sha256}{extension}"
+
+    def _head(self, object_name) -> Optional[Dict]:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=object_name)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def _object_exists(self, object_name):
+        return self._head(object_name) is not None
+
+    def _manifest_key(self, sha256):
+        return f"{self.endpoint_url or 'aws'}|{self.bucket}|{sha256}"
+
+    def _remember(self, manifest_key, object_name):
+        with self._lock:
+            self._manifest[manifest_key] = object_name
+            if not self.manifest_path:
+                return
+            tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _result(self, file_path, object_name, **kwargs) -> UploadResult:
+        url = self.public_url(object_name)
+        return UploadResult(file_path=file_path, object_name=object_name, url=url,
+                            viewer_url=office_viewer_url(url), **kwargs)
+
+    def upload(self, file_path, object_name=None, sha256=None) -> UploadResult:
+        """
+        Upload one file and return its public and Office viewer URLs
+
+        With dedupe, pass sha256 when the digest is already known (e.g.
+        DownloadResult.sha256) to skip hashing the file again.
+        """
+        if self.dedupe:
+            return self._upload_deduplicated(file_path, object_name, sha256)
+
+        object_name = object_name or os.path.basename(file_path)
+        self.client.upload_file(file_path, self.bucket, object_name,
+                                ExtraArgs={"ContentType": PPTX_CONTENT_TYPE},
+                                Config=self.transfer_config)
+        with self._lock:
+            self.uploaded += 1
+        return self._result(file_path, object_name)
+
+    def _upload_deduplicated(self, file_path, alias=None, sha256=None) -> UploadResult:
+        sha256 = sha256 or file_sha256(file_path)
+        manifest_key = self._manifest_key(sha256)
+        with self._lock:
+            known = self._manifest.get(manifest_key)
+        object_name = self.content_key(sha256, os.path.splitext(file_path)[1] or ".pptx")
+
+        if known and self._object_exists(known):
+            existing = known
+        elif object_name != known and self._object_exists(object_name):
+            existing = object_name
+        else:
+            existing = None
+        if existing:
+            if existing != known:
+                self._remember(manifest_key, existing)
+            object_name = existing
+            with self._lock:
+                self.skipped += 1
+                self.bytes_skipped += os.path.getsize(file_path)
+        else:
+            self.client.upload_file(file_path, self.bucket, object_name,
+                                    ExtraArgs={"ContentType": PPTX_CONTENT_TYPE, "Metadata": {"sha256": sha256}},
+                                    Config=self.transfer_config)
+            self._remember(manifest_key, object_name)
+            with self._lock:
+                self.uploaded += 1
+
+        if alias and alias != object_name:
+            self._write_alias(object_name, alias, sha256)
+        return self._result(file_path, alias or object_name, sha256=sha256, skipped=bool(existing),
+                            content_key=object_name)
+
+    def _write_alias(self, content_key, alias, sha256):
+        """Copy the content object to the caller's key inside S3, unless it already holds these bytes"""
+        head = self._head(alias)
+        if head is not None and head.get('Metadata', {}).get('sha256') == sha256:
+            return
+        self.client.copy_object(Bucket=self.bucket, Key=alias,
+                                CopySource={"Bucket": self.bucket, "Key": content_key},
+                                ContentType=PPTX_CONTENT_TYPE, Metadata={"sha256": sha256},
+                                MetadataDirective="REPLACE")
+
+    def upload_many(self, paths: Iterable[str], prefix="") -> List[UploadResult]:
+        """
+        Upload files in parallel as <prefix><basename>, in the order given.
+        With dedupe, files are stored under their content keys only, with no
+        per-file alias. A failed file is reported in its result's error instead
+        of stopping the rest.
+        """
+        paths = list(paths)
+
+        def upload_one(file_path):
+            object_name = prefix + os.path.basename(file_path)
+            try:
+                return self.upload(file_path, None if self.dedupe else object_name)
+            except Exception as e:
+                return UploadResult(file_path=file_path, object_name=object_name, error=str(e))
+
+        if not paths:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(paths)))) as pool:
+            return list(pool.map(upload_one, paths))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "uploaded": self.uploaded,
+                "skipped": self.skipped,
+                "bytes_skipped": self.bytes_skipped
+            }
+
+
+_uploaders: Dict[Tuple[str, str], S3Uploader] = {}
 
-load_dotenv()
 
 def upload_to_s3(file_path, bucket, object_name, region='us-west-1'):
-    aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-    aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-    if not aws_access_key or not aws_secret_key:
-        raise EnvironmentError("AWS credentials not found in environment variables.")
-    s3 = boto3.client('s3',
-                      aws_access_key_id=aws_access_key,
-                      aws_secret_access_key=aws_secret_key,
-                      region_name=region)
-    s3.upload_file(file_path, bucket, object_name)
-    url = f"https://{bucket}.s3.{region}.amazonaws.com/{object_name}"
-    return url
-
-# --- Fill in your details below ---
-file_path = "/Users/kanishk/Desktop/clubly_test_app/upload_to_s3/test-presentation.pptx" # Path to your test file
-bucket = "clubly-slides" # Your S3 bucket name
-object_name = "test-presentation.pptx" # Name for the file in S3
-region = "us-west-1" # Or your chosen region
-
-public_url = upload_to_s3(file_path, bucket, object_name, region)
-print("Public URL:", public_url)
-
-# --- Add this to generate the Office Online Viewer link ---
-viewer_url = f"https://view.officeapps.live.com/op/view.aspx?src={urllib.parse.quote(public_url, safe='')}"
-print("Office Online Viewer URL:", viewer_url)
\ No newline at end of file
+    key = (bucket, region)
+    if key not in _uploaders:
+        _uploaders[key] = S3Uploader(bucket, region)
+    return _uploaders[key].upload(file_path, object_name).url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload presentations to S3')
+    parser.add_argument('files', nargs='+', help='Files to upload')
+    parser.add_argument('--bucket', default='clubly-slides', help='S3 bucket name (default: clubly-slides)')
+    parser.add_argument('--region', default='us-west-1', help='S3 region (default: us-west-1)')
+    parser.add_argument('--prefix', default='', help='Prefix for the object names')
+    parser.add_argument('--endpoint-url', help='S3-compatible endpoint, e.g. a local minio')
+    parser.add_argument('--part-size', type=int, default=DEFAULT_PART_SIZE // (1024 * 1024), help='Multipart part size in MiB (default: 8)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help='Parallel parts per file (default: 10)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='Files uploaded in parallel (default: 4)')
+    parser.add_argument('--dedupe', action='store_true', help='Store decks under content-hash keys and skip ones already uploaded')
+    parser.add_argument('--manifest', default='.s3_upload_manifest.json', help='Local hash manifest used with --dedupe')
+
+    args = parser.parse_args()
+
+    uploader = S3Uploader(args.bucket,
+                          region=args.region,
+                          endpoint_url=args.endpoint_url,
+                          part_size=args.part_size * 1024 * 1024,
+                          max_concurrency=args.concurrency,
+                          max_workers=args.workers,
+                          dedupe=args.dedupe,
+                          content_prefix=args.prefix + DEFAULT_CONTENT_PREFIX,
+                          manifest_path=args.manifest if args.dedupe else None)
+    failed = 0
+    for result in uploader.upload_many(args.files, prefix=args.prefix):
+        if result.error:
+            failed += 1
+            print(f"❌ {result.file_path}: {result.error}")
+            continue
+        print(f"{result.file_path}{' (already uploaded, skipped)' if result.skipped else ''}")
+        print("  Public URL:", result.url)
+        print("  Office Online Viewer URL:", result.viewer_url)
+    if args.dedupe:
+        stats = uploader.stats()
+        print(f"Uploaded {stats['uploaded']}, skipped {stats['skipped']} ({stats['bytes_skipped'] / 1024 / 1024:.1f} MiB saved)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())